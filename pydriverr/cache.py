@@ -0,0 +1,709 @@
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydriverr.custom_logger import logger
+from pydriverr.support import Support
+from pydriverr.versions import version_key
+
+
+@dataclass
+class CacheEntry:
+    """Artifact stored in the cache"""
+
+    path: Path
+    file_name: str
+    digest: str
+    checksum: str = ""
+
+
+@dataclass
+class CacheBudget:
+    """
+    Limits of the cache. Limit set to None is not applied.
+
+    Values are taken from env variables `PYDRIVERR_CACHE_MAX_SIZE` (e.g. 500MB), `PYDRIVERR_CACHE_MAX_AGE` (e.g. 30d)
+    and `PYDRIVERR_CACHE_KEEP_VERSIONS` (e.g. 3).
+    """
+
+    max_size: Optional[int] = None
+    max_age: Optional[float] = None
+    keep_versions: Optional[int] = None
+
+    MAX_SIZE_ENV = "PYDRIVERR_CACHE_MAX_SIZE"
+    MAX_AGE_ENV = "PYDRIVERR_CACHE_MAX_AGE"
+    KEEP_VERSIONS_ENV = "PYDRIVERR_CACHE_KEEP_VERSIONS"
+
+    @staticmethod
+    def from_env(max_size: str = "", max_age: str = "", keep_versions: Optional[int] = None) -> "CacheBudget":
+        """
+        Create budget from given values, falling back to env variables for values that are not given. Exit when a
+        value is invalid.
+
+        :param max_size: Maximum total size of the cache in human-readable form e.g. 1GB (default: "")
+        :param max_age: Maximum time since last use of an entry e.g. 2w, 30d, 12h (default: "")
+        :param keep_versions: Number of most recently used versions kept per driver type (default: None)
+        :return: CacheBudget object
+        """
+        max_size = max_size or os.environ.get(CacheBudget.MAX_SIZE_ENV, "")
+        max_age = max_age or os.environ.get(CacheBudget.MAX_AGE_ENV, "")
+        if keep_versions is None and os.environ.get(CacheBudget.KEEP_VERSIONS_ENV):
+            value = os.environ[CacheBudget.KEEP_VERSIONS_ENV].strip()
+            if not value.isdigit():
+                Support.exit(f"Invalid number of versions to keep: {value}")
+            keep_versions = int(value)
+        return CacheBudget(
+            max_size=Support.parse_size(max_size) if max_size else None,
+            max_age=Support.parse_timespan(max_age) if max_age else None,
+            keep_versions=keep_versions,
+        )
+
+    def is_set(self) -> bool:
+        """
+        Return whether any limit is set
+
+        :return: True if at least one limit is set
+        """
+        return any(limit is not None for limit in [self.max_size, self.max_age, self.keep_versions])
+
+
+def _synchronized(method: Callable) -> Callable:
+    """
+    Run decorated Cache method with the index lock held, so drivers can be fetched from many threads
+
+    :param method: Method to be decorated
+    :return: Decorated method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "Cache", *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _updates_index(method: Callable) -> Callable:
+    """
+    Run decorated Cache method with the index locked also against other processes sharing the cache. Index is read
+    again before the method runs, so records saved meanwhile by other processes are not lost.
+
+    :param method: Method to be decorated
+    :return: Decorated method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "Cache", *args, **kwargs):
+        with self._lock, self._index_file_lock():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class Cache:
+    """
+    Content-addressed store for downloaded archives and extracted WebDriver files.
+
+    Every file is stored once under `objects/<first 2 chars of sha256>/<sha256>`. Small JSON index maps
+    (driver type, version, OS, architecture) of an archive or an extracted driver to the digest of its content and
+    the original file name. Identical files downloaded for different versions or from different URLs share single
+    object. Index records also when every entry was used last time, which drives least-recently-used eviction, and
+    which drivers are installed from the cache in every `DRIVERS_HOME`, so sizes and digests are known without
+    walking the filesystem. When index is missing it is rebuilt by scanning the objects dir.
+
+    Processes sharing the cache serialize changes of the index with a lock file. Use of entries found in the cache is
+    written with the next change of the index, or by `flush_all` when the command ends.
+    """
+
+    ARCHIVE = "archive"
+    DRIVER = "driver"
+    _INDEX_FILE = "index.json"
+    _LOCK_FILE = "index.lock"
+    _OBJECTS_DIR = "objects"
+    _TMP_DIR = "tmp"
+    _INDEX_FORMAT = 1
+    _CHUNK_SIZE = 1024 * 1024
+    # Caches with use of entries not written to the index yet
+    _unsaved: Set["Cache"] = set()
+
+    def __init__(self, cache_dir: Path):
+        """
+        Init class
+
+        :param cache_dir: Root dir of the cache
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = cache_dir / Path(self._OBJECTS_DIR)
+        self.tmp_dir = cache_dir / Path(self._TMP_DIR)
+        self._index_path = cache_dir / Path(self._INDEX_FILE)
+        self._lock_path = cache_dir / Path(self._LOCK_FILE)
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._touched: Dict[str, float] = {}
+        self._index = self._load_index() or self._rebuild_index()
+
+    @staticmethod
+    def key(driver_type: str, version: str, os_: str, arch: str) -> str:
+        """
+        Return key under which artifacts of given driver are kept in the index
+
+        :param driver_type: Type of the WebDriver e.g. chrome
+        :param version: Version of the WebDriver
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :return: Key as string
+        """
+        return "/".join([driver_type, version, os_, arch])
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """
+        Calculate SHA-256 digest of given file
+
+        :param path: Path to the file
+        :return: Hex digest
+        """
+        sha256 = hashlib.sha256()
+        with open(str(path), "rb") as f:
+            for chunk in iter(lambda: f.read(Cache._CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def object_path(self, digest: str) -> Path:
+        """
+        Return path of the object with given digest
+
+        :param digest: SHA-256 digest of the content
+        :return: Path to the object (may not exist)
+        """
+        return self.objects_dir / digest[:2] / digest
+
+    @_synchronized
+    def get(self, key: str, kind: str, legacy_file_name: str = "") -> Optional[CacheEntry]:
+        """
+        Return artifact of given kind stored under given key.
+
+        Archives cached by older versions of pydriverr in `<type>/<version>/<file name>` are moved to the store on
+        first access.
+
+        :param key: Key returned by `Cache.key`
+        :param kind: `Cache.ARCHIVE` or `Cache.DRIVER`
+        :param legacy_file_name: Name of the archive in old cache layout (default: "")
+        :return: Cache entry or None if not in cache
+        """
+        record = self._index["artifacts"].get(key, {}).get(kind)
+        if record:
+            path = self.object_path(record["digest"])
+            if path.is_file():
+                self._touch(key)
+                return CacheEntry(path, record["file_name"], record["digest"], record.get("checksum", ""))
+            logger.debug(f"Object {record['digest']} of {key} is missing in cache")
+        if kind == self.ARCHIVE and legacy_file_name:
+            driver_type, version = key.split("/")[:2]
+            legacy_path = self.cache_dir / driver_type / version / legacy_file_name
+            if legacy_path.is_file():
+                logger.debug(f"Moving {legacy_path} to content-addressed store")
+                return self.put(key, kind, legacy_path, legacy_file_name)
+        return None
+
+    @_updates_index
+    def put(self, key: str, kind: str, src: Path, file_name: str, digest: str = "", checksum: str = "") -> CacheEntry:
+        """
+        Move file to the store and record it in the index. File is dropped if the same content is already stored.
+
+        :param key: Key returned by `Cache.key`
+        :param kind: `Cache.ARCHIVE` or `Cache.DRIVER`
+        :param src: Path to the file to be moved to the store. Must be on the same filesystem as the cache
+        :param file_name: Original name of the file
+        :param digest: SHA-256 of the file if already known (default: "")
+        :param checksum: MD5 checksum of the driver file as presented in .drivers.ini (default: "")
+        :return: Cache entry of stored file
+        """
+        digest = digest or self.hash_file(src)
+        path = self.object_path(digest)
+        if path.is_file():
+            logger.debug(f"{file_name} already stored as {digest}")
+            os.remove(str(src))
+        else:
+            Support.setup_dirs([path.parent])
+            os.replace(str(src), str(path))
+            logger.debug(f"{file_name} stored as {digest}")
+        self._index["objects"][digest] = {"size": path.stat().st_size}
+        record = {"digest": digest, "file_name": file_name}
+        if checksum:
+            record["checksum"] = checksum
+        self._index["artifacts"].setdefault(key, {})[kind] = record
+        self._touch(key)
+        self._save_index()
+        return CacheEntry(path, file_name, digest, checksum)
+
+    def new_tmp_path(self, file_name: str) -> Path:
+        """
+        Return path for a temporary file on the same filesystem as the store, so it can be moved there cheaply
+
+        :param file_name: Name of the file
+        :return: Path inside cache tmp dir
+        """
+        Support.setup_dirs([self.tmp_dir])
+        return self.tmp_dir / f"{os.getpid()}-{threading.get_ident()}-{file_name}"
+
+    def size(self) -> int:
+        """
+        Return total size of objects in the store
+
+        :return: Size in bytes
+        """
+        return sum(object_["size"] for object_ in self._index["objects"].values())
+
+    def disk_usage(self) -> int:
+        """
+        Return total size of the cache dir without the index itself. Sizes of objects are taken from the index, only
+        the few other files (saved catalogs and API responses, temporary and stray files) are looked up on disk.
+
+        :return: Size in bytes
+        """
+        return self.size() + self._files_size(self.cache_dir, skip=[self.objects_dir, self._index_path])
+
+    @staticmethod
+    def _files_size(path: Path, skip: List[Path]) -> int:
+        """
+        Return total size of files in the dir and its subdirs
+
+        :param path: Path to the dir
+        :param skip: Subdirs and files that are not counted
+        :return: Size in bytes
+        """
+        total = 0
+        try:
+            entries = list(os.scandir(str(path)))
+        except OSError:
+            return 0
+        for entry in entries:
+            if Path(entry.path) in skip:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                total += Cache._files_size(Path(entry.path), skip)
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+        return total
+
+    @_updates_index
+    def evict(self, budget: CacheBudget, protected_keys: Iterable[str] = ()) -> List[str]:
+        """
+        Remove least recently used entries until the cache fits in given budget.
+
+        Entries are removed when they were not used for longer than `max_age`, when their version is not among
+        `keep_versions` most recently used versions of the driver type and, finally, starting from the least recently
+        used, until total size is not greater than `max_size`. Objects of removed entries are deleted unless other
+        entry or installed driver references them. Objects not referenced at all are deleted before any entry is
+        removed to fit `max_size`, and when they were not modified for longer than `max_age`.
+
+        :param budget: Limits of the cache
+        :param protected_keys: Keys that are never evicted e.g. of installed drivers (default: ())
+        :return: Evicted keys
+        """
+        protected_keys = set(protected_keys)
+        lru = sorted(
+            (key for key in self._index["artifacts"] if key not in protected_keys),
+            key=lambda key_: self._index["artifacts"][key_].get("last_access", 0),
+        )
+        to_evict = set()
+        if budget.max_age is not None:
+            oldest_allowed = time.time() - budget.max_age
+            to_evict.update(key for key in lru if self._index["artifacts"][key].get("last_access", 0) < oldest_allowed)
+        if budget.keep_versions is not None:
+            to_evict.update(self._keys_over_versions_limit(budget.keep_versions, protected_keys))
+        for key in to_evict:
+            self._remove_entry(key)
+        orphans = self._remove_orphans(budget)
+        if budget.max_size is not None:
+            for key in lru:
+                if self.size() <= budget.max_size:
+                    break
+                if key not in to_evict:
+                    to_evict.add(key)
+                    self._remove_entry(key)
+        if to_evict or orphans:
+            self._save_index()
+        evicted = [key for key in lru if key in to_evict]
+        for key in evicted:
+            logger.debug(f"Evicted from cache: {key}")
+        return evicted
+
+    def _keys_over_versions_limit(self, keep_versions: int, protected_keys: Iterable[str]) -> List[str]:
+        """
+        Return keys of versions that are not among `keep_versions` most recently used versions of their driver type.
+
+        Versions of protected keys are always kept and count to the limit.
+
+        :param keep_versions: Number of versions kept per driver type
+        :param protected_keys: Keys that are never evicted
+        :return: Keys to be evicted
+        """
+        last_access_by_version = {}
+        for key, entry in self._index["artifacts"].items():
+            driver_type, version = key.split("/")[:2]
+            last_access = float("inf") if key in protected_keys else entry.get("last_access", 0)
+            versions = last_access_by_version.setdefault(driver_type, {})
+            versions[version] = max(versions.get(version, 0), last_access)
+        kept = set()
+        for driver_type, versions in last_access_by_version.items():
+            by_recent_use = sorted(versions, key=lambda v: (versions[v], version_key(v)), reverse=True)
+            kept.update(f"{driver_type}/{version}" for version in by_recent_use[:keep_versions])
+        return [
+            key
+            for key in self._index["artifacts"]
+            if key not in protected_keys and "/".join(key.split("/")[:2]) not in kept
+        ]
+
+    def _remove_entry(self, key: str) -> None:
+        """
+        Remove entry from the index and delete objects that are no longer referenced
+
+        :param key: Key of the entry
+        :return: None
+        """
+        entry = self._index["artifacts"].pop(key, {})
+        referenced = self._referenced_digests()
+        for kind in [self.ARCHIVE, self.DRIVER]:
+            digest = entry.get(kind, {}).get("digest")
+            if digest and digest not in referenced:
+                self._remove_object(digest)
+
+    def _remove_orphans(self, budget: CacheBudget) -> List[str]:
+        """
+        Delete objects not referenced by any entry nor installed driver e.g. left after index rebuild, when they are
+        older than `max_age` or, starting from the oldest, while the cache is bigger than `max_size`
+
+        :param budget: Limits of the cache
+        :return: Digests of deleted objects
+        """
+        referenced = self._referenced_digests()
+        modified_at = {
+            digest: self._modified_at(digest) for digest in self._index["objects"] if digest not in referenced
+        }
+        removed = []
+        for digest in sorted(modified_at, key=modified_at.get):
+            too_old = budget.max_age is not None and modified_at[digest] < time.time() - budget.max_age
+            too_big = budget.max_size is not None and self.size() > budget.max_size
+            if too_old or too_big:
+                logger.debug(f"Removing orphaned object: {digest}")
+                self._remove_object(digest)
+                removed.append(digest)
+        return removed
+
+    def _modified_at(self, digest: str) -> float:
+        """
+        Return time of the last modification of the object
+
+        :param digest: Digest of the object
+        :return: Time as seconds since the epoch, 0 if object is missing
+        """
+        try:
+            return self.object_path(digest).stat().st_mtime
+        except OSError:
+            return 0
+
+    def _referenced_digests(self) -> set:
+        """
+        Return digests of objects referenced by entries and installed drivers
+
+        :return: Set of digests
+        """
+        referenced = {
+            record["digest"]
+            for entry in self._index["artifacts"].values()
+            for kind, record in entry.items()
+            if kind in [self.ARCHIVE, self.DRIVER]
+        }
+        referenced.update(
+            driver["digest"] for drivers in self._index["installed"].values() for driver in drivers.values()
+        )
+        return referenced
+
+    def _remove_object(self, digest: str) -> None:
+        """
+        Delete object from the store and the index
+
+        :param digest: Digest of the object
+        :return: None
+        """
+        self._index["objects"].pop(digest, None)
+        path = self.object_path(digest)
+        if path.is_file():
+            os.remove(str(path))
+        if path.parent.is_dir() and not any(path.parent.iterdir()):
+            path.parent.rmdir()
+
+    def _touch(self, key: str) -> None:
+        """
+        Record that entry was used now. Record is written with the next save of the index.
+
+        :param key: Key of the entry
+        :return: None
+        """
+        self._touched[key] = self._index["artifacts"][key]["last_access"] = time.time()
+        Cache._unsaved.add(self)
+
+    def flush(self) -> None:
+        """
+        Write use of entries not written to the index yet
+
+        :return: None
+        """
+        with self._lock:
+            if self._touched:
+                with self._index_file_lock():
+                    self._save_index()
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """
+        Write use of entries of all caches, so every command saves it once
+
+        :return: None
+        """
+        for cache in list(cls._unsaved):
+            cache.flush()
+
+    @_synchronized
+    def describe(self, key: str, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Return size and digest of artifact without marking it as used
+
+        :param key: Key returned by `Cache.key`
+        :param kind: `Cache.ARCHIVE` or `Cache.DRIVER`
+        :return: Dictionary with `size` and `sha256` or None if artifact is not in the cache
+        """
+        record = self._index["artifacts"].get(key, {}).get(kind)
+        object_ = self._index["objects"].get(record["digest"]) if record else None
+        if not object_:
+            return None
+        return {"size": object_["size"], "sha256": record["digest"]}
+
+    def objects_count(self) -> int:
+        """
+        Return number of objects in the store
+
+        :return: Number of objects recorded in the index
+        """
+        return len(self._index["objects"])
+
+    def verify(self, deep: bool = False) -> List[str]:
+        """
+        Check that every object recorded in the index exists and has recorded size.
+
+        :param deep: Check also that content of every object matches its digest (default: False)
+        :return: List of problems found
+        """
+        problems = []
+        objects = self._scan_objects()
+        for digest, object_ in sorted(self._index["objects"].items()):
+            if digest not in objects:
+                problems.append(f"Missing object: {digest}")
+            elif objects[digest] != object_["size"] or (deep and self.hash_file(self.object_path(digest)) != digest):
+                problems.append(f"Corrupted object: {digest}")
+        return problems
+
+    def installed(self, drivers_home: Path) -> Optional[Dict[str, Dict]]:
+        """
+        Return drivers installed from the cache in given installation dir
+
+        :param drivers_home: Installation dir
+        :return: Dictionary with driver type as key and file name, size and digest as value. None if installation
+                 dir was never indexed
+        """
+        return self._index["installed"].get(str(drivers_home))
+
+    @_updates_index
+    def set_installed(self, drivers_home: Path, driver_type: str, entry: CacheEntry) -> None:
+        """
+        Record that driver was installed from given cache entry
+
+        :param drivers_home: Installation dir
+        :param driver_type: Type of the WebDriver e.g. chrome
+        :param entry: Cache entry of the extracted driver
+        :return: None
+        """
+        self._index["installed"].setdefault(str(drivers_home), {})[driver_type] = {
+            "file_name": entry.file_name,
+            "size": self._index["objects"][entry.digest]["size"],
+            "digest": entry.digest,
+        }
+        self._save_index()
+
+    @_updates_index
+    def remove_installed(self, drivers_home: Path, driver_type: str) -> None:
+        """
+        Record that driver was deleted from installation dir
+
+        :param drivers_home: Installation dir
+        :param driver_type: Type of the WebDriver e.g. chrome
+        :return: None
+        """
+        if self._index["installed"].get(str(drivers_home), {}).pop(driver_type, None):
+            self._save_index()
+
+    @_updates_index
+    def rebuild_installed(self, drivers_home: Path, drivers: Dict[str, Tuple[str, str, str]]) -> Dict[str, Dict]:
+        """
+        Index drivers found in installation dir. Drivers with content present in the store are linked back to it.
+
+        :param drivers_home: Installation dir
+        :param drivers: Dictionary with driver type as key and key of the driver, file name and checksum as value
+        :return: Indexed drivers, like returned by `installed`
+        """
+        file_names = {file_name: driver_type for driver_type, (_, file_name, _) in drivers.items()}
+        installed = {}
+        if drivers_home.is_dir():
+            with os.scandir(str(drivers_home)) as entries:
+                for entry in entries:
+                    if entry.name not in file_names or not entry.is_file():
+                        continue
+                    driver_type = file_names[entry.name]
+                    key, file_name, checksum = drivers[driver_type]
+                    digest = self.hash_file(Path(entry.path))
+                    installed[driver_type] = {"file_name": file_name, "size": entry.stat().st_size, "digest": digest}
+                    if digest in self._index["objects"] and self.DRIVER not in self._index["artifacts"].get(key, {}):
+                        record = {"digest": digest, "file_name": file_name, "checksum": checksum}
+                        self._index["artifacts"].setdefault(key, {})[self.DRIVER] = record
+                        self._touch(key)
+        logger.debug(f"Indexed {len(installed)} drivers installed in {drivers_home}")
+        self._index["installed"][str(drivers_home)] = installed
+        self._save_index()
+        return installed
+
+    def _load_index(self) -> Optional[Dict]:
+        """
+        Read index from disk
+
+        :return: Index as dictionary or None if it is missing or unreadable
+        """
+        try:
+            with open(str(self._index_path)) as f:
+                index = json.load(f)
+            if index.get("format") == self._INDEX_FORMAT:
+                index.setdefault("installed", {})
+                return index
+            logger.debug(f"Unsupported cache index format: {index.get('format')}")
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            logger.debug(f"Cache index {self._index_path} is corrupted")
+        return None
+
+    def _rebuild_index(self) -> Dict:
+        """
+        Create index from objects found in the store.
+
+        Mapping of drivers to objects cannot be recovered from the objects alone, it is restored for installed
+        drivers by `rebuild_installed`. Objects not referenced by anything are removed by eviction when the cache does
+        not fit in its limits.
+
+        :return: Index as dictionary
+        """
+        index = {"format": self._INDEX_FORMAT, "artifacts": {}, "objects": {}, "installed": {}}
+        objects = self._scan_objects()
+        if objects:
+            logger.debug(f"Rebuilding cache index from {len(objects)} objects")
+            index["objects"] = {digest: {"size": size} for digest, size in objects.items()}
+        return index
+
+    def _scan_objects(self) -> Dict[str, int]:
+        """
+        List objects in the store with their size
+
+        :return: Dictionary with digest as key and size as value
+        """
+        objects = {}
+        if not self.objects_dir.is_dir():
+            return objects
+        with os.scandir(str(self.objects_dir)) as fan_out_dirs:
+            for fan_out_dir in fan_out_dirs:
+                if not fan_out_dir.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(fan_out_dir.path) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            objects[entry.name] = entry.stat(follow_symlinks=False).st_size
+        return objects
+
+    @contextmanager
+    def _index_file_lock(self) -> Iterator[None]:
+        """
+        Hold the lock file of the index and read the index again. Nested calls do not lock again.
+
+        :return: Context manager
+        """
+        if self._lock_file is not None:
+            yield
+            return
+        Support.setup_dirs([self.cache_dir])
+        with open(str(self._lock_path), "a") as self._lock_file:
+            self._lock_os_file(self._lock_file.fileno(), lock=True)
+            try:
+                self._index = self._load_index() or self._index
+                self._apply_touched()
+                yield
+            finally:
+                self._lock_os_file(self._lock_file.fileno(), lock=False)
+                self._lock_file = None
+
+    @staticmethod
+    def _lock_os_file(fd: int, lock: bool) -> None:
+        """
+        Lock or unlock whole file, waiting until other process releases it
+
+        :param fd: File descriptor
+        :param lock: Lock when True, unlock otherwise
+        :return: None
+        """
+        if sys.platform == "win32":
+            import msvcrt
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK if lock else msvcrt.LK_UNLCK, 1)
+                    return
+                except OSError:
+                    if not lock:
+                        raise
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+    def _apply_touched(self) -> None:
+        """
+        Update index read from disk with use of entries recorded since it was saved
+
+        :return: None
+        """
+        for key, last_access in self._touched.items():
+            if key in self._index["artifacts"]:
+                entry = self._index["artifacts"][key]
+                entry["last_access"] = max(entry.get("last_access", 0), last_access)
+
+    def _save_index(self) -> None:
+        """
+        Write index to disk atomically together with use of entries recorded since it was read
+
+        :return: None
+        """
+        self._apply_touched()
+        self._touched = {}
+        Cache._unsaved.discard(self)
+        Support.setup_dirs([self.cache_dir])
+        tmp_path = self._index_path.with_name(f"{self._INDEX_FILE}.{os.getpid()}.tmp")
+        with open(str(tmp_path), "w") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(str(tmp_path), str(self._index_path))
@@ -0,0 +1,366 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydriverr.custom_logger import logger
+from pydriverr.support import Support
+from pydriverr.versions import VersionsInfo, version_key
+
+_MAGIC = b"PDRC"
+_FORMAT = 2
+# Magic, format, time of download, time of the last full listing, number of strings, versions and entries
+_HEADER = struct.Struct("<4sHxxddIII")
+# Offset and length of UTF-8 encoded string in the string data
+_STRING = struct.Struct("<II")
+# Version string, index of the first entry and number of entries of the version
+_VERSION = struct.Struct("<III")
+# OS, architecture and file name strings
+_ENTRY = struct.Struct("<III")
+
+
+class CatalogView:
+    """
+    Saved catalog mapped to memory. Versions are looked up without decoding the rest of the catalog.
+
+    File starts with a header followed by table of strings, version records sorted by version, entries of versions
+    and data of strings. Every OS, architecture and file name is stored once in the data and referenced by its index.
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        """
+        Init class
+
+        :param buffer: Content of catalog file
+        :raises ValueError: When content is not a catalog in supported format
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("file too short")
+        magic, format_, self.fetched_at, self.listed_at, strings, versions, entries = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or format_ != _FORMAT:
+            raise ValueError("unsupported format")
+        self._buffer = buffer
+        self._strings_at = _HEADER.size
+        self._versions_at = self._strings_at + strings * _STRING.size
+        self._entries_at = self._versions_at + versions * _VERSION.size
+        self._data_at = self._entries_at + entries * _ENTRY.size
+        self._versions = versions
+        if len(buffer) < self._data_at:
+            raise ValueError("file truncated")
+
+    def __enter__(self) -> "CatalogView":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file
+
+        :return: None
+        """
+        self._buffer.close()
+
+    def _string(self, index: int) -> str:
+        """
+        Decode string of given index
+
+        :param index: Index in the table of strings
+        :return: String
+        """
+        offset, length = _STRING.unpack_from(self._buffer, self._strings_at + index * _STRING.size)
+        start = self._data_at + offset
+        end = start + length
+        return self._buffer[start:end].decode("utf-8")
+
+    def _version(self, index: int) -> Tuple[str, int, int]:
+        """
+        Decode version record of given index
+
+        :param index: Index of the version, versions are sorted ascending
+        :return: Version, index of its first entry and number of its entries
+        """
+        version, first, count = _VERSION.unpack_from(self._buffer, self._versions_at + index * _VERSION.size)
+        return self._string(version), first, count
+
+    def _entries(self, first: int, count: int) -> Iterator[Tuple[str, str, str]]:
+        """
+        Decode entries of a version
+
+        :param first: Index of the first entry
+        :param count: Number of entries
+        :return: Iterator over OS, architecture and file name
+        """
+        for index in range(first, first + count):
+            os_, arch, file_name = _ENTRY.unpack_from(self._buffer, self._entries_at + index * _ENTRY.size)
+            yield self._string(os_), self._string(arch), self._string(file_name)
+
+    def _platforms(self, first: int, count: int) -> Dict[str, Dict[str, str]]:
+        """
+        Decode entries of a version into {os: {arch: file name}}
+
+        :param first: Index of the first entry
+        :param count: Number of entries
+        :return: Files of the version per OS and architecture
+        """
+        platforms: Dict[str, Dict[str, str]] = {}
+        for os_, arch, file_name in self._entries(first, count):
+            platforms.setdefault(os_, {})[arch] = file_name
+        return platforms
+
+    def find(self, version: str) -> Optional[VersionsInfo]:
+        """
+        Find version with binary search
+
+        :param version: Exact version of the WebDriver
+        :return: Catalog with this version only or None when it is not in the catalog
+        """
+        key = version_key(version)
+        low, high = 0, self._versions
+        while low < high:
+            middle = (low + high) // 2
+            if version_key(self._version(middle)[0]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        for index in range(low, self._versions):
+            found, first, count = self._version(index)
+            if found == version:
+                return {found: self._platforms(first, count)}
+            if version_key(found) != key:
+                break
+        return None
+
+    def newest(self, os_: str, arch: str) -> Optional[VersionsInfo]:
+        """
+        Find the newest version available for given OS and architecture, reading versions from the newest one
+
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :return: Catalog with this version only or None when there is no version for the OS and architecture
+        """
+        for index in range(self._versions - 1, -1, -1):
+            version, first, count = self._version(index)
+            if any(entry[:2] == (os_, arch) for entry in self._entries(first, count)):
+                return {version: self._platforms(first, count)}
+        return None
+
+    def to_dict(self) -> VersionsInfo:
+        """
+        Decode the whole catalog
+
+        :return: Available versions as {version: {os: {arch: file name}}}
+        """
+        versions_info: VersionsInfo = {}
+        for index in range(self._versions):
+            version, first, count = self._version(index)
+            versions_info[version] = self._platforms(first, count)
+        return versions_info
+
+    @staticmethod
+    def encode(versions_info: VersionsInfo, fetched_at: float, listed_at: float) -> bytes:
+        """
+        Encode catalog into content of catalog file
+
+        :param versions_info: Available versions as {version: {os: {arch: file name}}}
+        :param fetched_at: Time of download
+        :param listed_at: Time of the last full listing
+        :return: Content of the file
+        """
+        strings: Dict[str, int] = {}
+        versions: List[Tuple[int, int, int]] = []
+        entries: List[Tuple[int, int, int]] = []
+        for version in sorted(versions_info, key=lambda v: (version_key(v), v)):
+            first = len(entries)
+            for os_, arch_data in versions_info[version].items():
+                for arch, file_name in arch_data.items():
+                    entries.append(
+                        (
+                            strings.setdefault(os_, len(strings)),
+                            strings.setdefault(arch, len(strings)),
+                            strings.setdefault(file_name, len(strings)),
+                        )
+                    )
+            versions.append((strings.setdefault(version, len(strings)), first, len(entries) - first))
+        data = bytearray()
+        table = []
+        for string in strings:
+            encoded = string.encode("utf-8")
+            table.append(_STRING.pack(len(data), len(encoded)))
+            data += encoded
+        return b"".join(
+            [
+                _HEADER.pack(_MAGIC, _FORMAT, fetched_at, listed_at, len(strings), len(versions), len(entries)),
+                *table,
+                *(_VERSION.pack(*version) for version in versions),
+                *(_ENTRY.pack(*entry) for entry in entries),
+                bytes(data),
+            ]
+        )
+
+
+class CatalogStore:
+    """
+    Lists of available versions of WebDrivers (catalogs) saved in the cache dir, one binary file per driver type, see
+    `CatalogView`.
+
+    Catalog is saved every time it is downloaded. Commands that only need to know the newest version, like `check`,
+    reuse saved catalog while it is younger than the TTL taken from `PYDRIVERR_CATALOG_TTL` env variable (e.g. 30m).
+    Drivers that can list only versions newer than the saved ones merge them into saved catalog, which is listed
+    whole again once it was last fully listed more than `FULL_REFRESH_INTERVAL` ago, so removed versions go away.
+    When `PYDRIVERR_OFFLINE` env variable is set, saved catalogs of any age are the only source of versions, e.g. on
+    hosts without internet access which import catalogs exported elsewhere.
+    """
+
+    TTL_ENV = "PYDRIVERR_CATALOG_TTL"
+    DEFAULT_TTL = "1h"
+    FULL_REFRESH_INTERVAL = 7 * 24 * 60 * 60
+    OFFLINE_ENV = "PYDRIVERR_OFFLINE"
+
+    def __init__(self, cache_dir: Path):
+        """
+        Init class
+
+        :param cache_dir: PyDriverr cache dir
+        """
+        self.catalogs_dir = cache_dir / "catalogs"
+
+    @staticmethod
+    def ttl_from_env(ttl: str = "") -> float:
+        """
+        Return how long saved catalog is fresh enough, falling back to env variable and then to the default
+
+        :param ttl: Time in human-readable form e.g. 30m, 12h (default: "")
+        :return: TTL in seconds
+        """
+        return Support.parse_timespan(ttl or os.environ.get(CatalogStore.TTL_ENV, "") or CatalogStore.DEFAULT_TTL)
+
+    @staticmethod
+    def offline() -> bool:
+        """
+        Check whether versions must not be listed over the network
+
+        :return: True if `PYDRIVERR_OFFLINE` env variable is set to a non-empty value other than 0
+        """
+        return os.environ.get(CatalogStore.OFFLINE_ENV, "") not in ("", "0")
+
+    def path(self, driver_type: str) -> Path:
+        """
+        Return path of saved catalog
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :return: Path to catalog file
+        """
+        return self.catalogs_dir / f"{driver_type}.bin"
+
+    def open(self, driver_type: str) -> Optional[CatalogView]:
+        """
+        Map saved catalog to memory, close returned view when it is not needed
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :return: Catalog or None if it is missing or unreadable
+        """
+        try:
+            with open(str(self.path(driver_type)), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring saved catalog of {driver_type}driver: {e}")
+            return None
+        try:
+            return CatalogView(buffer)
+        except (ValueError, struct.error) as e:
+            buffer.close()
+            logger.debug(f"Ignoring saved catalog of {driver_type}driver: {e}")
+            return None
+
+    def open_fresh(self, driver_type: str, max_age: float) -> Optional[CatalogView]:
+        """
+        Map saved catalog to memory when it is fresh enough, close returned view when it is not needed
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param max_age: Maximum age of the catalog in seconds
+        :return: Catalog or None if it is missing, unreadable or too old
+        """
+        view = self.open(driver_type)
+        if view is not None and time.time() - view.fetched_at > max_age:
+            view.close()
+            return None
+        return view
+
+    def load(self, driver_type: str, max_age: Optional[float] = None) -> Optional[VersionsInfo]:
+        """
+        Read saved catalog
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param max_age: Maximum age of the catalog in seconds (default: any age)
+        :return: Available versions as {version: {os: {arch: file name}}} or None if catalog is missing, unreadable or
+                 too old
+        """
+        view = self.open(driver_type) if max_age is None else self.open_fresh(driver_type, max_age)
+        if view is None:
+            return None
+        with view:
+            return view.to_dict()
+
+    def load_for_refresh(self, driver_type: str) -> Optional[VersionsInfo]:
+        """
+        Read saved catalog that can be extended with newer versions instead of listing all versions again
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :return: Available versions as {version: {os: {arch: file name}}} or None if catalog is missing, unreadable or
+                 it was fully listed more than `FULL_REFRESH_INTERVAL` ago
+        """
+        view = self.open(driver_type)
+        if view is None:
+            return None
+        with view:
+            return view.to_dict() if time.time() - view.listed_at <= self.FULL_REFRESH_INTERVAL else None
+
+    def save(
+        self, driver_type: str, versions_info: VersionsInfo, merged: bool = False, fetched_at: Optional[float] = None
+    ) -> None:
+        """
+        Save catalog atomically, so readers in other processes never see a partially written file
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param versions_info: Available versions as {version: {os: {arch: file name}}}
+        :param merged: Catalog is saved catalog extended with newer versions, time of the last full listing is kept
+                       (default: False)
+        :param fetched_at: Time when catalog was downloaded, e.g. on other host (default: now)
+        :return: None
+        """
+        now = listed_at = time.time() if fetched_at is None else fetched_at
+        previous = self.open(driver_type) if merged else None
+        if previous is not None:
+            with previous:
+                listed_at = previous.listed_at
+        Support.setup_dirs([self.catalogs_dir])
+        path = self.path(driver_type)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(str(tmp_path), "wb") as f:
+            f.write(CatalogView.encode(versions_info, now, listed_at))
+        os.replace(str(tmp_path), str(path))
+
+    @staticmethod
+    def merge(versions_info: VersionsInfo, newer: VersionsInfo) -> VersionsInfo:
+        """
+        Return copy of catalog extended with newer versions
+
+        :param versions_info: Available versions as {version: {os: {arch: file name}}}
+        :param newer: Versions to add, in the same form
+        :return: Merged catalog
+        """
+        merged = {
+            version: {os_: dict(arch_data) for os_, arch_data in os_data.items()}
+            for version, os_data in versions_info.items()
+        }
+        for version, os_data in newer.items():
+            for os_, arch_data in os_data.items():
+                merged.setdefault(version, {}).setdefault(os_, {}).update(arch_data)
+        return merged
@@ -3,7 +3,10 @@ import os
 import sys
 import tempfile
 from enum import Enum
-from typing import List
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydriverr.naming import NamingRule
 
 
 class WebDriverType(Enum):
@@ -39,6 +42,17 @@ class WebDriverType(Enum):
         self.url = url
         self.cmd = cmd
 
+    @property
+    def naming(self) -> "NamingRule":
+        """
+        Return rules of names of files published for this WebDriver type, compiled on first use
+
+        :return: Naming rule
+        """
+        from pydriverr.naming import NAMING_RULES
+
+        return NAMING_RULES[self]
+
     @staticmethod
     def cmd_for_drv_name(driver_type: str) -> str:
         """
@@ -70,6 +84,35 @@ class WebDriverType(Enum):
         return list(itertools.chain(*list(map(lambda c: c.drv_file_names, WebDriverType))))
 
 
+class CheckStatus(Enum):
+    """Status of WebDriver reported by `check` command with exit code of the command, from the most important one"""
+
+    ERROR = ("error", 1)
+    OUTDATED = ("outdated", 3)
+    NOT_INSTALLED = ("not-installed", 4)
+    NO_REMOTE_VERSION = ("no-remote-version", 5)
+    UP_TO_DATE = ("up-to-date", 0)
+
+    def __init__(self, status_name: str, exit_code: int):
+        self.status_name = status_name
+        self.exit_code = exit_code
+
+    @staticmethod
+    def exit_code_for(statuses: List["CheckStatus"]) -> int:
+        """
+        Return exit code of the most important of given statuses
+
+        :param statuses: Statuses of checked WebDrivers
+        :return: Exit code, 0 when there are no statuses
+        """
+        for status in CheckStatus:
+            if status in statuses:
+                return status.exit_code
+        return 0
+
+
+LOCKFILE_NAME = "pydriverr.lock"
+
 LOGGING_CONF = {
     "handlers": [
         {"sink": sys.stdout, "format": "{message}", "level": 20},
@@ -1,20 +1,94 @@
+import sys
+import threading
 from contextlib import contextmanager
 
-import loguru
-from yaspin import yaspin
-
 __all__ = ["logger"]
 
 
 class __MyLogger:
-    """Logger class that combine luguru with yaspin for writing during spinner"""
+    """
+    Logger class that combine luguru with yaspin for writing during spinner.
+
+    loguru and yaspin are imported and sinks are set up when the first message is logged or spinner is shown, so
+    importing the module is cheap.
+    """
 
     __GREEN = "\033[0;32m%s\033[0m"
 
     def __init__(self):
-        self.loguru_ = loguru.logger
-        self.sp = yaspin()
-        self.sp.color = "green"
+        self._loguru = None
+        self._sp = None
+        self._config = {}
+        self._console_handlers = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loguru_(self):
+        """loguru logger with sinks given to `configure`"""
+        with self._lock:
+            if self._loguru is None:
+                import loguru
+
+                loguru.logger.configure(**{key: value for key, value in self._config.items() if key != "handlers"})
+                for handler in self._config.get("handlers", []):
+                    self._add_handler(loguru.logger, handler)
+                if self._config.get("handlers"):
+                    try:
+                        loguru.logger.remove(0)  # default stderr sink, replaced by configured ones
+                    except ValueError:
+                        pass
+                self._loguru = loguru.logger
+            return self._loguru
+
+    def _add_handler(self, loguru_logger, handler: dict) -> None:
+        """
+        Add sink to loguru, remembering the ones writing to stdout
+
+        :param loguru_logger: loguru logger
+        :param handler: Arguments of `loguru.logger.add`
+        """
+        handler_id = loguru_logger.add(**handler)
+        if self._is_stdout(handler.get("sink")):
+            self._console_handlers[handler_id] = handler
+
+    @staticmethod
+    def _is_stdout(sink) -> bool:
+        """Check whether sink is the standard output, also the original one replaced e.g. by a test runner"""
+        return sink is sys.stdout or sink is sys.__stdout__
+
+    def console_to_stderr(self) -> None:
+        """
+        Write messages meant for the console to stderr, so stdout holds only machine-readable output of the command
+        """
+
+        def stderr_sink(message: str) -> None:
+            sys.stderr.write(message)
+
+        with self._lock:
+            if self._loguru is None:
+                self._config = {
+                    **self._config,
+                    "handlers": [
+                        {**handler, "sink": stderr_sink} if self._is_stdout(handler.get("sink")) else handler
+                        for handler in self._config.get("handlers", [])
+                    ],
+                }
+                return
+            for handler_id, handler in list(self._console_handlers.items()):
+                self._loguru.remove(handler_id)
+                del self._console_handlers[handler_id]
+                self._add_handler(self._loguru, {**handler, "sink": stderr_sink})
+
+    @property
+    def sp(self):
+        """yaspin spinner"""
+        with self._lock:
+            if self._sp is None:
+                from yaspin import yaspin
+
+                self._sp = yaspin()
+                self._sp.color = "green"
+            return self._sp
 
     def info(self, msg: str) -> None:
         """
@@ -22,7 +96,7 @@ class __MyLogger:
 
         :param msg: Message for loguru.info
         """
-        with self.sp.hidden():
+        with self._lock, self.sp.hidden():
             self.loguru_.info(msg)
 
     def debug(self, msg: str) -> None:
@@ -31,7 +105,7 @@ class __MyLogger:
 
         :param msg: Message for loguru.debug
         """
-        with self.sp.hidden():
+        with self._lock, self.sp.hidden():
             self.loguru_.debug(msg)
 
     def error(self, msg: str) -> None:
@@ -40,16 +114,24 @@ class __MyLogger:
 
         :param msg: Message for loguru.error
         """
-        with self.sp.hidden():
+        with self._lock, self.sp.hidden():
             self.loguru_.error(msg)
 
     def configure(self, **kwargs: dict) -> None:
         """
-        Configure loguru
+        Configure loguru. Until the first message is logged configuration is only stored.
+
+        Sinks from `handlers` are added next to the ones added directly to loguru, only loguru's default stderr sink
+        is replaced.
 
         :param kwargs: Dictionary with loguru config
         """
-        self.loguru_.configure(**kwargs)
+        with self._lock:
+            if self._loguru is None:
+                self._config = kwargs
+            else:
+                self._console_handlers = {}
+                self._loguru.configure(**kwargs)
 
     @contextmanager
     def spinner(self, msg: str) -> None:
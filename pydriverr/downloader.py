@@ -1,48 +1,103 @@
-import shutil
+import hashlib
+import re
 from pathlib import Path
-
-import requests
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from pydriverr.custom_logger import logger
 from pydriverr.support import Support
 
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
 
 class Downloader:
     """Helper class to download URLs"""
 
+    _CHUNK_SIZE = 1024 * 1024
+
     def __init__(self):
-        self._session = requests.Session()
+        self._session = None
         self._support = Support()
 
-    def get_url(self, url: str, stream=False) -> requests.Response:
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session, created on first download so commands working offline do not import `requests`"""
+        if self._session is None:
+            import requests
+
+            from pydriverr.file_transport import FileAdapter
+
+            self._session = requests.Session()
+            self._session.mount("file://", FileAdapter())
+        return self._session
+
+    def send(
+        self, url: str, headers: Optional[Dict[str, str]] = None, stream=False, json_body: Optional[Any] = None
+    ) -> "requests.Response":
         """
-        Download any URL and return `requests` object.
+        Send GET request, or POST request when JSON body is given, and return response of any status
 
-        :param url: URL for the get request
-        :param stream: Should the response content be retrieved when accessed. Use while downloading driver files
-                       (default: True)
+        :param url: URL for the request
+        :param headers: Additional headers of the request (default: None)
+        :param stream: Should the response content be retrieved when accessed (default: False)
+        :param json_body: Content of POST request encoded as JSON (default: None)
         :return: Whole request `Response` object
         """
+        import requests
+
         logger.debug(f"Downloading: {url}")
         try:
-            r = self._session.get(url, stream=stream)
-            if r.status_code == 200:
-                return r
-            else:
-                self._support.exit(f"Cannot download file {url}")
+            if json_body is not None:
+                return self.session.post(url, headers=headers, json=json_body, stream=stream)
+            return self.session.get(url, headers=headers, stream=stream)
         except requests.exceptions.ConnectTimeout:
             self._support.exit("Connection error")
 
-    def dl_driver(self, url: str, dst: Path) -> None:
+    def get_url(self, url: str, stream=False) -> "requests.Response":
+        """
+        Download any URL and return `requests` object.
+
+        :param url: URL for the get request
+        :param stream: Should the response content be retrieved when accessed. Use while downloading driver files
+                       (default: True)
+        :return: Whole request `Response` object
+        """
+        r = self.send(url, stream=stream)
+        if r.status_code != 200:
+            self._support.exit(f"Cannot download file {url}")
+        return r
+
+    def get_version_pointer(self, url: str) -> Optional[str]:
+        """
+        Download small text file holding single version, e.g. LATEST_RELEASE published next to WebDrivers
+
+        :param url: URL of the file
+        :return: Version or None when file is not available or holds something else than a version
+        """
+        r = self.send(url)
+        if r.status_code != 200:
+            logger.debug(f"Version pointer not available: {url}")
+            return None
+        content = r.content
+        # Edge publishes the pointers in UTF-16 with BOM
+        encoding = "utf-16" if content[:2] in (b"\xff\xfe", b"\xfe\xff") else "utf-8-sig"
+        version = content.decode(encoding, errors="replace").strip()
+        return version if re.fullmatch(r"[0-9]+(\.[0-9]+)+", version) else None
+
+    def dl_driver(self, url: str, dst: Path) -> str:
         """
         Download WebDriver archive to given path.
 
         :param url: URL of the WebDriver
         :param dst: Path where to save WebDriver
-        :return: None
+        :return: SHA-256 digest of downloaded file calculated while streaming
         """
         logger.debug(f"Downloading from: {url} to: {dst}")
+        sha256 = hashlib.sha256()
         with open(str(dst), "wb") as f:
             r = self.get_url(url, stream=True)
             r.raw.decode_content = True
-            shutil.copyfileobj(r.raw, f)
+            for chunk in iter(lambda: r.raw.read(self._CHUNK_SIZE), b""):
+                sha256.update(chunk)
+                f.write(chunk)
+        return sha256.hexdigest()
@@ -1,50 +1,126 @@
 import re
 import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from pydriverr.config import WebDriverType
 from pydriverr.custom_logger import logger
 from pydriverr.downloader import Downloader
+from pydriverr.pydriver_types import OptionalString
+from pydriverr.versions import VersionsInfo
 from pydriverr.webdriver import WebDriver
 
 
 class ChromeDriver(WebDriver):
-    """Handle Chrome WebDriver"""
+    """
+    Handle Chrome WebDriver.
+
+    Versions 115 and newer are listed by Chrome for Testing JSON index. Older versions are listed by the legacy
+    storage bucket, which is downloaded only when requested version is not in the index or when the index is not
+    available.
+    """
+
+    driver_type = WebDriverType.CHROME.drv_name
+
+    CFT_CATALOG_URL = "https://googlechromelabs.github.io/chrome-for-testing/known-good-versions-with-downloads.json"
+    CFT_DOWNLOAD_URL = "https://storage.googleapis.com/chrome-for-testing-public"
+    CFT_LATEST_URL = "https://googlechromelabs.github.io/chrome-for-testing/LATEST_RELEASE_{release}"
+    # Name of saved listing of the legacy bucket in the catalog store
+    LEGACY_CATALOG = "chrome-legacy"
+    # Chrome for Testing platform -> (OS, architecture)
+    CFT_PLATFORMS: Dict[str, Tuple[str, str]] = {
+        "linux64": ("linux", "64"),
+        "mac-x64": ("mac", "64"),
+        "mac-arm64": ("mac", "arm64"),
+        "win32": ("win", "32"),
+        "win64": ("win", "64"),
+    }
 
     def __init__(self):
         super().__init__()
         self.downloader = Downloader()
 
-    def _parse_version_os_arch(self, file_name: str) -> None:
+    def _parse_cft_versions(self, versions: List[Dict]) -> None:
         """
-        Parse chromedriver compressed file name
+        Parse Chrome for Testing index, skipping versions without chromedriver downloads and unknown platforms
 
-        :param file_name: Name of the compressed file.
+        :param versions: `versions` list of the index
         :return: None
         """
-        match = re.match(
-            r"(([0-9]+\.){1,3}[0-9]+).*/chromedriver_(linux|win|mac)(32|64)\.zip",
-            file_name,
-        )
-        if match:
-            os_ = str(match.group(3))
-            arch = str(match.group(4))
-            self.update_version_dict(
-                version=str(match.group(1)), os_=os_, arch=arch, file_name=f"chromedriver_{os_}{arch}.zip"
-            )
+        for version_data in versions:
+            for download in version_data.get("downloads", {}).get("chromedriver", []):
+                platform = download.get("platform")
+                if platform in self.CFT_PLATFORMS:
+                    os_, arch = self.CFT_PLATFORMS[platform]
+                    self.update_version_dict(
+                        version=version_data["version"], os_=os_, arch=arch, file_name=f"chromedriver-{platform}.zip"
+                    )
+
+    def _get_legacy_drivers_list(self) -> None:
+        """
+        Get versions up to 114 from the legacy storage bucket. No versions are added to the bucket anymore, so it is
+        listed once and its listing is saved in the catalog store and reused.
+
+        :return: None
+        """
+        legacy = self.catalogs.load(self.LEGACY_CATALOG)
+        if legacy is None:
+            r = self.downloader.get_url(WebDriverType.CHROME.url)
+            root = ET.fromstring(r.content)
+            ns = root.tag.replace("ListBucketResult", "")
+            legacy = WebDriverType.CHROME.naming.parse_listing(key.text for key in root.iter(f"{ns}Key"))
+            self.catalogs.save(self.LEGACY_CATALOG, legacy)
+        else:
+            logger.debug("Using saved list of chromedriver versions older than 115")
+        for version, os_data in legacy.items():
+            version_data = self._versions_info.setdefault(version, {})
+            for os_, arch_data in os_data.items():
+                version_data.setdefault(os_, {}).update(arch_data)
 
     def get_remote_drivers_list(self) -> None:
-        r = self.downloader.get_url(WebDriverType.CHROME.url)
-        root = ET.fromstring(r.content)
-        ns = root.tag.replace("ListBucketResult", "")
-        for key in root.iter(f"{ns}Key"):
-            self._parse_version_os_arch(key.text)
-
-    def install(self, version: str, os_: str, arch: str) -> None:
-        logger.debug(f"Requested version: {version}, OS: {os_}, arch: {arch}")
-        self.get_remote_drivers_list()
-        version, os_, arch, file_name = self.validate_version_os_arch(WebDriverType.CHROME.drv_name, version, os_, arch)
-        url = f"{WebDriverType.CHROME.url}/{version}/{file_name}"
-        self.install_driver(WebDriverType.CHROME.drv_name, url, version, os_, arch, file_name)
-
-    def update(self) -> None:
-        self.generic_update(WebDriverType.CHROME.drv_name, self.get_remote_drivers_list, self.install)
+        import requests
+
+        try:
+            r = self.downloader.send(self.CFT_CATALOG_URL)
+            if r.status_code != 200:
+                raise ValueError(f"status code {r.status_code}")
+            self._parse_cft_versions(r.json()["versions"])
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug(f"Chrome for Testing index not available ({e}), using legacy storage bucket")
+            self._versions_info = {}
+            self._get_legacy_drivers_list()
+
+    def get_latest_remote_driver(self, os_: str, major: OptionalString = None) -> Optional[VersionsInfo]:
+        version = self.downloader.get_version_pointer(self.CFT_LATEST_URL.format(release=major or "STABLE"))
+        if version is None or int(version.split(".")[0]) < 115:
+            return None  # Chrome for Testing has no chromedriver before 115
+        latest: VersionsInfo = {version: {}}
+        for platform, (platform_os, platform_arch) in self.CFT_PLATFORMS.items():
+            latest[version].setdefault(platform_os, {})[platform_arch] = f"chromedriver-{platform}.zip"
+        return latest
+
+    def load_older_remote_drivers_list(self) -> bool:
+        self.load_remote_drivers_list()  # list of all versions instead of the newest one from fast-path endpoint
+        if any(
+            file_name.startswith("chromedriver_")
+            for os_data in self._versions_info.values()
+            for arch_data in os_data.values()
+            for file_name in arch_data.values()
+        ):
+            return False  # legacy versions already listed
+        if self.fixed_catalog_source():
+            return False  # legacy bucket is not used offline or with mirror
+        logger.debug("Listing chromedriver versions older than 115 from legacy storage bucket")
+        self._versions_info = {
+            version: {os_: dict(arch_data) for os_, arch_data in os_data.items()}
+            for version, os_data in self._versions_info.items()
+        }
+        self._get_legacy_drivers_list()
+        self._share_remote_drivers_list()
+        return True
+
+    def get_download_url(self, version: str, file_name: Path) -> str:
+        match = re.match(r"chromedriver-(.+)\.zip$", str(file_name))
+        if match:
+            return f"{self.CFT_DOWNLOAD_URL}/{version}/{match.group(1)}/{file_name}"
+        return f"{WebDriverType.CHROME.url}/{version}/{file_name}"
@@ -1,49 +1,67 @@
-import re
 import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Optional
 
 from pydriverr.config import WebDriverType
-from pydriverr.custom_logger import logger
 from pydriverr.downloader import Downloader
+from pydriverr.pydriver_types import OptionalString
+from pydriverr.versions import VersionsInfo
 from pydriverr.webdriver import WebDriver
 
 
 class EdgeDriver(WebDriver):
     """Handle Edge WebDriver"""
 
+    driver_type = WebDriverType.EDGE.drv_name
+
+    # OS -> name used in LATEST_RELEASE_<major>_<OS> files
+    _LATEST_OS_NAMES = {"win": "WINDOWS", "mac": "MACOS", "linux": "LINUX"}
+
     def __init__(self):
         super().__init__()
         self.downloader = Downloader()
 
-    def _parse_version_os_arch(self, file_name: str) -> None:
+    def _list_names(self, prefix: str = "") -> List[str]:
         """
-        Parse edgedriver compressed file name
+        List names of files in the storage
 
-        :param file_name: Dict from GitHub API containing information about every release.
-        :return: None
+        :param prefix: List only names starting with the prefix (default: all names)
+        :return: Names of files
         """
-        match = re.match(
-            r"(([0-9]+\.){1,3}[0-9]+).*/edgedriver_(linux|win|mac|arm)(32|64|86)\.zip",
-            file_name,
-        )
-        if match:
-            os_ = str(match.group(3))
-            arch = str(match.group(4))
-            self.update_version_dict(
-                version=str(match.group(1)), os_=os_, arch=arch, file_name=f"edgedriver_{os_}{arch}.zip"
-            )
+        url = f"{WebDriverType.EDGE.url}/?comp=list" + (f"&prefix={prefix}" if prefix else "")
+        root = ET.fromstring(self.downloader.get_url(url).content)
+        return [key.text for key in root.iter("Name")]
 
     def get_remote_drivers_list(self) -> None:
-        r = self.downloader.get_url(f"{WebDriverType.EDGE.url}/?comp=list")
-        root = ET.fromstring(r.content)
-        for key in root.iter("Name"):
-            self._parse_version_os_arch(key.text)
-
-    def install(self, version: str, os_: str, arch: str) -> None:
-        logger.debug(f"Requested version: {version}, OS: {os_}, arch: {arch}")
-        self.get_remote_drivers_list()
-        version, os_, arch, file_name = self.validate_version_os_arch(WebDriverType.EDGE.drv_name, version, os_, arch)
-        url = f"{WebDriverType.EDGE.url}/{version}/{file_name}"
-        self.install_driver(WebDriverType.EDGE.drv_name, url, version, os_, arch, file_name)
-
-    def update(self) -> None:
-        self.generic_update(WebDriverType.EDGE.drv_name, self.get_remote_drivers_list, self.install)
+        WebDriverType.EDGE.naming.parse_listing(self._list_names(), self._versions_info)
+
+    def get_newer_remote_drivers_list(self, known: VersionsInfo) -> bool:
+        # Names are listed in lexicographic order, where e.g. 100.x comes before 99.x, so newer versions are listed by
+        # prefix of their major version: the newest known one and following ones until there is no version
+        majors = [int(version.split(".")[0]) for version in known if version.split(".")[0].isdigit()]
+        if not majors:
+            return False
+        newest = major = max(majors)
+        while True:
+            names = self._list_names(prefix=f"{major}.")
+            if not names and major > newest:
+                return True
+            WebDriverType.EDGE.naming.parse_listing(names, self._versions_info)
+            major += 1
+
+    def get_latest_remote_driver(self, os_: str, major: OptionalString = None) -> Optional[VersionsInfo]:
+        if major:
+            if os_ not in self._LATEST_OS_NAMES:
+                return None
+            url = f"{WebDriverType.EDGE.url}/LATEST_RELEASE_{major}_{self._LATEST_OS_NAMES[os_]}"
+        else:
+            url = f"{WebDriverType.EDGE.url}/LATEST_STABLE"
+        version = self.downloader.get_version_pointer(url)
+        if version is None:
+            return None
+        # platforms differ between versions, so only files published for the version are listed
+        latest = WebDriverType.EDGE.naming.parse_listing(self._list_names(prefix=f"{version}/"))
+        return latest or None
+
+    def get_download_url(self, version: str, file_name: Path) -> str:
+        return f"{WebDriverType.EDGE.url}/{version}/{file_name}"
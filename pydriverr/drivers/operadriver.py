@@ -1,60 +1,48 @@
-import re
-from typing import Dict
+from pathlib import Path
+from typing import Optional
 
 from pydriverr.config import WebDriverType
-from pydriverr.custom_logger import logger
 from pydriverr.githubapi import GithubApi
+from pydriverr.pydriver_types import OptionalString
+from pydriverr.versions import VersionsInfo
 from pydriverr.webdriver import WebDriver
 
 
 class OperaDriver(WebDriver):
     """Handle Opera WebDriver"""
 
+    driver_type = WebDriverType.OPERA.drv_name
+
     __OWNER = "operasoftware"
     __REPO = "operachromiumdriver"
 
     def __init__(self):
         super().__init__()
-        self.githubapi = GithubApi(self.__OWNER, self.__REPO)
-
-    def _parse_version_os_arch(self, releases_info: Dict) -> None:
-        """
-        Parse operadriver compressed file name
-
-        :param releases_info: Dict from GitHub API containing information about every release. Key is version tag.
-        :return: None
-        """
-        for version_tag, filenames in releases_info.items():
-            for filename in filenames:
-                match = re.match(
-                    r"(operadriver)_(linux|win|mac)(32|64)*\.(.*)",
-                    filename,
-                )
-                if match:
-                    version = re.search(r"[0-9]+(\.[0-9]+)+", version_tag)  # search only for version number
-                    os_ = str(match.group(2))
-                    self.update_version_dict(
-                        version=version.group(0),
-                        os_=os_,
-                        arch=str(match.group(3)),
-                        file_name=filename,
-                    )
+        self.githubapi = GithubApi(self.__OWNER, self.__REPO, self.cache_dir)
 
     def get_remote_drivers_list(self) -> None:
-        releases = self.githubapi.get_releases()
-        self._parse_version_os_arch(releases)
-
-    def install(self, version: str, os_: str, arch: str) -> None:
-        logger.debug(f"Requested version: {version}, OS: {os_}, arch: {arch}")
-        self.get_remote_drivers_list()
-        version, os_, arch, file_name = self.validate_version_os_arch(WebDriverType.OPERA.drv_name, version, os_, arch)
+        WebDriverType.OPERA.naming.parse_releases(self.githubapi.get_releases(), self._versions_info)
+
+    def get_newer_remote_drivers_list(self, known: VersionsInfo) -> bool:
+        naming = WebDriverType.OPERA.naming
+        naming.parse_releases(
+            self.githubapi.get_newer_releases(lambda tag: naming.tag_version(tag) in known), self._versions_info
+        )
+        return True
+
+    def get_latest_remote_driver(self, os_: str, major: OptionalString = None) -> Optional[VersionsInfo]:
+        if major:
+            return None
+        releases = self.githubapi.get_latest_release()
+        if not releases:
+            return None
+        self._versions_info = WebDriverType.OPERA.naming.parse_releases(releases)
+        return self._versions_info
+
+    def get_download_url(self, version: str, file_name: Path) -> str:
         url = WebDriverType.OPERA.url.format(owner=self.__OWNER, repo=self.__REPO)
         if version[0] == "0":  # old version "0.x.x" instead v. have just v
             prefix = "v"
         else:
             prefix = "v."
-        url = url + f"/releases/download/{prefix}{version}/{file_name}"
-        self.install_driver(WebDriverType.OPERA.drv_name, url, version, os_, arch, file_name)
-
-    def update(self) -> None:
-        self.generic_update(WebDriverType.OPERA.drv_name, self.get_remote_drivers_list, self.install)
+        return url + f"/releases/download/{prefix}{version}/{file_name}"
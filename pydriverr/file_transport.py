@@ -0,0 +1,46 @@
+import os
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+from urllib3.response import HTTPResponse
+
+
+class FileAdapter(requests.adapters.BaseAdapter):
+    """
+    Transport adapter reading `file://` URLs straight from disk, so listings and archives of local-directory mirrors
+    go through the same `requests` session as remote ones. Missing files are answered with 404.
+    """
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        """
+        Open file given by URL of the request
+
+        :param request: GET or HEAD request of `file://` URL
+        :param stream: Should the content be read when accessed, it is always read lazily from the file
+        :return: Response with content of the file
+        """
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        path = url2pathname(urlparse(request.url).path)
+        if request.method not in ("GET", "HEAD"):
+            response.status_code, response.reason, body = 405, "Method Not Allowed", None
+        else:
+            try:
+                body = open(path, "rb")
+                response.status_code, response.reason = 200, "OK"
+                response.headers["Content-Length"] = str(os.fstat(body.fileno()).st_size)
+            except OSError as e:
+                response.status_code, response.reason, body = 404, e.strerror or "Not Found", None
+        if body is None:
+            response.raw = HTTPResponse(body=b"", status=response.status_code, preload_content=False)
+        else:
+            response.raw = HTTPResponse(
+                body=body, headers=response.headers, status=200, preload_content=False, decode_content=False
+            )
+        return response
+
+    def close(self) -> None:
+        pass
@@ -1,26 +1,112 @@
+import codecs
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import humanfriendly
+
 from pydriverr.custom_logger import logger
 from pydriverr.downloader import Downloader
 from pydriverr.pydriver_types import ReleasesInfo
+from pydriverr.support import Support
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Decode items of JSON array one by one while its UTF-8 encoded text arrives in chunks.
+
+    Only the item being decoded is kept in memory, not the whole array.
+
+    :param chunks: Consecutive parts of the array
+    :return: Iterator over decoded items
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("JSON array expected")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # item is not complete yet
+            yield item
+        buffer = buffer[pos:]
+    raise ValueError("Unexpected end of JSON array")
 
 
 class GithubApi:
     """
     Helper class to download from GitHub.
 
-    Uses internally `Downloader` class
+    Uses internally `Downloader` class. Requests are authorized with token from `GITHUB_TOKEN` env variable, when it is
+    set. With the token, releases are listed by GraphQL API asking only for fields used by pydriverr, 100 releases per
+    request, falling back to REST API when GraphQL query fails. Responses of REST API are saved in the cache dir with
+    their ETag and asked for again with `If-None-Match`, so unchanged lists of releases come back as 304 without their
+    content. Rate limit reported by GitHub is remembered between runs: when it is exhausted, saved response is used or
+    pydriverr waits for the reset up to `PYDRIVERR_GITHUB_MAX_WAIT` (default: 1m) instead of sending requests that
+    would fail.
     """
 
     API_URL = "https://api.github.com/repos/{owner}/{repo}"
+    TOKEN_ENV = "GITHUB_TOKEN"
+    MAX_WAIT_ENV = "PYDRIVERR_GITHUB_MAX_WAIT"
+    DEFAULT_MAX_WAIT = "1m"
+    _RATE_LIMIT_FILE = "rate_limit.json"
+    _RATE_LIMITED_STATUSES = (403, 429)
+    _CHUNK_SIZE = 64 * 1024
+    GRAPHQL_URL = "https://api.github.com/graphql"
+    GRAPHQL_URL_ENV = "PYDRIVERR_GITHUB_GRAPHQL_URL"
+    _GRAPHQL_PAGE_SIZE = 100
+    # Releases per GraphQL request when only releases newer than the known ones are listed
+    _NEWER_PAGE_SIZE = 10
+    _RELEASES_QUERY = """
+query($owner: String!, $repo: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    releases(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { tagName releaseAssets(first: 100) { nodes { name size downloadUrl } } }
+    }
+  }
+}
+"""
 
-    def __init__(self, owner: str, repo: str):
+    def __init__(self, owner: str, repo: str, cache_dir: Optional[Path] = None):
         """
         Init class
 
         :param owner: Owner of the GitHub repository
         :param repo: Name of the GitHub repository
+        :param cache_dir: PyDriverr cache dir, responses and rate limit are not saved when not given (default: None)
         """
         self._downloader = Downloader()
+        self._owner = owner
+        self._repo = repo
         self._api_url = self.API_URL.format(owner=owner, repo=repo)
+        self._store_dir = cache_dir / "github" if cache_dir else None
+        self.support = Support()
 
     def get_releases(self) -> ReleasesInfo:
         """
@@ -28,13 +114,336 @@ class GithubApi:
 
         :return: Dictionary with of given repo releases
         """
+        if os.environ.get(self.TOKEN_ENV):
+            releases = self._get_graphql_releases()
+            if releases is not None:
+                return self._parse_releases(releases)
+        url_postfix = "/releases"
+        return self._parse_releases(self.get_json(self._api_url + url_postfix, array_item=self._reduce_release))
+
+    def get_newer_releases(self, is_known: Callable[[str], bool]) -> ReleasesInfo:
+        """
+        Download releases newer than the known ones, stopping at the first known release
+
+        :param is_known: Function telling if release with given tag is already known
+        :return: Dictionary with new releases
+        """
+        releases = self._get_graphql_releases(is_known) if os.environ.get(self.TOKEN_ENV) else None
+        if releases is None:
+            # The same first page as of the whole list, so unchanged page comes back as 304 thanks to its ETag
+            page = self.get_json(self._api_url + "/releases", array_item=self._reduce_release)
+            releases = list(itertools.takewhile(lambda release: not is_known(release.get("tag_name")), page))
+        return self._parse_releases(releases)
+
+    def get_latest_release(self) -> Optional[ReleasesInfo]:
+        """
+        Download the latest release only
+
+        :return: Dictionary with the latest release or None when it is not available
+        """
+        release = self.get_json(self._api_url + "/releases/latest", required=False)
+        return self._parse_releases([self._reduce_release(release)]) if release else None
+
+    def _get_graphql_releases(self, is_known: Optional[Callable[[str], bool]] = None) -> Optional[List[Dict]]:
+        """
+        List releases with GraphQL API, page after page
+
+        :param is_known: Stop at the first release for which this function returns True, in smaller pages
+                         (default: list all releases)
+        :return: Releases in the same shape as reduced releases of REST API or None when GraphQL query failed
+        """
+        releases: List[Dict] = []
+        cursor = None
+        page_size = self._GRAPHQL_PAGE_SIZE if is_known is None else self._NEWER_PAGE_SIZE
+        while True:
+            page = self._query_releases_page(cursor, page_size)
+            if page is None:
+                return None
+            for node in page.get("nodes") or []:
+                if is_known is not None and is_known(node.get("tagName")):
+                    return releases
+                releases.append(
+                    {
+                        "tag_name": node.get("tagName"),
+                        "assets": [
+                            {
+                                "name": asset.get("name"),
+                                "size": asset.get("size"),
+                                "browser_download_url": asset.get("downloadUrl"),
+                            }
+                            for asset in (node.get("releaseAssets") or {}).get("nodes") or []
+                        ],
+                    }
+                )
+            page_info = page.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return releases
+            cursor = page_info.get("endCursor")
+
+    def _query_releases_page(self, cursor: Optional[str], page_size: int) -> Optional[Dict]:
+        """
+        Send GraphQL query for one page of releases
+
+        :param cursor: Cursor of the end of previous page, None for the first page
+        :param page_size: Number of releases in the page
+        :return: `releases` connection with `nodes` and `pageInfo` or None when the query failed
+        """
+        import requests
+
+        url = os.environ.get(self.GRAPHQL_URL_ENV) or self.GRAPHQL_URL
+        query = {
+            "query": self._RELEASES_QUERY,
+            "variables": {"owner": self._owner, "repo": self._repo, "first": page_size, "after": cursor},
+        }
+        try:
+            r = self._downloader.send(url, headers=self._headers(None), json_body=query)
+            if r.status_code != 200:
+                raise ValueError(f"status code {r.status_code}")
+            content = r.json()
+            if content.get("errors"):
+                raise ValueError(content["errors"])
+            return content["data"]["repository"]["releases"]
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug(f"GraphQL query of releases failed ({e}), using REST API")
+            return None
+
+    @staticmethod
+    def _reduce_release(release: Dict) -> Dict:
+        """
+        Keep only data of the release used by pydriverr, dropping release notes, authors etc.
+
+        :param release: Release returned by GitHub API
+        :return: Release with tag name and name, size and download URL of every asset
+        """
+        return {
+            "tag_name": release.get("tag_name"),
+            "assets": [
+                {key: asset.get(key) for key in ("name", "size", "browser_download_url")}
+                for asset in release.get("assets") or []
+            ],
+        }
+
+    @staticmethod
+    def _parse_releases(releases_json: List[Dict]) -> ReleasesInfo:
+        """
+        Take names of assets of every release
+
+        :param releases_json: Releases returned by GitHub API
+        :return: Dictionary with names of assets per release tag
+        """
         # Skip asc files that are used to verify the archive
         releases = {}
-        url_postfix = "/releases"
-        r = self._downloader.get_url(self._api_url + url_postfix).json()
-        for release in r:
+        for release in releases_json:
             releases[release.get("tag_name")] = [
                 asset.get("name") for asset in release.get("assets") if not asset.get("name").endswith(".asc")
             ]
-        logger.debug(releases)
+        logger.debug(f"Found releases: {', '.join(str(tag) for tag in releases)}")
         return releases
+
+    def get_json(self, url: str, required: bool = True, array_item: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Get JSON response of GitHub API, respecting the rate limit
+
+        :param url: URL of GitHub API endpoint
+        :param required: Should pydriverr exit when the response is not available (default: True)
+        :param array_item: Response is a JSON array parsed incrementally while it is downloaded, only result of this
+                           function for every item is kept (default: whole response is decoded at once)
+        :return: Decoded JSON response or None when not required response is not available
+        """
+        saved = self._load_response(url)
+        wait = self._rate_limit_wait()
+        if wait is not None:
+            if saved is not None:
+                logger.info(f"GitHub API rate limit exceeded, using saved response of {url}")
+                return saved["body"]
+            self._wait_or_exit(wait)
+        headers = self._headers(saved)
+        stream = array_item is not None
+        r = self._send(url, headers, stream)
+        if r.status_code in self._RATE_LIMITED_STATUSES and self._retry_after(r) is not None:
+            r.close()
+            if saved is not None:
+                logger.info(f"GitHub API rate limit exceeded, using saved response of {url}")
+                return saved["body"]
+            self._wait_or_exit(self._retry_after(r))
+            r = self._send(url, headers, stream)
+        if r.status_code == 304 and saved is not None:
+            r.close()
+            logger.debug(f"Not modified since last download: {url}")
+            return saved["body"]
+        if r.status_code != 200:
+            r.close()
+            if not required:
+                logger.debug(f"Response of {url} not available, status code: {r.status_code}")
+                return None
+            self.support.exit(f"Cannot download file {url}")
+        body = self._read_body(r, url, array_item)
+        if r.headers.get("ETag"):
+            self._save_response(url, r.headers["ETag"], body)
+        return body
+
+    def _read_body(self, r: "requests.Response", url: str, array_item: Optional[Callable[[Any], Any]]) -> Any:
+        """
+        Decode JSON content of the response, exit when it is not valid
+
+        :param r: Response with status 200
+        :param url: URL of GitHub API endpoint
+        :param array_item: Function applied to every item of JSON array decoded incrementally, whole response is
+                           decoded at once when it is None
+        :return: Decoded JSON response
+        """
+        try:
+            if array_item is None:
+                return r.json()
+            return [array_item(item) for item in iter_json_array(r.iter_content(self._CHUNK_SIZE))]
+        except ValueError as e:
+            logger.debug(f"Invalid JSON: {e}")
+            self.support.exit(f"Invalid response of {url}")
+        finally:
+            r.close()
+
+    def _headers(self, saved: Optional[Dict]) -> Dict[str, str]:
+        """
+        Return headers of the request
+
+        :param saved: Saved response of the same URL
+        :return: Headers with token and ETag of saved response, if they are available
+        """
+        headers = {"Accept": "application/vnd.github+json"}
+        token = os.environ.get(self.TOKEN_ENV)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if saved is not None:
+            headers["If-None-Match"] = saved["etag"]
+        return headers
+
+    def _send(self, url: str, headers: Dict[str, str], stream: bool = False) -> "requests.Response":
+        """
+        Send request and remember rate limit reported in the response
+
+        :param url: URL of GitHub API endpoint
+        :param headers: Headers of the request
+        :param stream: Should the response content be retrieved when accessed (default: False)
+        :return: Response of any status
+        """
+        r = self._downloader.send(url, headers=headers, stream=stream)
+        remaining, reset = r.headers.get("X-RateLimit-Remaining"), r.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            logger.debug(f"GitHub API requests remaining: {remaining}")
+            self._write_json(self._rate_limit_path(), {"remaining": int(remaining), "reset": int(reset)})
+        return r
+
+    def _rate_limit_wait(self) -> Optional[float]:
+        """
+        Return time to wait for the reset of exhausted rate limit remembered from previous responses
+
+        :return: Seconds to wait or None when requests can be sent
+        """
+        rate_limit = self._read_json(self._rate_limit_path())
+        if not rate_limit or rate_limit.get("remaining", 1) > 0:
+            return None
+        wait = rate_limit.get("reset", 0) - time.time()
+        return wait if wait > 0 else None
+
+    @staticmethod
+    def _retry_after(r: "requests.Response") -> Optional[float]:
+        """
+        Return time to wait before retrying rate-limited request
+
+        :param r: Response with status 403 or 429
+        :return: Seconds to wait or None when request was refused for other reason than the rate limit
+        """
+        if r.headers.get("Retry-After", "").isdigit():
+            return float(r.headers["Retry-After"])
+        if r.headers.get("X-RateLimit-Remaining") == "0" and r.headers.get("X-RateLimit-Reset", "").isdigit():
+            return max(0.0, int(r.headers["X-RateLimit-Reset"]) - time.time())
+        return None
+
+    def _wait_or_exit(self, wait: float) -> None:
+        """
+        Wait for the reset of the rate limit if it is not longer than the maximum wait, otherwise exit
+
+        :param wait: Seconds to wait
+        :return: None
+        """
+        max_wait = self.support.parse_timespan(os.environ.get(self.MAX_WAIT_ENV, "") or self.DEFAULT_MAX_WAIT)
+        if wait > max_wait:
+            self.support.exit(
+                f"GitHub API rate limit exceeded, it resets in {humanfriendly.format_timespan(wait)}. "
+                f"Set {self.TOKEN_ENV} env variable to raise the limit"
+            )
+        logger.info(f"GitHub API rate limit exceeded, waiting {humanfriendly.format_timespan(wait)}")
+        time.sleep(wait)
+
+    def _rate_limit_path(self) -> Optional[Path]:
+        """
+        Return path of the rate limit remembered from the last response
+
+        :return: Path to JSON file or None when rate limit is not saved
+        """
+        return self._store_dir / self._RATE_LIMIT_FILE if self._store_dir else None
+
+    def _response_path(self, url: str) -> Optional[Path]:
+        """
+        Return path of saved response of given URL
+
+        :param url: URL of GitHub API endpoint
+        :return: Path to JSON file or None when responses are not saved
+        """
+        if not self._store_dir:
+            return None
+        return self._store_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _load_response(self, url: str) -> Optional[Dict]:
+        """
+        Read saved response of given URL
+
+        :param url: URL of GitHub API endpoint
+        :return: Dictionary with `etag` and `body` or None when there is no saved response
+        """
+        saved = self._read_json(self._response_path(url))
+        return saved if saved and "etag" in saved and "body" in saved else None
+
+    def _save_response(self, url: str, etag: str, body: Any) -> None:
+        """
+        Save response of given URL
+
+        :param url: URL of GitHub API endpoint
+        :param etag: ETag of the response
+        :param body: Decoded JSON response
+        :return: None
+        """
+        self._write_json(self._response_path(url), {"etag": etag, "body": body})
+
+    @staticmethod
+    def _read_json(path: Optional[Path]) -> Optional[Any]:
+        """
+        Read JSON file, ignoring missing and broken files
+
+        :param path: Path to the file
+        :return: Content of the file or None
+        """
+        if path is None:
+            return None
+        try:
+            with open(str(path), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Optional[Path], content: Any) -> None:
+        """
+        Write JSON file atomically, so concurrent readers never see partially written file
+
+        :param path: Path to the file, nothing is written when it is None
+        :param content: Content of the file
+        :return: None
+        """
+        if path is None:
+            return
+        Support.setup_dirs([path.parent])
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(str(tmp_path), "w", encoding="utf-8") as f:
+            json.dump(content, f)
+        os.replace(str(tmp_path), str(path))
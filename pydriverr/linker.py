@@ -0,0 +1,131 @@
+import errno
+import os
+import shutil
+import sys
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from pydriverr.custom_logger import logger
+from pydriverr.support import Support
+
+
+class LinkStrategy(Enum):
+    """Ways of placing a cached WebDriver file in the installation dir, from the cheapest to the most expensive"""
+
+    AUTO = "auto"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    SYMLINK = "symlink"
+    COPY = "copy"
+
+    @staticmethod
+    def list() -> List[str]:
+        """
+        Return list of supported strategy names
+
+        :return: List of all values in enum
+        """
+        return list(map(lambda c: c.value, LinkStrategy))
+
+
+class Linker:
+    """
+    Place files from the cache in the installation dir without copying the data whenever the filesystem allows it.
+
+    In `auto` mode strategies are tried in order: reflink, hardlink, symlink, copy. The first one that works for a
+    given pair of filesystems is remembered, so next links between them do not probe again. Strategy can be forced
+    with `PYDRIVERR_LINK_STRATEGY` env variable.
+    """
+
+    ENV_NAME = "PYDRIVERR_LINK_STRATEGY"
+    # ioctl request number of FICLONE from linux/fs.h
+    _FICLONE = 0x40049409
+    _AUTO_ORDER = [LinkStrategy.REFLINK, LinkStrategy.HARDLINK, LinkStrategy.SYMLINK, LinkStrategy.COPY]
+    _detected: Dict[Tuple[int, int], LinkStrategy] = {}
+
+    def __init__(self, strategy: str = ""):
+        """
+        Init class
+
+        :param strategy: Name of the strategy to use. When empty it is taken from env variable (default: auto)
+        """
+        strategy = strategy or os.environ.get(self.ENV_NAME, "") or LinkStrategy.AUTO.value
+        if strategy not in LinkStrategy.list():
+            Support.exit(f"Unknown link strategy: {strategy}, use one of: {', '.join(LinkStrategy.list())}")
+        self.strategy = LinkStrategy(strategy)
+
+    def link(self, src: Path, dst: Path) -> LinkStrategy:
+        """
+        Make `dst` point to the content of `src`. Existing `dst` is replaced.
+
+        :param src: Path to the file in the cache
+        :param dst: Path where file should be visible
+        :return: Strategy that was used
+        :raises OSError: When file cannot be placed with any strategy
+        """
+        if os.path.lexists(str(dst)):
+            os.remove(str(dst))
+        if self.strategy != LinkStrategy.AUTO:
+            self._methods()[self.strategy](src, dst)
+            logger.debug(f"Placed {dst} using {self.strategy.value}")
+            return self.strategy
+        fs_key = (os.stat(str(src)).st_dev, os.stat(str(dst.parent)).st_dev)
+        strategies = self._AUTO_ORDER
+        if fs_key in self._detected:
+            first = strategies.index(self._detected[fs_key])
+            strategies = strategies[first:]
+        error = None
+        for strategy in strategies:
+            try:
+                self._methods()[strategy](src, dst)
+            except OSError as e:
+                logger.debug(f"Cannot {strategy.value} {src} to {dst}: {e}")
+                if os.path.lexists(str(dst)):
+                    os.remove(str(dst))
+                error = e
+                continue
+            Linker._detected[fs_key] = strategy
+            logger.debug(f"Placed {dst} using {strategy.value}")
+            return strategy
+        raise error
+
+    @staticmethod
+    def materialize(path: Path) -> None:
+        """
+        Replace symlink with a regular copy of the file it points to, so it survives removal of the cache
+
+        :param path: Path to the possibly symlinked file
+        :return: None
+        """
+        if not path.is_symlink():
+            return
+        target = path.resolve()
+        os.remove(str(path))
+        if target.is_file():
+            shutil.copyfile(target, path)
+            logger.debug(f"Replaced symlink {path} with a copy of {target}")
+
+    def _methods(self) -> Dict[LinkStrategy, Callable[[Path, Path], None]]:
+        return {
+            LinkStrategy.REFLINK: self._reflink,
+            LinkStrategy.HARDLINK: lambda src, dst: os.link(str(src), str(dst)),
+            LinkStrategy.SYMLINK: lambda src, dst: os.symlink(str(Path(src).resolve()), str(dst)),
+            LinkStrategy.COPY: lambda src, dst: shutil.copyfile(src, dst),
+        }
+
+    @staticmethod
+    def _reflink(src: Path, dst: Path) -> None:
+        """
+        Clone file using copy-on-write (btrfs, xfs, overlayfs on top of them). Supported only on Linux.
+
+        :param src: Path to the source file
+        :param dst: Path to the clone
+        :return: None
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.EOPNOTSUPP, "reflink is supported only on Linux")
+        import fcntl
+
+        with open(str(src), "rb") as src_file, open(str(dst), "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), Linker._FICLONE, src_file.fileno())
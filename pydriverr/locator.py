@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+DRIVERS_HOME_ENV = "DRIVERS_HOME"
+DRIVERS_INI = ".drivers.ini"
+
+
+def read_drivers_ini(path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Read `.drivers.ini` file with a minimal parser understanding the subset of INI written by pydriverr
+
+    :param path: Path to the file
+    :return: Sections of the file as {driver type: {key: value}}, empty if file does not exist
+    """
+    sections: Dict[str, Dict[str, str]] = {}
+    section = None
+    try:
+        with open(str(path), encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return sections
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = sections.setdefault(line.strip("[]").strip(), {})
+        elif section is not None and "=" in line:
+            key, value = (part.strip() for part in line.split("=", 1))
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            section[key] = value
+    return sections
+
+
+def driver_path(driver_type: str, drivers_home: Optional[str] = None) -> Optional[Path]:
+    """
+    Return absolute path of installed WebDriver file.
+
+    Meant for test harnesses calling it many times: only `os` and `pathlib` are used, there is no network access,
+    no logger and no spinner.
+
+    :param driver_type: Type of the WebDriver e.g. chrome, gecko
+    :param drivers_home: Installation dir (default: taken from `DRIVERS_HOME` env variable)
+    :return: Path to the WebDriver file or None when the driver is not installed
+    """
+    drivers_home = drivers_home or os.environ.get(DRIVERS_HOME_ENV)
+    if not drivers_home:
+        return None
+    home = Path(drivers_home).absolute()
+    file_name = read_drivers_ini(home / DRIVERS_INI).get(driver_type, {}).get("FILENAME")
+    if not file_name:
+        return None
+    path = home / file_name
+    return path if path.is_file() else None
@@ -0,0 +1,98 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+from pydriverr.config import LOCKFILE_NAME, WebDriverType
+from pydriverr.support import Support
+from pydriverr.webdriver import InstallPlan
+
+
+class Lockfile:
+    """
+    Read and write JSON lockfile pinning WebDrivers to exact archives.
+
+    For every driver type lockfile keeps version, OS, architecture, URL, file name, size and SHA-256 digest of the
+    archive, so the driver can be installed without downloading the list of available WebDrivers.
+    """
+
+    DEFAULT_NAME = LOCKFILE_NAME
+    _FORMAT = 1
+    _KEYS = ["version", "os", "arch", "url", "file_name", "size", "sha256"]
+
+    def __init__(self, path: Path):
+        """
+        Init class
+
+        :param path: Path to the lockfile
+        """
+        self.path = path
+        self.support = Support()
+
+    def write(self, plans: List[InstallPlan]) -> None:
+        """
+        Write lockfile atomically
+
+        :param plans: Resolved WebDrivers with size and digest of their archives
+        :return: None
+        """
+        content = {
+            "format": self._FORMAT,
+            "drivers": {
+                plan.driver_type: {
+                    "version": plan.version,
+                    "os": plan.os_,
+                    "arch": plan.arch,
+                    "url": plan.url,
+                    "file_name": str(plan.file_name),
+                    "size": plan.size,
+                    "sha256": plan.digest,
+                }
+                for plan in plans
+            },
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(str(tmp_path), "w") as f:
+            json.dump(content, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(str(tmp_path), str(self.path))
+
+    def load(self) -> List[InstallPlan]:
+        """
+        Read and validate lockfile
+
+        :return: WebDrivers pinned in the lockfile
+        """
+        try:
+            with open(str(self.path)) as f:
+                content = json.load(f)
+        except OSError as e:
+            self.support.exit(f"Cannot read lockfile {self.path}: {e.strerror}")
+        except ValueError as e:
+            self.support.exit(f"Invalid lockfile {self.path}: {e}")
+        if not isinstance(content, dict) or content.get("format") != self._FORMAT:
+            self.support.exit(f"Unsupported lockfile format in {self.path}")
+        drivers = content.get("drivers") or {}
+        unknown = sorted(set(drivers) - set(WebDriverType.list()))
+        if unknown:
+            self.support.exit(f"Unknown driver types in lockfile {self.path}: {', '.join(unknown)}")
+        incomplete = sorted(
+            driver_type for driver_type, entry in drivers.items() if any(key not in entry for key in self._KEYS)
+        )
+        if incomplete:
+            self.support.exit(f"Incomplete entries in lockfile {self.path}: {', '.join(incomplete)}")
+        if not drivers:
+            self.support.exit(f"No drivers listed in lockfile {self.path}")
+        return [
+            InstallPlan(
+                driver_type,
+                entry["version"],
+                entry["os"],
+                entry["arch"],
+                entry["url"],
+                Path(entry["file_name"]),
+                entry["sha256"],
+                entry["size"],
+            )
+            for driver_type, entry in drivers.items()
+        ]
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from pydriverr.config import WebDriverType
+from pydriverr.support import Support
+
+
+@dataclass
+class ManifestEntry:
+    """Single WebDriver requested in the manifest file"""
+
+    driver_type: str
+    version: str = ""
+    os_: str = ""
+    arch: str = ""
+
+
+class Manifest:
+    """
+    Read TOML manifest listing WebDrivers to install, one table per driver type e.g.:
+
+        [drivers.chrome]
+        version = "114.0.5735.90"
+        os = "linux"
+        arch = "64"
+
+    Every key is optional. Version can be a constraint e.g. `>=114,<116`, missing version means the newest one.
+    Missing OS and arch mean the current platform.
+    """
+
+    _KEYS = {"version": "version", "os": "os_", "arch": "arch"}
+
+    def __init__(self, path: Path):
+        """
+        Init class
+
+        :param path: Path to the manifest file
+        """
+        self.path = path
+        self.support = Support()
+
+    def load(self) -> List[ManifestEntry]:
+        """
+        Read and validate the manifest
+
+        :return: Requested WebDrivers in order of appearance in the file
+        """
+        content = self._parse()
+        drivers = content.get("drivers")
+        if not isinstance(drivers, dict) or not drivers:
+            self.support.exit(f"No drivers listed in manifest {self.path}")
+        entries = []
+        errors = []
+        for driver_type, options in drivers.items():
+            if driver_type not in WebDriverType.list():
+                errors.append(f"Unknown driver type {driver_type} in manifest {self.path}")
+                continue
+            if not isinstance(options, dict):
+                errors.append(f"Driver {driver_type} in manifest {self.path} must be a table")
+                continue
+            unknown_keys = sorted(set(options) - set(self._KEYS))
+            if unknown_keys:
+                errors.append(f"Unknown keys for {driver_type} in manifest {self.path}: {', '.join(unknown_keys)}")
+                continue
+            entries.append(
+                ManifestEntry(driver_type, **{self._KEYS[key]: str(value) for key, value in options.items()})
+            )
+        if errors:
+            self.support.exit(errors)
+        return entries
+
+    def _parse(self) -> dict:
+        """
+        Parse manifest with `tomllib` (Python 3.11+) or `tomli` package, dependency of pydriverr on older Pythons
+
+        :return: Content of the manifest
+        """
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                self.support.exit("Reading manifest requires 'tomli' package on Python older than 3.11")
+        try:
+            with open(str(self.path), "rb") as f:
+                return tomllib.load(f)
+        except OSError as e:
+            self.support.exit(f"Cannot read manifest {self.path}: {e.strerror}")
+        except tomllib.TOMLDecodeError as e:
+            self.support.exit(f"Invalid manifest {self.path}: {e}")
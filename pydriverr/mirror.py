@@ -0,0 +1,252 @@
+import gzip
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydriverr.custom_logger import logger
+from pydriverr.snapshot import CatalogSnapshot, ExportedCatalog
+from pydriverr.versions import VersionConstraint
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydriverr.webdriver import WebDriver
+
+# (driver type, version, os, arch, exported entry, digest recorded by previous sync)
+MissingArchive = Tuple[str, str, str, str, Dict[str, Any], str]
+
+
+class Mirror:
+    """
+    Mirror of lists of available versions and archives of one driver type, configured with env variables:
+
+    * `PYDRIVERR_<TYPE>_CATALOG_URL` - catalog snapshot written by `pydriverr catalog export`, used instead of
+      listing versions upstream,
+    * `PYDRIVERR_<TYPE>_ARTIFACT_URL` - base of archives laid out as `<base>/<version>/<file name>`, used instead of
+      upstream download URLs.
+
+    URLs may use `http://`, `https://` and `file://` schemes, paths of local directories are turned into `file://` URLs.
+    """
+
+    CATALOG_URL_ENV = "PYDRIVERR_{driver_type}_CATALOG_URL"
+    ARTIFACT_URL_ENV = "PYDRIVERR_{driver_type}_ARTIFACT_URL"
+
+    def __init__(self, driver_type: str):
+        """
+        Init class
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        """
+        self.catalog_url = self._url_from_env(self.CATALOG_URL_ENV, driver_type)
+        self.artifact_url = self._url_from_env(self.ARTIFACT_URL_ENV, driver_type)
+
+    @staticmethod
+    def _url_from_env(env_name: str, driver_type: str) -> Optional[str]:
+        """
+        Read mirror URL of given driver type from env variable
+
+        :param env_name: Name of the env variable with `{driver_type}` placeholder
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :return: URL or None when env variable is not set
+        """
+        value = os.environ.get(env_name.format(driver_type=driver_type.upper()), "").strip() if driver_type else ""
+        if not value:
+            return None
+        if "://" not in value:
+            return Path(value).expanduser().absolute().as_uri()
+        return value.rstrip("/")
+
+    def artifact(self, version: str, file_name: str) -> Optional[str]:
+        """
+        Return URL of the archive in the mirror
+
+        :param version: Version of the WebDriver
+        :param file_name: Name of the archive
+        :return: URL or None when archives are not mirrored
+        """
+        return f"{self.artifact_url}/{version}/{file_name}" if self.artifact_url else None
+
+
+class MirrorDirectory:
+    """
+    Local mirror written by `pydriverr mirror sync`: catalog snapshot `catalogs.json` of mirrored versions and
+    archives laid out as `<type>/<version>/<file name>`. It is served by pointing `PYDRIVERR_<TYPE>_CATALOG_URL` to the
+    snapshot and `PYDRIVERR_<TYPE>_ARTIFACT_URL` to the `<type>` directory.
+
+    Sizes and digests of mirrored archives are kept in the snapshot, so repeated syncs download only archives that are
+    not in the mirror yet.
+    """
+
+    CATALOG_NAME = "catalogs.json"
+
+    def __init__(self, path: Path):
+        """
+        Init class
+
+        :param path: Path to the mirror directory
+        """
+        self.path = path
+        self.snapshot = CatalogSnapshot(path / self.CATALOG_NAME)
+
+    def artifact_path(self, driver_type: str, version: str, file_name: str) -> Path:
+        """
+        Return path of the archive in the mirror
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param version: Version of the WebDriver
+        :param file_name: Name of the archive
+        :return: Path to the archive (may not exist)
+        """
+        return self.path / driver_type / version / file_name
+
+    def load(self) -> Dict[str, ExportedCatalog]:
+        """
+        Read catalogs written by previous sync
+
+        :return: Exported catalog of every mirrored driver type, empty when mirror is new
+        """
+        if not self.snapshot.path.is_file():
+            return {}
+        return self.snapshot.load_exported()[1]
+
+    def sync(
+        self,
+        drivers: Dict[str, "WebDriver"],
+        constraint: VersionConstraint,
+        oses: Sequence[str] = (),
+        archs: Sequence[str] = (),
+        jobs: int = 4,
+        max_age: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """
+        List available versions of given drivers and download archives missing in the mirror concurrently. Catalog
+        snapshot is written also when sync fails, so archives downloaded so far are not downloaded again.
+
+        :param drivers: WebDriver object of every synced driver type
+        :param constraint: Versions to mirror
+        :param oses: OSes to mirror (default: all)
+        :param archs: Architectures to mirror (default: all)
+        :param jobs: Number of concurrent downloads
+        :param max_age: Maximum age in seconds of saved lists of available versions (default: always download)
+        :return: Number of downloaded archives of every synced driver type
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        catalogs = self.load()
+        with ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+            exported = dict(zip(drivers, executor.map(lambda d: d.export_catalog(max_age), drivers.values())))
+        missing = list(self._missing(catalogs, exported, constraint, oses, archs))
+        downloaded = {driver_type: 0 for driver_type in drivers}
+        try:
+            with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+                for (driver_type, version, os_, arch, entry, _), mirrored in zip(
+                    missing, executor.map(lambda m: self._fetch(drivers[m[0]], *m[1:]), missing)
+                ):
+                    catalogs[driver_type].setdefault(version, {}).setdefault(os_, {})[arch] = mirrored
+                    downloaded[driver_type] += 1
+        finally:
+            catalogs = {driver_type: catalog for driver_type, catalog in catalogs.items() if catalog}
+            if catalogs:
+                self.path.mkdir(parents=True, exist_ok=True)
+                self.snapshot.write(catalogs)
+        return downloaded
+
+    def _missing(
+        self,
+        catalogs: Dict[str, ExportedCatalog],
+        exported: Dict[str, ExportedCatalog],
+        constraint: VersionConstraint,
+        oses: Sequence[str],
+        archs: Sequence[str],
+    ) -> Iterator[MissingArchive]:
+        """
+        Find selected archives that are not in the mirror or whose file differs from the size recorded by previous sync
+
+        :param catalogs: Exported catalogs of the mirror, updated with selected archives already in the mirror
+        :param exported: Exported catalogs of available versions
+        :param constraint: Versions to mirror
+        :param oses: OSes to mirror (default: all)
+        :param archs: Architectures to mirror (default: all)
+        :return: Archives to download
+        """
+        for driver_type, catalog in exported.items():
+            mirrored = catalogs.setdefault(driver_type, {})
+            for version, os_data in catalog.items():
+                if not constraint.contains(version):
+                    continue
+                for os_, arch, entry in self._platforms(os_data, oses, archs):
+                    known = mirrored.get(version, {}).get(os_, {}).get(arch) or {}
+                    path = self.artifact_path(driver_type, version, entry["file_name"])
+                    if path.is_file() and path.stat().st_size == known.get("size"):
+                        continue
+                    yield driver_type, version, os_, arch, entry, known.get("sha256", "")
+
+    @staticmethod
+    def _platforms(
+        os_data: Dict[str, Dict[str, Dict[str, Any]]], oses: Sequence[str], archs: Sequence[str]
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Return exported entries of one version matching OS and architecture filters
+
+        :param os_data: Exported entries of the version as {os: {arch: entry}}
+        :param oses: OSes to mirror (default: all)
+        :param archs: Architectures to mirror (default: all)
+        :return: List of (os, arch, entry)
+        """
+        return [
+            (os_, arch, entry)
+            for os_, arch_data in os_data.items()
+            if not oses or os_ in oses
+            for arch, entry in arch_data.items()
+            if not archs or arch in archs
+        ]
+
+    def _fetch(
+        self, driver: "WebDriver", version: str, os_: str, arch: str, entry: Dict[str, Any], digest: str
+    ) -> Dict[str, Any]:
+        """
+        Place archive in the mirror, downloaded archive must be readable
+
+        :param driver: WebDriver object of the archive's driver type
+        :param version: Version of the WebDriver
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :param entry: Exported entry of the archive
+        :param digest: Digest recorded by previous sync, the archive must match it (default: any digest)
+        :return: Exported entry with size and digest of mirrored archive
+        """
+        dst = self.artifact_path(driver.driver_type, version, entry["file_name"])
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        mirrored = driver.mirror_archive(
+            version, os_, arch, entry, dst, digest or entry.get("sha256", ""), check=self.is_readable_archive
+        )
+        logger.debug(f"Mirrored {dst}")
+        return mirrored
+
+    @staticmethod
+    def is_readable_archive(path: Path) -> bool:
+        """
+        Check that zip, tar.gz or gz archive can be read to the end, so truncated downloads and error pages are not
+        mirrored
+
+        :param path: Path to the archive
+        :return: True if archive can be read or has unknown type
+        """
+        name = path.name
+        try:
+            if name.endswith(".zip"):
+                with zipfile.ZipFile(str(path)) as zip_file:
+                    return zip_file.testzip() is None
+            if name.endswith((".tar.gz", ".tgz")):
+                with tarfile.open(str(path), "r:gz") as tar_file:
+                    for member in tar_file:
+                        if member.isfile():
+                            tar_file.extractfile(member).read()
+                return True
+            if name.endswith(".gz"):
+                with gzip.open(str(path), "rb") as gz_file:
+                    while gz_file.read(1024 * 1024):
+                        pass
+        except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError):
+            return False
+        return True
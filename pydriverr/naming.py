@@ -0,0 +1,111 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Pattern, Tuple
+
+from pydriverr.config import WebDriverType
+from pydriverr.pydriver_types import ReleasesInfo
+from pydriverr.versions import VersionsInfo
+
+# Version number in release tags like `v0.30.0` or `v.88.0.4324.104`
+TAG_VERSION_PATTERN = re.compile(r"[0-9]+(\.[0-9]+)+")
+
+
+@dataclass(frozen=True)
+class NamingRule:
+    """
+    Rules of names of files published for one WebDriver type.
+
+    Pattern has `os` and `arch` named groups and, for listings of storage buckets, `version` group. OS and
+    architecture are translated by the alias maps, missing architecture is `None` key of `arch_map`.
+    """
+
+    pattern: Pattern[str]
+    os_aliases: Dict[str, str] = field(default_factory=dict)
+    arch_map: Dict[Optional[str], str] = field(default_factory=lambda: {None: ""})
+    # File name saved in the catalog, formatted with `os` and `arch`, the matched name is saved when not given
+    file_name: Optional[str] = None
+
+    def parse_listing(
+        self, names: Iterable[str], versions_info: Optional[VersionsInfo] = None, version: Optional[str] = None
+    ) -> VersionsInfo:
+        """
+        Add matching names to the catalog in a single pass, skipping names of other files
+
+        :param names: Names of files, e.g. keys of storage bucket
+        :param versions_info: Catalog to update (default: new catalog)
+        :param version: Version of all files, taken from `version` group of the pattern when not given
+        :return: Updated catalog as {version: {os: {arch: file name}}}
+        """
+        versions_info = {} if versions_info is None else versions_info
+        match, groups = self.pattern.match, self.pattern.groupindex
+        version_group = 0 if version else groups["version"]
+        os_group, arch_group = groups["os"], groups["arch"]
+        # (matched OS, matched architecture) -> (OS, architecture, file name), few entries translated only once
+        platforms: Dict[Tuple[str, Optional[str]], Tuple[str, str, Optional[str]]] = {}
+        for name in names:
+            m = match(name)
+            if m is None:
+                continue
+            matched_version, matched_os, matched_arch = m.group(version_group, os_group, arch_group)
+            platform = platforms.get((matched_os, matched_arch))
+            if platform is None:
+                os_ = self.os_aliases.get(matched_os, matched_os)
+                arch = self.arch_map.get(matched_arch, matched_arch)
+                platform = (os_, arch, self.file_name.format(os=os_, arch=arch) if self.file_name else None)
+                platforms[matched_os, matched_arch] = platform
+            os_, arch, file_name = platform
+            version_data = versions_info.get(version or matched_version)
+            if version_data is None:
+                version_data = versions_info[version or matched_version] = {}
+            os_data = version_data.get(os_)
+            if os_data is None:
+                os_data = version_data[os_] = {}
+            os_data[arch] = file_name or name
+        return versions_info
+
+    def parse_releases(self, releases_info: ReleasesInfo, versions_info: Optional[VersionsInfo] = None) -> VersionsInfo:
+        """
+        Add assets of GitHub releases to the catalog, skipping releases without version in their tag
+
+        :param releases_info: Names of assets per release tag
+        :param versions_info: Catalog to update (default: new catalog)
+        :return: Updated catalog as {version: {os: {arch: file name}}}
+        """
+        versions_info = {} if versions_info is None else versions_info
+        for version_tag, file_names in releases_info.items():
+            version = self.tag_version(version_tag)
+            if version:
+                self.parse_listing(file_names, versions_info, version)
+        return versions_info
+
+    @staticmethod
+    def tag_version(version_tag: Optional[str]) -> Optional[str]:
+        """
+        Return version number of release tag
+
+        :param version_tag: Tag of GitHub release e.g. v0.30.0
+        :return: Version or None when tag has no version number
+        """
+        version = TAG_VERSION_PATTERN.search(version_tag or "")
+        return version.group(0) if version else None
+
+
+NAMING_RULES: Dict[WebDriverType, NamingRule] = {
+    WebDriverType.CHROME: NamingRule(
+        pattern=re.compile(
+            r"(?P<version>([0-9]+\.){1,3}[0-9]+).*/chromedriver_(?P<os>linux|win|mac)(?P<arch>32|64)\.zip"
+        ),
+        file_name="chromedriver_{os}{arch}.zip",
+    ),
+    WebDriverType.EDGE: NamingRule(
+        pattern=re.compile(
+            r"(?P<version>([0-9]+\.){1,3}[0-9]+).*/edgedriver_(?P<os>linux|win|mac|arm)(?P<arch>32|64|86)\.zip"
+        ),
+        file_name="edgedriver_{os}{arch}.zip",
+    ),
+    WebDriverType.GECKO: NamingRule(
+        pattern=re.compile(r"(geckodriver|wires)-.*?-(?P<os>linux|win|macos|macOS|OSX|osx|arm)(?P<arch>32|64|7hf)*\."),
+        os_aliases={"macos": "mac", "macOS": "mac", "OSX": "mac", "osx": "mac"},
+    ),
+    WebDriverType.OPERA: NamingRule(pattern=re.compile(r"operadriver_(?P<os>linux|win|mac)(?P<arch>32|64)*\.")),
+}
@@ -1,12 +1,17 @@
-from typing import Union
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 import click
 
-from pydriverr.config import LOGGING_CONF, WebDriverType
+from pydriverr.config import LOCKFILE_NAME, LOGGING_CONF, CheckStatus, WebDriverType
 from pydriverr.custom_logger import logger
-from pydriverr.pydriver_types import Drivers, OptionalString, Version
-from pydriverr.support import Support
-from pydriverr.webdriver import WebDriver
+from pydriverr.pydriver_types import Drivers, FnPrepare, OptionalString, Version
+
+# Modules doing the actual work pull in requests, configobj, tabulate etc. They are imported by commands that need
+# them, so `--help` and trivial commands start fast.
+if TYPE_CHECKING:  # pragma: no cover
+    from pydriverr.webdriver import CheckResult, FetchResult, WebDriver
 
 __all__ = [
     "cli_pydriverr",
@@ -17,16 +22,32 @@ __all__ = [
     "show_installed",
     "show_available",
     "clear_cache",
+    "cache",
+    "cache_verify",
+    "cache_gc",
+    "catalog",
+    "catalog_export",
+    "catalog_import",
+    "mirror",
+    "mirror_sync",
+    "lock",
+    "path",
+    "check",
 ]
 
 logger.configure(**LOGGING_CONF)
-logger.debug("{:=>10}Starting new session{:=>10}".format("", ""))
+
+
+# Commands that do not need the logger and WebDriver objects
+_LIGHTWEIGHT_COMMANDS = ["path"]
 
 
 class _PyDriverr:
     """Provide main functionality of pydriverr by initializing all the required subclasses in proper way"""
 
     def __init__(self, driver_type: OptionalString = None):
+        from pydriverr.support import Support
+
         self.support = Support()
         self.webdriver_obj = driver_type
 
@@ -47,6 +68,8 @@ class _PyDriverr:
         :return: None
         """
         if not driver_type:
+            from pydriverr.webdriver import WebDriver
+
             self._webdriver_obj = WebDriver()
         elif driver_type == "chrome":
             from pydriverr.drivers.chromedriver import ChromeDriver
@@ -67,14 +90,24 @@ class _PyDriverr:
 
 
 @click.group()
-def cli_pydriverr():
+@click.pass_context
+def cli_pydriverr(ctx: click.Context):
     """
     Download and manage selenium WebDrivers from a single app
 
     \f
     click group that holds all functions under common parent name
+
+    :param ctx: click context
     """
-    pass
+    if ctx.invoked_subcommand in _LIGHTWEIGHT_COMMANDS:
+        return
+    from pydriverr.cache import Cache
+    from pydriverr.webdriver import WebDriver
+
+    logger.debug("{:=>10}Starting new session{:=>10}".format("", ""))
+    WebDriver.invalidate_remote_drivers_lists()
+    ctx.call_on_close(Cache.flush_all)
 
 
 @cli_pydriverr.command(short_help="Show used directories and their size")
@@ -82,6 +115,10 @@ def show_env() -> None:
     """
     Show where WebDrivers are downloaded to and cache dir with usage data
 
+    \b
+    Sizes of WebDrivers and cached objects are taken from the cache index, installed WebDrivers are indexed on first
+    use. Other files in the cache dir are counted from the disk.
+
     Examples:
 
     \b
@@ -92,14 +129,48 @@ def show_env() -> None:
         driver = _PyDriverr()
         logger.info(
             f"WebDrivers are installed in: {driver.webdriver_obj.drivers_home}, total size is: "
-            f"{driver.support.calculate_dir_size(driver.webdriver_obj.drivers_home)}"
+            f"{driver.support.format_size(driver.webdriver_obj.get_installed_drivers_size())}"
         )
         logger.info(
             f"PyDriverr cache is in: {driver.webdriver_obj.cache_dir}, total size is: "
-            f"{driver.support.calculate_dir_size(driver.webdriver_obj.cache_dir)}"
+            f"{driver.support.format_size(driver.webdriver_obj.cache.disk_usage())}"
         )
 
 
+@cli_pydriverr.command(short_help="Print path of installed WebDriver")
+@click.option(
+    "-d",
+    "--driver-type",
+    type=click.Choice(WebDriverType.list()),
+    required=True,
+    help="Type of the WebDriver e.g. chrome, gecko",
+)
+def path(driver_type: str) -> None:
+    """
+    Print absolute path of installed WebDriver file, exit with code 1 if the driver is not installed
+
+    \b
+    Only the installation dir is read: there is no network access, spinner or logging, so the command is cheap
+    enough to be called by test harnesses. From Python use `pydriverr.locator.driver_path`.
+
+    Examples:
+
+    \b
+        Print path of installed chrome WebDriver
+        $ pydriverr path -d chrome
+
+    \f
+    :param driver_type: Type of the WebDriver e.g. chrome, gecko
+    """
+    from pydriverr.locator import driver_path
+
+    driver_file = driver_path(driver_type)
+    if driver_file is None:
+        click.echo(f"Driver {driver_type}driver is not installed", err=True)
+        sys.exit(1)
+    click.echo(str(driver_file))
+
+
 @cli_pydriverr.command(short_help="List installed WebDrivers in a form of table")
 def show_installed() -> None:
     """
@@ -142,7 +213,7 @@ def show_available(driver_type: str) -> None:
     """
     with logger.spinner(f"Show available drivers for: [{driver_type}]"):
         driver = _PyDriverr(driver_type)
-        driver.webdriver_obj.get_remote_drivers_list()
+        driver.webdriver_obj.load_remote_drivers_list()
         logger.info(f"Available {driver_type} drivers:")
         driver.webdriver_obj.print_remote_drivers()
 
@@ -167,26 +238,354 @@ def clear_cache() -> None:
         driver.webdriver_obj.clear_cache()
 
 
+@cli_pydriverr.group(short_help="Manage content of the cache directory")
+def cache() -> None:
+    """
+    Manage content of the cache directory
+
+    \b
+    Downloaded archives and extracted WebDrivers are stored in the cache once per unique content, named by their
+    SHA-256 digest.
+    """
+    pass
+
+
+@cache.command(name="verify", short_help="Check integrity of the cached files")
+@click.option("--deep", is_flag=True, default=False, help="Check also content of every file against its digest")
+def cache_verify(deep: bool = False) -> None:
+    """
+    Check that every file in the cache exists and has size recorded in the cache index
+
+    Examples:
+
+    \b
+        Verify the cache
+        $ pydriverr cache verify
+    \b
+        Verify the cache and content of every cached file against its SHA-256 digest
+        $ pydriverr cache verify --deep
+
+    \f
+    :param deep: Should content of every file be checked against its digest
+    """
+    with logger.spinner("Verify cache"):
+        driver = _PyDriverr()
+        problems = driver.webdriver_obj.cache.verify(deep)
+        if problems:
+            driver.support.exit(problems)
+        logger.info(f"Cache is consistent, verified objects: {driver.webdriver_obj.cache.objects_count()}")
+
+
+def _check_size(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    """
+    Check that option value is a size in human-readable form
+
+    :param ctx: Click context
+    :param param: Checked option
+    :param value: Value of the option
+    :return: Value of the option
+    """
+    import humanfriendly
+
+    try:
+        value and humanfriendly.parse_size(value)
+    except humanfriendly.InvalidSize:
+        raise click.BadParameter(f"{value!r} is not a size e.g. 500MB, 1GB")
+    return value
+
+
+def _check_timespan(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    """
+    Check that option value is a time span in human-readable form
+
+    :param ctx: Click context
+    :param param: Checked option
+    :param value: Value of the option
+    :return: Value of the option
+    """
+    import humanfriendly
+
+    try:
+        value and humanfriendly.parse_timespan(value)
+    except humanfriendly.InvalidTimespan:
+        raise click.BadParameter(f"{value!r} is not a time span e.g. 30d, 12h")
+    return value
+
+
+@cache.command(name="gc", short_help="Evict least recently used files from the cache")
+@click.option(
+    "--max-size",
+    default="",
+    callback=_check_size,
+    help="Maximum total size of the cache e.g. 500MB (default: no limit)",
+)
+@click.option(
+    "--max-age",
+    default="",
+    callback=_check_timespan,
+    help="Evict entries not used for longer than e.g. 30d, 12h (default: no limit)",
+)
+@click.option(
+    "--keep-versions",
+    type=click.IntRange(min=0),
+    help="Number of most recently used versions kept per driver type",
+)
+def cache_gc(max_size: str = "", max_age: str = "", keep_versions: Optional[int] = None) -> None:
+    """
+    Evict least recently used files from the cache until it fits in the budget
+
+    \b
+    Limits not given as options are taken from env variables PYDRIVERR_CACHE_MAX_SIZE, PYDRIVERR_CACHE_MAX_AGE and
+    PYDRIVERR_CACHE_KEEP_VERSIONS. The same limits are applied automatically after every installation. Installed
+    WebDrivers are never evicted.
+
+    Examples:
+
+    \b
+        Keep the cache below 1 GB
+        $ pydriverr cache gc --max-size 1GB
+    \b
+        Evict everything not used for two weeks and keep at most 2 versions of every driver type
+        $ pydriverr cache gc --max-age 2w --keep-versions 2
+
+    \f
+    :param max_size: Maximum total size of the cache in human-readable form
+    :param max_age: Maximum time since last use of cached entry in human-readable form
+    :param keep_versions: Number of most recently used versions kept per driver type
+    """
+    from pydriverr.cache import CacheBudget
+
+    with logger.spinner("Collect cache garbage"):
+        driver = _PyDriverr()
+        budget = CacheBudget.from_env(max_size, max_age, keep_versions)
+        if not budget.is_set():
+            driver.support.exit("No cache limits given")
+        for key in driver.webdriver_obj.collect_cache_garbage(budget):
+            logger.info(f"Evicted from cache: {key}")
+        logger.info(f"Cache size: {driver.support.format_size(driver.webdriver_obj.cache.size())}")
+
+
+@cli_pydriverr.group(short_help="Move lists of available WebDrivers between hosts")
+def catalog() -> None:
+    """
+    Move lists of available WebDrivers (catalogs) between hosts
+
+    \b
+    Catalogs exported on a host with internet access are imported on hosts without it. With PYDRIVERR_OFFLINE env
+    variable set, imported catalogs are used without listing versions over the network.
+    """
+    pass
+
+
+@catalog.command(name="export", short_help="Write catalogs of all WebDrivers to a snapshot file")
+@click.option(
+    "-d",
+    "--driver-type",
+    multiple=True,
+    type=click.Choice(WebDriverType.list()),
+    help="Type of the WebDriver e.g. chrome, gecko (default: all)",
+)
+@click.option(
+    "--max-age",
+    default="",
+    help="Use saved lists of available versions younger than e.g. 30m, 0s to always download (default: 1h)",
+)
+@click.argument("snapshot", type=click.Path(dir_okay=False, path_type=Path))
+def catalog_export(snapshot: Path, driver_type: Drivers = (), max_age: str = "") -> None:
+    """
+    Download catalogs and write them to a snapshot file with download URLs, and sizes and digests of archives found
+    in the cache
+
+    Examples:
+
+    \b
+        Export catalogs of all WebDrivers:
+        $ pydriverr catalog export catalogs.json
+    \b
+        Import them on a host without internet access:
+        $ pydriverr catalog import catalogs.json
+
+    \f
+    :param snapshot: Path to the snapshot file
+    :param driver_type: Types of the WebDriver e.g. chrome, gecko
+    :param max_age: Maximum age of saved lists of available versions in human-readable form
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydriverr.catalog import CatalogStore
+    from pydriverr.snapshot import CatalogSnapshot
+
+    ttl = CatalogStore.ttl_from_env(max_age)
+
+    with logger.spinner(f"Exporting catalogs to: [{snapshot}]"):
+        state_owner = _PyDriverr().webdriver_obj
+        drivers = []
+        for type_ in driver_type or WebDriverType.list():
+            driver = _PyDriverr(type_).webdriver_obj
+            driver.share_state(state_owner)
+            drivers.append(driver)
+        with ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+            catalogs = dict(
+                zip(driver_type or WebDriverType.list(), executor.map(lambda d: d.export_catalog(ttl), drivers))
+            )
+        CatalogSnapshot(snapshot).write(catalogs)
+        for type_, exported in catalogs.items():
+            logger.info(f"Exported {len(exported)} versions of {type_}driver")
+
+
+@catalog.command(name="import", short_help="Load catalogs from a snapshot file")
+@click.argument("snapshot", type=click.Path(dir_okay=False, path_type=Path))
+def catalog_import(snapshot: Path) -> None:
+    """
+    Load catalogs from a snapshot file written by `pydriverr catalog export` to the catalog store
+
+    Examples:
+
+    \b
+        Import catalogs and list versions without internet access:
+        $ pydriverr catalog import catalogs.json
+        $ PYDRIVERR_OFFLINE=1 pydriverr show-available -d chrome
+
+    \f
+    :param snapshot: Path to the snapshot file
+    """
+    from pydriverr.snapshot import CatalogSnapshot
+
+    with logger.spinner(f"Importing catalogs from: [{snapshot}]"):
+        driver = _PyDriverr()
+        created_at, catalogs = CatalogSnapshot(snapshot).load()
+        for type_, versions_info in catalogs.items():
+            driver.webdriver_obj.catalogs.save(type_, versions_info, fetched_at=created_at)
+            logger.info(f"Imported {len(versions_info)} versions of {type_}driver")
+
+
+@cli_pydriverr.group(short_help="Maintain local mirror of WebDrivers")
+def mirror() -> None:
+    """
+    Maintain local mirror of WebDrivers
+
+    \b
+    Mirror directory holds catalog snapshot `catalogs.json` and archives laid out as `<type>/<version>/<file name>`,
+    used with PYDRIVERR_<TYPE>_CATALOG_URL and PYDRIVERR_<TYPE>_ARTIFACT_URL env variables.
+    """
+    pass
+
+
+@mirror.command(name="sync", short_help="Download WebDrivers missing in the mirror directory")
+@click.option(
+    "-d",
+    "--driver-type",
+    multiple=True,
+    type=click.Choice(WebDriverType.list()),
+    help="Type of the WebDriver e.g. chrome, gecko (default: all)",
+)
+@click.option("-v", "--version", default="", help="Versions to mirror e.g. >=114,<116 or ~=0.33 (default: all)")
+@click.option("-o", "--os", "os_", multiple=True, help="Operating System of mirrored WebDrivers (default: all)")
+@click.option("-a", "--arch", multiple=True, help="Architecture of mirrored WebDrivers (default: all)")
+@click.option("-j", "--jobs", default=4, type=click.IntRange(min=1), help="Number of concurrent downloads (default: 4)")
+@click.option(
+    "--max-age",
+    default="",
+    help="Use saved lists of available versions younger than e.g. 30m, 0s to always download (default: 1h)",
+)
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+def mirror_sync(
+    directory: Path,
+    driver_type: Drivers = (),
+    version: str = "",
+    os_: Tuple[str] = (),
+    arch: Tuple[str] = (),
+    jobs: int = 4,
+    max_age: str = "",
+) -> None:
+    """
+    Mirror selected WebDrivers to a directory. Only archives missing in the mirror are downloaded, so repeated syncs
+    transfer only new releases.
+
+    Examples:
+
+    \b
+        Mirror geckodriver 0.33 and newer for Linux:
+        $ pydriverr mirror sync /srv/mirror -d gecko -v ">=0.33" -o linux
+    \b
+        Install from the mirror:
+        $ PYDRIVERR_GECKO_CATALOG_URL=/srv/mirror/catalogs.json PYDRIVERR_GECKO_ARTIFACT_URL=/srv/mirror/gecko \\
+          pydriverr install -d gecko
+
+    \f
+    :param directory: Path to the mirror directory
+    :param driver_type: Types of the WebDriver e.g. chrome, gecko
+    :param version: Versions to mirror
+    :param os_: OSes to mirror
+    :param arch: Architectures to mirror
+    :param jobs: Number of concurrent downloads
+    :param max_age: Maximum age of saved lists of available versions in human-readable form
+    """
+    from pydriverr.catalog import CatalogStore
+    from pydriverr.mirror import MirrorDirectory
+    from pydriverr.versions import VersionConstraint
+
+    ttl = CatalogStore.ttl_from_env(max_age)
+
+    with logger.spinner(f"Syncing mirror: [{directory}]"):
+        state_owner = _PyDriverr().webdriver_obj
+        drivers = {}
+        for type_ in driver_type or WebDriverType.list():
+            drivers[type_] = _PyDriverr(type_).webdriver_obj
+            drivers[type_].share_state(state_owner)
+        downloaded = MirrorDirectory(directory).sync(drivers, VersionConstraint(version), os_, arch, jobs, ttl)
+        for type_, count in downloaded.items():
+            logger.info(f"Mirrored {count} new archives of {type_}driver")
+
+
 @cli_pydriverr.command(short_help="Download certain version of given WebDriver type")
 @click.option(
     "-d",
     "--driver-type",
     type=click.Choice(WebDriverType.list()),
-    required=True,
     help="Type of the WebDriver e.g. chrome, gecko",
 )
-@click.option("-v", "--version", default="", help="Version of requested WebDriver (default: newest)")
+@click.option(
+    "-v",
+    "--version",
+    default="",
+    help="Version or version constraint e.g. '>=114,<116', '~=0.33', 'latest-of-major:118' (default: newest)",
+)
 @click.option("-o", "--os", "os_", default="", help="Operating System for requested WebDriver (default: current OS)")
 @click.option("-a", "--arch", default="", help="Architecture for requested WebDriver (default: current OS architecture")
 @click.option(
     "-m", "--match-browser", is_flag=True, default=False, help="Match driver version, os and arch to installed browser"
 )
+@click.option(
+    "-f",
+    "--from",
+    "manifest",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Install all WebDrivers listed in TOML manifest file",
+)
+@click.option(
+    "--locked",
+    is_flag=True,
+    default=False,
+    help="Install WebDrivers pinned in the lockfile, without downloading lists of available WebDrivers",
+)
+@click.option(
+    "-l",
+    "--lockfile",
+    default=LOCKFILE_NAME,
+    show_default=True,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Path to the lockfile used with '--locked'",
+)
 def install(
-    driver_type: str,
+    driver_type: OptionalString = None,
     version: Version = "",
     os_: str = "",
     arch: str = "",
     match_browser: bool = False,
+    manifest: Optional[Path] = None,
+    locked: bool = False,
+    lockfile: Path = Path(LOCKFILE_NAME),
 ) -> None:
     """
     Download certain version of given WebDriver type
@@ -199,6 +598,9 @@ def install(
     \b
         Install given chrome Webdriver version for OS and arch on which pydriverr is run:
         $ pydriverr install -d chrome -v 89.0.4389.23
+    \b
+        Install the newest chrome Webdriver with major version 114 or 115:
+        $ pydriverr install -d chrome -v '>=114,<116'
     \b
         Install the newest gecko WebDriver for given OS but the arch is taken from current OS:
         $ pydriverr install -d gecko -o linux
@@ -211,14 +613,37 @@ def install(
     \b
         Install chrome driver matching version to installed Google Chrome browser (OS and arch matching current system)
         $ pydriverr install -d chrome -m
+    \b
+        Install all WebDrivers listed in the manifest file:
+        $ pydriverr install --from pydriverr.toml
+    \b
+        Install all WebDrivers pinned in the lockfile written by `pydriverr lock`:
+        $ pydriverr install --locked
 
     \f
     :param driver_type: Type of the WebDriver e.g. chrome, gecko
-    :param version: Version of requested WebDriver (default: newest)
+    :param version: Version or version constraint of requested WebDriver (default: newest)
     :param os_: Operating System for requested WebDriver (default: current OS)
     :param arch: Architecture for requested WebDriver (default: current OS architecture)
     :param match_browser: Should install the driver in the same version and for the same OS as web browser
+    :param manifest: Path to the manifest file listing WebDrivers to install
+    :param locked: Should install WebDrivers pinned in the lockfile
+    :param lockfile: Path to the lockfile
     """
+    from pydriverr.support import Support
+
+    if manifest or locked:
+        if driver_type or version or os_ or arch or match_browser or (manifest and locked):
+            Support.exit("Options '--from' and '--locked' cannot be used together with other options")
+        if locked:
+            with logger.spinner(f"Install drivers from: [{lockfile}]"):
+                _install_locked(lockfile)
+        else:
+            with logger.spinner(f"Install drivers from: [{manifest}]"):
+                _install_from_manifest(manifest)
+        return
+    if not driver_type:
+        Support.exit("Missing option '-d' / '--driver-type', '--from' or '--locked'")
     with logger.spinner(f"Install driver for: [{driver_type}]"):
         driver = _PyDriverr(driver_type)
         if match_browser:
@@ -248,7 +673,7 @@ def _get_nearest_driver_version_to_install(driver: _PyDriverr, driver_type: str)
     browser_version = driver.webdriver_obj.get_browser_version(driver_type, WebDriverType.cmd_for_drv_name(driver_type))
     if not driver.webdriver_obj.should_install_matched(driver_type, browser_version):
         return
-    driver.webdriver_obj.get_remote_drivers_list()
+    driver.webdriver_obj.load_remote_drivers_list()
     return driver.webdriver_obj.find_closest_matched_version(browser_version)
 
 
@@ -289,6 +714,282 @@ def delete(driver_type: Drivers) -> None:
         driver.webdriver_obj.delete_drivers(driver_type)
 
 
+def _prepare_fetch(driver: "WebDriver", fn_prepare: FnPrepare, action: str) -> "FetchResult":
+    """
+    Run single job of `_fetch_and_apply`, turning its failure into failed result
+
+    :param driver: WebDriver object of the driver type
+    :param fn_prepare: Function preparing the driver on given WebDriver object
+    :param action: Name of the action used in failure messages e.g. install, update
+    :return: Result of the job
+    """
+    from pydriverr.webdriver import FetchResult
+
+    try:
+        return fn_prepare(driver)
+    except SystemExit as e:
+        if not e.code:  # nothing to do e.g. requested driver already installed
+            return FetchResult(driver.driver_type)
+        return FetchResult(driver.driver_type, f"Failed to {action} {driver.driver_type}driver", failed=True)
+    except Exception as e:  # e.g. connection reset, broken archive; must not stop the other jobs
+        logger.debug(f"Failed to {action} {driver.driver_type}driver: {e!r}")
+        return FetchResult(driver.driver_type, f"Failed to {action} {driver.driver_type}driver: {e}", failed=True)
+
+
+def _fetch_and_apply(state_owner: "WebDriver", jobs: List[Tuple[str, FnPrepare]], action: str) -> None:
+    """
+    Fetch WebDrivers concurrently and install them when all are fetched.
+
+    Every job runs in its own thread (at most one per driver type): it resolves the driver against the list of
+    available versions and downloads it to the cache. Fetched drivers are installed one after another, .ini file is
+    written once and result of every job is reported. Failing job does not stop the others, but makes the command
+    exit with code 1.
+
+    :param state_owner: WebDriver object holding .ini file state and the cache shared by all the drivers
+    :param jobs: Pairs of driver type and function preparing it on given WebDriver object of that type
+    :param action: Name of the action used in failure messages e.g. install, update
+    :return: None
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydriverr.cache import CacheBudget
+
+    budget = CacheBudget.from_env()  # invalid limits are reported before anything is installed
+    drivers = []
+    for driver_type, _ in jobs:
+        driver = _PyDriverr(driver_type).webdriver_obj
+        driver.share_state(state_owner)
+        drivers.append(driver)
+
+    with ThreadPoolExecutor(max_workers=min(len(drivers), len(WebDriverType))) as executor:
+        fns_prepare = [fn_prepare for _, fn_prepare in jobs]
+        results = list(executor.map(_prepare_fetch, drivers, fns_prepare, [action] * len(jobs)))
+    for driver, result in zip(drivers, results):
+        driver.apply_fetched(result, write=False)
+    if any(result.plan or (result.checked_at and not result.failed) for result in results):
+        state_owner.drivers_state.write()
+    if any(result.plan for result in results):
+        state_owner.collect_cache_garbage(budget)
+    if any(result.failed for result in results):
+        sys.exit(1)
+
+
+def _update_drivers(state_owner: "WebDriver", driver_types: Drivers) -> None:
+    """
+    Update given WebDrivers concurrently
+
+    :param state_owner: WebDriver object holding .ini file state and the cache shared by all the drivers
+    :param driver_types: Types of the WebDriver e.g. chrome, gecko
+    :return: None
+    """
+    from pydriverr.webdriver import WebDriver
+
+    _fetch_and_apply(state_owner, [(driver_type, WebDriver.prepare_update) for driver_type in driver_types], "update")
+
+
+def _install_from_manifest(manifest_path: Path) -> None:
+    """
+    Install all WebDrivers listed in the manifest concurrently
+
+    :param manifest_path: Path to the manifest file
+    :return: None
+    """
+    from pydriverr.manifest import Manifest
+    from pydriverr.webdriver import WebDriver
+
+    entries = Manifest(manifest_path).load()
+    jobs = [
+        (entry.driver_type, lambda driver, entry=entry: driver.prepare_install(entry.version, entry.os_, entry.arch))
+        for entry in entries
+    ]
+    _fetch_and_apply(WebDriver(), jobs, "install")
+
+
+def _install_locked(lockfile_path: Path) -> None:
+    """
+    Install all WebDrivers pinned in the lockfile concurrently, without downloading lists of available WebDrivers
+
+    :param lockfile_path: Path to the lockfile
+    :return: None
+    """
+    from pydriverr.lockfile import Lockfile
+    from pydriverr.webdriver import WebDriver
+
+    plans = Lockfile(lockfile_path).load()
+    jobs = [(plan.driver_type, lambda driver, plan=plan: driver.prepare_locked(plan)) for plan in plans]
+    _fetch_and_apply(WebDriver(), jobs, "install")
+
+
+@cli_pydriverr.command(short_help="Write lockfile pinning WebDrivers to exact archives")
+@click.option(
+    "-f",
+    "--from",
+    "manifest",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Lock WebDrivers listed in TOML manifest file instead of installed ones",
+)
+@click.option(
+    "-l",
+    "--lockfile",
+    default=LOCKFILE_NAME,
+    show_default=True,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Path to the lockfile",
+)
+def lock(manifest: Optional[Path] = None, lockfile: Path = Path(LOCKFILE_NAME)) -> None:
+    """
+    Write lockfile with download URL, size and SHA-256 digest of the archive of every WebDriver
+
+    Examples:
+
+    \b
+        Lock installed WebDrivers:
+        $ pydriverr lock
+    \b
+        Lock WebDrivers listed in the manifest:
+        $ pydriverr lock --from pydriverr.toml
+    \b
+        Install WebDrivers from the lockfile:
+        $ pydriverr install --locked
+
+    \f
+    :param manifest: Path to the manifest file listing WebDrivers to lock
+    :param lockfile: Path to the lockfile
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydriverr.lockfile import Lockfile
+    from pydriverr.manifest import Manifest, ManifestEntry
+    from pydriverr.support import Support
+    from pydriverr.webdriver import WebDriver
+
+    with logger.spinner(f"Locking drivers in: [{lockfile}]"):
+        state_owner = WebDriver()
+        if manifest:
+            entries = Manifest(manifest).load()
+        else:
+            entries = [
+                ManifestEntry(driver_type, driver["VERSION"], driver["OS"], driver["ARCHITECTURE"])
+                for driver_type, driver in state_owner.drivers_state.items()
+            ]
+        if not entries:
+            Support.exit("No drivers installed")
+        drivers = []
+        for entry in entries:
+            driver = _PyDriverr(entry.driver_type).webdriver_obj
+            driver.share_state(state_owner)
+            drivers.append(driver)
+        with ThreadPoolExecutor(max_workers=min(len(drivers), len(WebDriverType))) as executor:
+            plans = list(
+                executor.map(
+                    lambda driver, entry: driver.resolve_locked(entry.version, entry.os_, entry.arch), drivers, entries
+                )
+            )
+        Lockfile(lockfile).write(plans)
+        for plan in plans:
+            logger.info(f"Locked {plan.driver_type}driver {plan.version}: {plan.url} sha256:{plan.digest}")
+
+
+@cli_pydriverr.command(short_help="Check whether installed WebDrivers are in the newest version")
+@click.option(
+    "-d",
+    "--driver-type",
+    multiple=True,
+    type=click.Choice(WebDriverType.list()),
+    help="Type of the WebDriver e.g. chrome, gecko",
+)
+@click.option(
+    "--max-age",
+    default="",
+    help="Use saved lists of available versions younger than e.g. 30m, 0s to always download (default: 1h)",
+)
+@click.option("--json", "as_json", is_flag=True, default=False, help="Write result as JSON to stdout")
+def check(driver_type: Drivers, max_age: str = "", as_json: bool = False) -> None:
+    """
+    Check whether given WebDriver or all installed WebDrivers are in the newest version
+
+    \b
+    Nothing is downloaded and installed besides lists of available versions, which are reused from the cache while
+    younger than `--max-age` or PYDRIVERR_CATALOG_TTL env variable. Drivers are checked in parallel.
+
+    \b
+    Exit codes:
+        0 - all WebDrivers are up to date
+        1 - at least one WebDriver could not be checked
+        3 - at least one WebDriver is outdated
+        4 - at least one of given WebDrivers is not installed
+        5 - at least one WebDriver has no remote version for its OS and architecture
+
+    Examples:
+
+    \b
+        Check all installed WebDrivers:
+        $ pydriverr check
+    \b
+        Update chrome WebDriver only when it is outdated:
+        $ pydriverr check -d chrome || pydriverr update -d chrome
+    \b
+        Check installed WebDrivers and print result as JSON:
+        $ pydriverr check --json
+
+    \f
+    :param driver_type: Type of the WebDriver e.g. chrome, gecko
+    :param max_age: Maximum age of saved lists of available versions in human-readable form
+    :param as_json: Should result be written as JSON
+    """
+    import json
+
+    if as_json:
+        logger.console_to_stderr()
+        results = _check_drivers(driver_type, max_age)
+        click.echo(json.dumps({"drivers": [result.to_dict() for result in results]}, indent=2))
+    else:
+        with logger.spinner(f"Check driver for: [{', '.join(driver_type) or 'all'}]"):
+            results = _check_drivers(driver_type, max_age)
+            if not results:
+                logger.info("No drivers installed")
+            for result in results:
+                logger.info(result.message)
+    exit_code = CheckStatus.exit_code_for([result.status for result in results])
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def _check_drivers(driver_types: Drivers, max_age: str) -> List["CheckResult"]:
+    """
+    Check given WebDrivers or all installed WebDrivers concurrently
+
+    :param driver_types: Types of the WebDriver e.g. chrome, gecko
+    :param max_age: Maximum age of saved lists of available versions in human-readable form
+    :return: Result of the check for every WebDriver
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pydriverr.catalog import CatalogStore
+    from pydriverr.webdriver import CheckResult
+
+    state_owner = _PyDriverr().webdriver_obj
+    ttl = CatalogStore.ttl_from_env(max_age)
+    drivers = []
+    for driver_type in driver_types or state_owner.drivers_state.sections:
+        driver = _PyDriverr(driver_type).webdriver_obj
+        driver.share_state(state_owner)
+        drivers.append(driver)
+    if not drivers:
+        return []
+
+    def check_driver(driver: "WebDriver") -> "CheckResult":
+        try:
+            return driver.check(ttl)
+        except SystemExit:
+            return CheckResult(
+                driver.driver_type, CheckStatus.ERROR, message=f"Failed to check {driver.driver_type}driver"
+            )
+
+    with ThreadPoolExecutor(max_workers=min(len(drivers), len(WebDriverType))) as executor:
+        return list(executor.map(check_driver, drivers))
+
+
 @cli_pydriverr.command(short_help="Update given WebDriver or all installed WebDrivers")
 @click.option(
     "-d",
@@ -297,10 +998,20 @@ def delete(driver_type: Drivers) -> None:
     type=click.Choice(WebDriverType.list()),
     help="Type of the WebDriver e.g. chrome, gecko",
 )
-def update(driver_type: Drivers) -> None:
+@click.option(
+    "--min-interval",
+    default="",
+    help="Skip WebDrivers checked for updates more recently than e.g. 6h, without any network access",
+)
+@click.option("--jitter", default="", help="Wait random time up to e.g. 15m before checking for updates")
+def update(driver_type: Drivers, min_interval: str = "", jitter: str = "") -> None:
     """
     Update given WebDriver or all installed WebDrivers
 
+    \b
+    Time of the last successful check for updates is recorded for every WebDriver in the .ini file. Use
+    `--min-interval` and `--jitter` when many machines run the update from cron at the same time.
+
      Examples:
 
     \b
@@ -312,9 +1023,14 @@ def update(driver_type: Drivers) -> None:
     \b
         Update all installed WebDrivers:
         $ pydriverr update
+    \b
+        Update all installed WebDrivers not checked for 6 hours, starting at random moment in the next 15 minutes:
+        $ pydriverr update --min-interval 6h --jitter 15m
 
     \f
     :param driver_type: Type of the WebDriver e.g. chrome, gecko
+    :param min_interval: Minimum time between checks for updates of the WebDriver in human-readable form
+    :param jitter: Maximum random delay before checking for updates in human-readable form
     """
     if not driver_type:
         spinner_msg = "all"
@@ -322,11 +1038,34 @@ def update(driver_type: Drivers) -> None:
         spinner_msg = ", ".join(driver_type)
 
     with logger.spinner(f"Update driver for: [{spinner_msg}]"):
+        state_owner = _PyDriverr().webdriver_obj
         if len(driver_type) == 0:
-            driver_type = WebDriver().drivers_state.sections
+            driver_type = state_owner.drivers_state.sections
+            if not driver_type:
+                logger.info("No drivers installed")
+                return
+        if min_interval:
+            interval = state_owner.support.parse_timespan(min_interval)
+            skipped = [t for t in driver_type if not state_owner.is_check_due(t, interval)]
+            for skipped_type in skipped:
+                logger.info(f"{skipped_type}driver was checked for updates less than {min_interval} ago")
+            driver_type = [t for t in driver_type if t not in skipped]
         if driver_type:
-            for installed_driver in driver_type:
-                driver = _PyDriverr(installed_driver)
-                driver.webdriver_obj.update()
-        else:
-            logger.info("No drivers installed")
+            if jitter:
+                _wait_jitter(state_owner.support.parse_timespan(jitter))
+            _update_drivers(state_owner, driver_type)
+
+
+def _wait_jitter(max_delay: float) -> None:
+    """
+    Sleep for random time, so checks of many machines started at the same moment are spread in time
+
+    :param max_delay: Maximum delay in seconds
+    :return: None
+    """
+    import random
+    import time
+
+    delay = random.uniform(0, max_delay)
+    logger.debug(f"Waiting {delay:.1f}s before checking for updates")
+    time.sleep(delay)
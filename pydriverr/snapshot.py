@@ -0,0 +1,127 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+from pydriverr.config import WebDriverType
+from pydriverr.support import Support
+from pydriverr.versions import VersionsInfo
+
+# {version: {os: {arch: {"file_name", "url", optional "size" and "sha256"}}}}
+ExportedCatalog = Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+
+
+class CatalogSnapshot:
+    """
+    Read and write JSON snapshot of lists of available versions (catalogs) of all driver types.
+
+    Snapshot is written on a host with internet access and imported to the catalog store of hosts without it. For
+    every version, OS and architecture it keeps file name and download URL of the archive, with size and SHA-256
+    digest when the archive was in the cache of exporting host.
+    """
+
+    _FORMAT = 1
+
+    def __init__(self, path: Union[Path, str]):
+        """
+        Init class
+
+        :param path: Path to the snapshot file, or its URL when it is only decoded
+        """
+        self.path = path
+        self.support = Support()
+
+    def write(self, catalogs: Dict[str, ExportedCatalog]) -> None:
+        """
+        Write snapshot atomically
+
+        :param catalogs: Exported catalog of every driver type
+        :return: None
+        """
+        content = {
+            "format": self._FORMAT,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "catalogs": catalogs,
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(str(tmp_path), "w") as f:
+            json.dump(content, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(str(tmp_path), str(self.path))
+
+    def load(self) -> Tuple[float, Dict[str, VersionsInfo]]:
+        """
+        Read and validate snapshot
+
+        :return: Time when snapshot was created and catalog of every driver type in the snapshot
+        """
+        return self.decode(self._read())
+
+    def load_exported(self) -> Tuple[float, Dict[str, ExportedCatalog]]:
+        """
+        Read and validate snapshot keeping URLs, sizes and digests of archives
+
+        :return: Time when snapshot was created and exported catalog of every driver type in the snapshot
+        """
+        return self._decode_exported(self._read())
+
+    def _read(self) -> str:
+        """
+        Read content of snapshot file
+
+        :return: Content of the file
+        """
+        try:
+            with open(str(self.path)) as f:
+                return f.read()
+        except OSError as e:
+            self.support.exit(f"Cannot read catalog snapshot {self.path}: {e.strerror}")
+
+    def decode(self, text: str) -> Tuple[float, Dict[str, VersionsInfo]]:
+        """
+        Decode and validate content of snapshot
+
+        :param text: Content of the snapshot file
+        :return: Time when snapshot was created and catalog of every driver type in the snapshot
+        """
+        created_at, catalogs = self._decode_exported(text)
+        try:
+            versions_infos = {
+                driver_type: {
+                    version: {
+                        os_: {arch: str(entry["file_name"]) for arch, entry in arch_data.items()}
+                        for os_, arch_data in os_data.items()
+                    }
+                    for version, os_data in catalog.items()
+                }
+                for driver_type, catalog in catalogs.items()
+            }
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            self.support.exit(f"Invalid catalog snapshot {self.path}: {e}")
+        return created_at, versions_infos
+
+    def _decode_exported(self, text: str) -> Tuple[float, Dict[str, ExportedCatalog]]:
+        """
+        Decode content of snapshot and validate its format and driver types
+
+        :param text: Content of the snapshot file
+        :return: Time when snapshot was created and exported catalog of every driver type in the snapshot
+        """
+        try:
+            content = json.loads(text)
+        except ValueError as e:
+            self.support.exit(f"Invalid catalog snapshot {self.path}: {e}")
+        if not isinstance(content, dict) or content.get("format") != self._FORMAT:
+            self.support.exit(f"Unsupported catalog snapshot format in {self.path}")
+        catalogs = content.get("catalogs") or {}
+        unknown = sorted(set(catalogs) - set(WebDriverType.list()))
+        if unknown:
+            self.support.exit(f"Unknown driver types in catalog snapshot {self.path}: {', '.join(unknown)}")
+        if not catalogs:
+            self.support.exit(f"No catalogs in catalog snapshot {self.path}")
+        try:
+            created_at = datetime.fromisoformat(content["created_at"]).timestamp()
+        except (KeyError, TypeError, ValueError) as e:
+            self.support.exit(f"Invalid catalog snapshot {self.path}: {e}")
+        return created_at, catalogs
@@ -54,12 +54,37 @@ class Support:
             dir_.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
-    def calculate_dir_size(directory: Path) -> str:
+    def format_size(byte_size: int) -> str:
         """
-        Calculate the total size of all files and subdirs of given dir
+        Format size in human-readable form
 
-        :param directory: Path to directory
-        :return: Formatted size of dir e.g. 1.22 KB, 4.9 GB
+        :param byte_size: Size in bytes
+        :return: Formatted size e.g. 1.22 KB, 4.9 GB
         """
-        byte_size = sum(f.lstat().st_size for f in directory.glob("**/*") if f.is_file() and f not in [".", ".."])
         return humanfriendly.format_size(byte_size)
+
+    @staticmethod
+    def parse_size(size: str) -> int:
+        """
+        Parse size given in human-readable form, exit when it is invalid
+
+        :param size: Size e.g. 500MB, 1GB
+        :return: Number of bytes
+        """
+        try:
+            return humanfriendly.parse_size(size)
+        except humanfriendly.InvalidSize:
+            Support.exit(f"Invalid size: {size}")
+
+    @staticmethod
+    def parse_timespan(timespan: str) -> float:
+        """
+        Parse time span given in human-readable form, exit when it is invalid
+
+        :param timespan: Time span e.g. 15m, 6h, 2w
+        :return: Number of seconds
+        """
+        try:
+            return humanfriendly.parse_timespan(timespan)
+        except humanfriendly.InvalidTimespan:
+            Support.exit(f"Invalid time span: {timespan}")
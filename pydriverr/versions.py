@@ -0,0 +1,170 @@
+import bisect
+import re
+from typing import Dict, List, Optional, Tuple
+
+from packaging.specifiers import InvalidSpecifier, Specifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+from pydriverr.support import Support
+
+VersionsInfo = Dict[str, Dict[str, Dict[str, str]]]
+
+
+def version_key(version: str) -> Version:
+    """
+    Return key sorting versions of WebDrivers. Versions not following PEP 440 are sorted by their numeric parts.
+
+    :param version: Version of the WebDriver
+    :return: Comparable version
+    """
+    try:
+        return Version(version)
+    except InvalidVersion:
+        numbers = re.findall(r"[0-9]+", version)
+        return Version(".".join(numbers) if numbers else "0")
+
+
+class VersionConstraint:
+    """
+    Version requested by the user: exact version, empty (the newest), specifiers like `>=114,<116` or `~=0.33`, or
+    `latest-of-major:118` which is a shortcut for `==118.*`.
+    """
+
+    _LATEST_OF_MAJOR = "latest-of-major:"
+
+    def __init__(self, spec: str = ""):
+        """
+        Init class
+
+        :param spec: Requested version or constraint
+        """
+        self.spec = spec.strip()
+        self.specifiers = self._parse(self.spec)
+
+    @property
+    def is_exact(self) -> bool:
+        """Constraint is a single version, which is looked up as is"""
+        return bool(self.spec) and self.specifiers is None
+
+    @property
+    def latest_of_major(self) -> Optional[str]:
+        """Major version of `latest-of-major:N` constraint, None for other constraints"""
+        if self.spec.startswith(self._LATEST_OF_MAJOR):
+            return self.spec.split(":", 1)[1]
+        return None
+
+    def contains(self, version: str) -> bool:
+        """
+        Check whether version satisfies the constraint
+
+        :param version: Version of the WebDriver
+        :return: True if version satisfies the constraint
+        """
+        if self.is_exact:
+            return version == self.spec
+        return self.specifiers is None or self.specifiers.contains(version_key(version), prereleases=True)
+
+    def _parse(self, spec: str) -> Optional[SpecifierSet]:
+        """
+        Parse constraint to specifiers
+
+        :param spec: Requested version or constraint
+        :return: Specifiers or None for the exact version and empty constraint
+        """
+        if spec.startswith(self._LATEST_OF_MAJOR):
+            major = spec.split(":", 1)[1]
+            if not major.isdigit():
+                Support.exit(f"Invalid version constraint: {spec}")
+            spec = f"=={major}.*"
+        if not spec or spec[0] not in "<>=!~":
+            return None
+        try:
+            return SpecifierSet(spec)
+        except InvalidSpecifier:
+            Support.exit(f"Invalid version constraint: {spec}")
+
+
+class VersionIndex:
+    """
+    Versions of WebDriver available for every (OS, architecture) pair and for any platform, sorted ascending.
+
+    Bounds of the constraint (`<`, `<=`, `==`, `~=`, `>=`, `>`) narrow the candidates with bisect, so the highest
+    satisfying version is found without scanning the whole list.
+    """
+
+    def __init__(self, versions_info: VersionsInfo):
+        """
+        Init class
+
+        :param versions_info: Available versions as {version: {os: {arch: file name}}}
+        """
+        platforms: Dict[Tuple[Optional[str], Optional[str]], List[Tuple[Version, str]]] = {}
+        for version, os_data in versions_info.items():
+            key = version_key(version)
+            platforms.setdefault((None, None), []).append((key, version))
+            for os_, arch_data in os_data.items():
+                for arch in arch_data:
+                    platforms.setdefault((os_, arch), []).append((key, version))
+        self._keys: Dict[Tuple[Optional[str], Optional[str]], List[Version]] = {}
+        self._versions: Dict[Tuple[Optional[str], Optional[str]], List[str]] = {}
+        for platform, entries in platforms.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._keys[platform] = [key for key, _ in entries]
+            self._versions[platform] = [version for _, version in entries]
+
+    def resolve(
+        self, constraint: VersionConstraint, os_: Optional[str] = None, arch: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Return the highest version satisfying the constraint available for given OS and architecture
+
+        :param constraint: Requested version or constraint
+        :param os_: OS of the WebDriver (default: any)
+        :param arch: OS'es architecture of the WebDriver (default: any)
+        :return: Version or None when nothing satisfies the constraint
+        """
+        keys = self._keys.get((os_, arch), [])
+        versions = self._versions.get((os_, arch), [])
+        if constraint.is_exact:
+            return constraint.spec if constraint.spec in versions else None
+        low, high = 0, len(keys)
+        for specifier in constraint.specifiers or []:
+            low, high = self._narrow(specifier, keys, low, high)
+        for i in range(high - 1, low - 1, -1):
+            if constraint.contains(versions[i]):
+                return versions[i]
+        return None
+
+    @staticmethod
+    def _narrow(specifier: Specifier, keys: List[Version], low: int, high: int) -> Tuple[int, int]:
+        """
+        Narrow range of candidates [low, high) to versions that may satisfy given specifier
+
+        :param specifier: Single specifier e.g. `<116`
+        :param keys: Sorted versions
+        :param low: First index of candidates
+        :param high: Index after last candidate
+        :return: Narrowed range
+        """
+        operator, version = specifier.operator, specifier.version
+        if operator in ("==", "~=") and (version.endswith(".*") or operator == "~="):
+            release = list(version_key(version.replace(".*", "")).release)
+            if operator == "~=":
+                release = release[:-1]
+            upper = Version(".".join(map(str, release[:-1] + [release[-1] + 1])))
+            lower = version_key(version.replace(".*", ""))
+            return max(low, bisect.bisect_left(keys, lower)), min(high, bisect.bisect_left(keys, upper))
+        if operator not in ("<", "<=", "==", ">", ">="):
+            return low, high  # !=, ===: checked while scanning
+        bound = version_key(version)
+        if operator == "<":
+            high = min(high, bisect.bisect_left(keys, bound))
+        elif operator == "<=":
+            high = min(high, bisect.bisect_right(keys, bound))
+        elif operator == ">":
+            low = max(low, bisect.bisect_right(keys, bound))
+        elif operator == ">=":
+            low = max(low, bisect.bisect_left(keys, bound))
+        else:
+            low, high = max(low, bisect.bisect_left(keys, bound)), min(high, bisect.bisect_right(keys, bound))
+        return low, high
@@ -6,26 +6,92 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 from collections import defaultdict
-from difflib import SequenceMatcher
-from distutils.version import LooseVersion
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import tabulate
 from configobj import ConfigObj
 
-from pydriverr.config import WebDriverType
+from pydriverr.cache import Cache, CacheBudget, CacheEntry
+from pydriverr.catalog import CatalogStore
+from pydriverr.config import CheckStatus, WebDriverType
 from pydriverr.custom_logger import logger
 from pydriverr.downloader import Downloader
-from pydriverr.pydriver_types import Drivers, FnInstall, FnRemoteDriversList
+from pydriverr.linker import Linker
+from pydriverr.locator import DRIVERS_HOME_ENV
+from pydriverr.mirror import Mirror
+from pydriverr.pydriver_types import Drivers, OptionalString
+from pydriverr.snapshot import CatalogSnapshot, ExportedCatalog
 from pydriverr.support import Support
+from pydriverr.versions import VersionConstraint, VersionIndex, VersionsInfo, version_key
+
+
+@dataclass
+class InstallPlan:
+    """WebDriver resolved from the list of available WebDrivers or from the lockfile, ready to be downloaded"""
+
+    driver_type: str
+    version: str
+    os_: str
+    arch: str
+    url: str
+    file_name: Path
+    digest: str = ""
+    size: int = 0
+
+
+@dataclass
+class FetchResult:
+    """Outcome of resolving single WebDriver and fetching it to the cache, before it is installed"""
+
+    driver_type: str
+    message: str = ""
+    plan: Optional[InstallPlan] = None
+    extracted: Optional[CacheEntry] = None
+    failed: bool = False
+    checked_at: Optional[datetime] = None
+
+
+@dataclass
+class CheckResult:
+    """Outcome of comparing installed WebDriver with the newest available one"""
+
+    driver_type: str
+    status: CheckStatus
+    local_version: str = ""
+    remote_version: str = ""
+    os_: str = ""
+    arch: str = ""
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Return result in the form written by `check --json`
+
+        :return: Result as dictionary
+        """
+        return {
+            "driver_type": self.driver_type,
+            "status": self.status.status_name,
+            "local_version": self.local_version,
+            "remote_version": self.remote_version,
+            "os": self.os_,
+            "arch": self.arch,
+            "message": self.message,
+        }
 
 
 class WebDriver:
     """Base class for all WebDrivers implementing many common methods"""
 
-    _ENV_NAME = "DRIVERS_HOME"
+    driver_type = ""
+    _remote_drivers_lists: Dict[str, Dict] = {}
+    _remote_drivers_lists_lock = threading.Lock()
+
+    _ENV_NAME = DRIVERS_HOME_ENV
     _WIN_EXTENSION = ".exe"
     _CONFIG_KEYS = [
         "DRIVER TYPE",
@@ -35,17 +101,23 @@ class WebDriver:
         "FILENAME",
         "CHECKSUM",
     ]
+    _LAST_CHECKED = "LAST_CHECKED"
 
     def __init__(self):
         self.support = Support()
         self._downloader = Downloader()
+        self._linker = Linker()
         self.drivers_home = Path(self._get_drivers_home())
         self._drivers_cfg = self.drivers_home / Path(".drivers.ini")
         self.drivers_state = ConfigObj(str(self._drivers_cfg))
         self.cache_dir = Path.home() / Path(".pydriverr_cache")
+        self.cache = Cache(self.cache_dir)
+        self.catalogs = CatalogStore(self.cache_dir)
+        self.mirror = Mirror(self.driver_type)
         self.system_name = platform.uname().system
         self.system_arch = platform.uname().machine
         self._versions_info = {}
+        self._version_index = None
         self.support.setup_dirs([self.drivers_home, self.cache_dir])
         logger.debug(f"Identified OS: {self.system_name}")
         logger.debug(f"Identified architecture: {self.system_arch}")
@@ -106,6 +178,8 @@ class WebDriver:
         os_: str,
         arch: str,
         version: str,
+        checksum: OptionalString = None,
+        write: bool = True,
     ) -> None:
         """
         Add info about newly installed driver to configuration .ini file
@@ -115,6 +189,8 @@ class WebDriver:
         :param os_: OS for which WebDriver is installed
         :param arch: OS'es architecture for which WebDriver is installed
         :param version: Version of the installed WebDriver
+        :param checksum: Checksum of the WebDriver file. Calculated when not given (default: None)
+        :param write: Should .ini file be written to disk (default: True)
         :return: None
         """
         keys = WebDriver._CONFIG_KEYS[1:]
@@ -126,11 +202,12 @@ class WebDriver:
                     os_,
                     arch,
                     file_name,
-                    self.support.calculate_checksum(self.drivers_home / file_name),
+                    checksum or self.support.calculate_checksum(self.drivers_home / file_name),
                 ],
             )
         )
-        self.drivers_state.write()
+        if write:
+            self.drivers_state.write()
         logger.debug(f"Driver {driver_type} added to ini file")
 
     def _delete_driver_files(self, filename: Path) -> None:
@@ -171,7 +248,10 @@ class WebDriver:
         """
         compression_formats = [format_[0] for format_ in shutil.get_unpack_formats()]
         if "gz" not in compression_formats:
-            shutil.register_unpack_format("gz", ["gz"], WebDriver.__unpack_gz)
+            try:
+                shutil.register_unpack_format("gz", ["gz"], WebDriver.__unpack_gz)
+            except shutil.RegistryError:  # registered meanwhile by other thread
+                pass
         shutil.unpack_archive(archive_path, extract_dir=working_dir)
         logger.debug(f"Uncompressed {archive_path} to {self.drivers_home}")
 
@@ -180,7 +260,8 @@ class WebDriver:
         Install given WebDriver version for given OS, architecture.
 
         Installation consists of following steps:
-        * downloading driver archive
+        * taking already extracted driver file from the cache or, when it is missing, downloading driver archive
+          (unless it is in the cache) and extracting it
         * updating info about driver in .ini file
 
         :param driver_type: Type of the WebDriver e.g. chrome
@@ -191,17 +272,87 @@ class WebDriver:
         :param file_name: Name of the WebDriver file
         :return: None
         """
-        version_cache_dir = self.cache_dir / Path(driver_type) / Path(version)
-        zipfile_path = version_cache_dir / file_name
-        if not zipfile_path.is_file():
-            logger.info("Requested driver not found in cache")
-            self.support.setup_dirs([version_cache_dir])
-            self._downloader.dl_driver(url, zipfile_path)
-        else:
-            logger.debug(f"{driver_type}driver in cache")
-
-        self.replace_driver_and_update_ini(zipfile_path, driver_type, os_, arch, version)
+        budget = CacheBudget.from_env()  # invalid limits are reported before anything is installed
+        extracted = self.fetch_driver(InstallPlan(driver_type, version, os_, arch, url, file_name))
+        self._place_driver_and_update_ini(extracted, driver_type, os_, arch, version)
         logger.info(f"Installed {driver_type}driver:\nVERSION: {version}\nOS: {os_}\nARCHITECTURE: {arch}")
+        self.collect_cache_garbage(budget)
+
+    def fetch_driver(self, plan: InstallPlan) -> CacheEntry:
+        """
+        Make sure extracted WebDriver file is in the cache: download and extract archive when needed.
+
+        Installation dir and .ini file are not touched, so drivers of different types can be fetched concurrently.
+
+        :param plan: Resolved WebDriver to fetch
+        :return: Cache entry of extracted WebDriver file
+        """
+        extracted = self.cache.get(self.cache.key(plan.driver_type, plan.version, plan.os_, plan.arch), Cache.DRIVER)
+        if extracted:
+            logger.debug(f"{plan.driver_type}driver in cache")
+            logger.debug("Extracted driver found in cache, skipping decompression")
+            return extracted
+        archive = self.fetch_archive(plan)
+        return self._extract_driver(
+            archive.path, plan.driver_type, plan.os_, plan.arch, plan.version, archive.file_name
+        )
+
+    def fetch_archive(self, plan: InstallPlan, check: Optional[Callable[[Path], bool]] = None) -> CacheEntry:
+        """
+        Make sure WebDriver archive is in the cache, download it when needed.
+
+        When plan has a digest (comes from the lockfile) SHA-256 calculated while the archive is streamed to disk must
+        match it, archive in the cache with other digest is downloaded again.
+
+        :param plan: Resolved WebDriver to fetch
+        :param check: Check of downloaded archive, archive failing it is not put in the cache (default: None)
+        :return: Cache entry of the archive
+        """
+        key = self.cache.key(plan.driver_type, plan.version, plan.os_, plan.arch)
+        archive = self.cache.get(key, Cache.ARCHIVE, legacy_file_name=str(plan.file_name))
+        if archive and (not plan.digest or archive.digest == plan.digest):
+            logger.debug(f"{plan.driver_type}driver in cache")
+            return archive
+        logger.info("Requested driver not found in cache")
+        url = self.mirror.artifact(plan.version, str(plan.file_name)) or plan.url
+        tmp_path = self.cache.new_tmp_path(str(plan.file_name))
+        digest = self._downloader.dl_driver(url, tmp_path)
+        if plan.digest and digest != plan.digest:
+            os.remove(str(tmp_path))
+            self.support.exit(f"Digest mismatch for {url}: expected {plan.digest}, got {digest}")
+        if check and not check(tmp_path):
+            os.remove(str(tmp_path))
+            self.support.exit(f"Invalid archive {url}")
+        return self.cache.put(key, Cache.ARCHIVE, tmp_path, str(plan.file_name), digest=digest)
+
+    def collect_cache_garbage(self, budget: CacheBudget) -> List[str]:
+        """
+        Evict least recently used cache entries that do not fit in the budget. Installed drivers are never evicted, they
+        are indexed first when the cache index does not know them e.g. after it was lost.
+
+        :param budget: Limits of the cache
+        :return: Evicted keys
+        """
+        if not budget.is_set():
+            return []
+        self._index_installed_drivers()
+        installed_keys = [self._installed_cache_key(driver_type) for driver_type in self.drivers_state.sections]
+        return self.cache.evict(budget, installed_keys)
+
+    def _installed_cache_key(self, driver_type: str) -> str:
+        """
+        Return cache key of installed WebDriver
+
+        :param driver_type: Type of the WebDriver e.g. chrome
+        :return: Key as returned by `Cache.key`
+        """
+        driver_state = self.drivers_state[driver_type]
+        return self.cache.key(
+            driver_type,
+            driver_state.get("VERSION", ""),
+            driver_state.get("OS", ""),
+            driver_state.get("ARCHITECTURE", ""),
+        )
 
     def update_version_dict(self, version: str, os_: str, arch: str, file_name: str) -> None:
         """
@@ -232,6 +383,8 @@ class WebDriver:
         values = []
         for driver_type in self.drivers_state.sections:
             values.append([driver_type] + [self.drivers_state[driver_type][v] for v in WebDriver._CONFIG_KEYS[1:]])
+        import tabulate
+
         logger.info(tabulate.tabulate(values, headers=WebDriver._CONFIG_KEYS, showindex=True))
 
     def print_remote_drivers(self) -> None:
@@ -244,45 +397,100 @@ class WebDriver:
         for version, version_data in self._versions_info.items():
             for os_, os_data in version_data.items():
                 values.append([version, os_, " ".join(os_data.keys())])
-        values = sorted(values, key=lambda val: LooseVersion(val[0]))
+        values = sorted(values, key=lambda val: version_key(val[0]))
+        import tabulate
+
         logger.info(tabulate.tabulate(values, headers=WebDriver._CONFIG_KEYS[1:4], showindex=True))
 
-    def get_newest_version(self) -> str:
+    @property
+    def version_index(self) -> VersionIndex:
+        """Sorted index of available versions, rebuilt when the list of available WebDrivers changes"""
+        if self._version_index is None or self._version_index[0] is not self._versions_info:
+            self._version_index = (self._versions_info, VersionIndex(self._versions_info))
+        return self._version_index[1]
+
+    def get_newest_version(
+        self, constraint: Optional[VersionConstraint] = None, os_: OptionalString = None, arch: OptionalString = None
+    ) -> OptionalString:
         """
-        Return highest version of WebDriver.
+        Return highest version of WebDriver satisfying the constraint.
 
         Only semantic versioning is supported.
 
-        :return: Newest version of the driver as string
+        :param constraint: Constraint the version must satisfy (default: any version)
+        :param os_: Consider only versions available for this OS (default: any OS)
+        :param arch: Consider only versions available for this architecture (default: any architecture)
+        :return: Newest version of the driver as string or None when no version satisfies the constraint
         """
-        highest_v = str(sorted(self._versions_info.keys(), key=LooseVersion)[-1])
-        logger.debug(f"Highest version of driver is: {highest_v}")
+        highest_v = self.version_index.resolve(constraint or VersionConstraint(), os_, arch)
+        if highest_v is not None:
+            logger.debug(f"Highest version of driver is: {highest_v}")
         return highest_v
 
+    def _resolve_version(self, driver_type: str, version: str, os_: str, arch: str) -> str:
+        """
+        Turn requested version or version constraint into the version to install
+
+        :param driver_type: Type of the WebDriver e.g. Chrome
+        :param version: Version or version constraint, empty means the newest version
+        :param os_: OS for which WebDriver is installed
+        :param arch: OS'es architecture for which WebDriver is installed
+        :return: Version of the WebDriver
+        """
+        constraint = VersionConstraint(version)
+        if constraint.is_exact:
+            if version not in self._versions_info:
+                self.load_older_remote_drivers_list()
+            return version
+        resolved = self.get_newest_version(constraint, os_, arch)
+        if resolved is None and constraint.spec and self.load_older_remote_drivers_list():
+            resolved = self.get_newest_version(constraint, os_, arch)
+        if resolved is None and not constraint.spec:
+            resolved = self.get_newest_version()  # nothing for this OS and arch, reported by validation
+        if resolved is None:
+            self.support.exit(
+                f"No version of {driver_type}driver matching {constraint.spec} for OS: {os_}, arch: {arch}"
+            )
+        return resolved
+
+    def _platform(self, driver_type: str, os_: str, arch: str) -> Tuple[str, str]:
+        """
+        Return OS and architecture of requested WebDriver
+
+        :param driver_type: Type of the WebDriver e.g. Chrome
+        :param os_: Requested OS, empty means current OS
+        :param arch: Requested architecture, empty means current architecture
+        :return: OS and architecture
+        """
+        os_ = os_ or self.system_name
+        arch = arch or self.system_arch
+        if driver_type == "gecko" and os_ == "mac":
+            arch = ""  # gecko does not have arch for mac
+        return os_, arch
+
     def validate_version_os_arch(
-        self, driver_type: str, version: str, os_: str, arch: str
+        self, driver_type: str, version: str, os_: str, arch: str, exit_if_installed: bool = True
     ) -> Tuple[str, str, str, Path]:
         """
         Validate that requested version, OS and architecture of given WebDriver is available to install.
 
         If the OS or architecture were not given then get current platform values. If version was not given
-        then get the newest available version.
+        then get the newest version available for them. Version can be also a constraint e.g. `>=114,<116`,
+        `~=0.33`, `latest-of-major:118` - the highest satisfying version available for OS and architecture is taken.
 
         :param driver_type: Type of the WebDriver e.g. Chrome
-        :param version: Version of the installed WebDriver
+        :param version: Version or version constraint of the installed WebDriver
         :param os_: OS for which WebDriver is installed
         :param arch: OS'es architecture for which WebDriver is installed
+        :param exit_if_installed: Exit with code 0 when requested WebDriver is already installed (default: True)
         :return: version, os, architecture, WebDriver file name
         """
         errors = []
-        version = version or self.get_newest_version()
-        os_ = os_ or self.system_name
-        arch = arch or self.system_arch
-        if driver_type == "gecko" and os_ == "mac":
-            arch = ""  # gecko does not have arch for mac
+        os_, arch = self._platform(driver_type, os_, arch)
+        version = self._resolve_version(driver_type, version, os_, arch)
         logger.debug(f"I will download following version: {version}, OS: {os_}, arch: {arch}")
         driver = self.drivers_state.get(driver_type)
-        if driver:
+        if driver and exit_if_installed:
             if os_ == driver.get("OS") and arch == driver.get("ARCHITECTURE") and version == driver.get("VERSION"):
                 logger.info("Requested driver already installed")
                 self.support.exit(exit_code=0)
@@ -302,8 +510,12 @@ class WebDriver:
         """
         Delete cache directory
 
+        Installed drivers that are symlinks to the cache are turned into regular files first.
+
         :return: None
         """
+        for driver_type in self.drivers_state.sections:
+            self._linker.materialize(self.drivers_home / self.drivers_state[driver_type]["FILENAME"])
         shutil.rmtree(self.cache_dir, ignore_errors=True)
 
     def replace_driver_and_update_ini(
@@ -313,37 +525,117 @@ class WebDriver:
         os_: str,
         arch: str,
         version: str,
+        archive_name: str = "",
     ) -> None:
         """
         Put WebDriver file in installation dir and add/amend info in .ini file.
 
-        If WebDriver file exists firstly delete it. File is extracted from archive downloaded from project's www.
+        If WebDriver file exists firstly delete it. File is extracted from archive downloaded from project's www
+        into the cache and linked from there to the installation dir (see `Linker`). Extracted file stays in the
+        cache together with its checksum, so next installation of the same driver skips decompression.
 
         :param archive_path: Path to an archive with WebDriver
         :param driver_type: Type of the WebDriver e.g. chrome, gecko
         :param os_: OS for which WebDriver is installed
         :param arch: OS'es architecture for which WebDriver is installed
         :param version: Version of the installed WebDriver
+        :param archive_name: Original name of the archive, it decides about archive type (default: name of the path)
         :return: None
         """
-        if driver_type in self.drivers_state.sections:
-            old_driver_name = self.drivers_state[driver_type]["FILENAME"]
-            self._delete_driver_files(old_driver_name)
-        with tempfile.TemporaryDirectory() as tmpdir:
-            self._unpack(archive_path, tmpdir)
+        extracted = self._extract_driver(archive_path, driver_type, os_, arch, version, archive_name)
+        self._place_driver_and_update_ini(extracted, driver_type, os_, arch, version)
+
+    def _extract_driver(
+        self, archive_path: Path, driver_type: str, os_: str, arch: str, version: str, archive_name: str = ""
+    ) -> CacheEntry:
+        """
+        Extract WebDriver file from an archive and store it in the cache
+
+        :param archive_path: Path to an archive with WebDriver
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param os_: OS for which WebDriver is installed
+        :param arch: OS'es architecture for which WebDriver is installed
+        :param version: Version of the installed WebDriver
+        :param archive_name: Original name of the archive, it decides about archive type (default: name of the path)
+        :return: Cache entry of extracted WebDriver file
+        """
+        self.support.setup_dirs([self.cache.tmp_dir])
+        with tempfile.TemporaryDirectory(dir=str(self.cache.tmp_dir)) as tmpdir:
+            # objects in the cache are named by digest, unpacking needs the original name with extension
+            named_archive_path = Path(tmpdir) / (archive_name or archive_path.name)
+            self._linker.link(archive_path, named_archive_path)
+            tmpdir = str(Path(tmpdir) / "extracted")
+            self.support.setup_dirs([Path(tmpdir)])
+            self._unpack(named_archive_path, tmpdir)
             uncompressed_all_paths = list(Path(tmpdir).rglob("*"))  # get all paths with any nested folders
             all_driver_filenames = "|".join(WebDriverType.list_all_file_names())
             uncompressed_driver_paths = [
                 file_path
-                for file_path in uncompressed_all_paths
-                if re.match(f".*({all_driver_filenames}).*", str(file_path.name))
-            ]  # leaves only paths with driver name inside
+                for file_path in sorted(uncompressed_all_paths)
+                if re.match(f"({all_driver_filenames})", str(file_path.name))
+            ]  # leaves only paths starting with driver name, not e.g. LICENSE.chromedriver
             src = [path_ for path_ in uncompressed_driver_paths if path_.is_file()][0]  # get path of driver file
-            uncompressed_file = Path(src.name)
-            dst = self.drivers_home / uncompressed_file
-            shutil.copyfile(src, dst)
+            return self.cache.put(
+                self.cache.key(driver_type, version, os_, arch),
+                Cache.DRIVER,
+                src,
+                src.name,
+                checksum=self.support.calculate_checksum(src),
+            )
+
+    def _place_driver_and_update_ini(
+        self, extracted: CacheEntry, driver_type: str, os_: str, arch: str, version: str, write: bool = True
+    ) -> None:
+        """
+        Replace installed WebDriver file with the extracted one from the cache and add/amend info in .ini file.
+        When the file cannot be placed, .ini file is not changed.
+
+        :param extracted: Extracted WebDriver file in the cache
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param os_: OS for which WebDriver is installed
+        :param arch: OS'es architecture for which WebDriver is installed
+        :param version: Version of the installed WebDriver
+        :param write: Should .ini file be written to disk. When False caller is responsible for it (default: True)
+        :return: None
+        """
+        if driver_type in self.drivers_state.sections:
+            old_driver_name = self.drivers_state[driver_type]["FILENAME"]
+            self._delete_driver_files(old_driver_name)
+        uncompressed_file = Path(extracted.file_name)
+        try:
+            self._linker.link(extracted.path, self.drivers_home / uncompressed_file)
+        except OSError as e:
+            self.support.exit(f"Cannot place {self.drivers_home / uncompressed_file}: {e}")
+        self._add_driver_to_ini(uncompressed_file, driver_type, os_, arch, version, extracted.checksum, write)
+        self.cache.set_installed(self.drivers_home, driver_type, extracted)
+
+    def get_installed_drivers_size(self) -> int:
+        """
+        Return total size of installed WebDriver files, as recorded in the cache index.
+
+        :return: Size in bytes
+        """
+        return sum(driver["size"] for driver in self._index_installed_drivers().values())
+
+    def _index_installed_drivers(self) -> Dict[str, Dict]:
+        """
+        Return drivers installed in the installation dir as recorded in the cache index. Installation dir is indexed
+        when it is not in the index yet or index does not know all installed drivers.
 
-        self._add_driver_to_ini(uncompressed_file, driver_type, os_, arch, version)
+        :return: Indexed drivers, as returned by `Cache.installed`
+        """
+        installed = self.cache.installed(self.drivers_home)
+        if installed is None or not set(self.drivers_state.sections).issubset(installed):
+            drivers = {
+                driver_type: (
+                    self._installed_cache_key(driver_type),
+                    self.drivers_state[driver_type].get("FILENAME", ""),
+                    self.drivers_state[driver_type].get("CHECKSUM", ""),
+                )
+                for driver_type in self.drivers_state.sections
+            }
+            installed = self.cache.rebuild_installed(self.drivers_home, drivers)
+        return installed
 
     def delete_drivers(self, driver_types_to_delete: Drivers) -> None:
         """
@@ -362,45 +654,154 @@ class WebDriver:
             else:
                 driver_filename = self.drivers_state[driver_type]["FILENAME"]
                 self.drivers_state.pop(driver_type)
+                self.cache.remove_installed(self.drivers_home, driver_type)
                 logger.debug(f"Driver {driver_type} removed from ini")
                 self._delete_driver_files(driver_filename)
                 logger.info(f"Driver: {driver_type} deleted")
                 self.drivers_state.write()
 
-    def generic_update(
-        self, driver_type: str, fn_get_remote_drivers_list: FnRemoteDriversList, fn_install: FnInstall
-    ) -> None:
+    def prepare_update(self) -> FetchResult:
         """
-        Replace currently installed version of any WebDriver with the newest available.
+        Check whether installed WebDriver is older than the newest available one and fetch the newest one to the cache.
 
-        Generic method that handles all available WebDrivers due to ability to get as parameter methods specific
-        for given drivers.
+        Installation dir and .ini file are not touched, so drivers of different types can be prepared concurrently.
+        Apply result with `apply_fetched`.
 
-        :param driver_type: Type of the WebDriver e.g. chrome, gecko
-        :param fn_get_remote_drivers_list: Method `get_remote_drivers_list` for given WebDriver (from its class)
-        :param fn_install: Method `install` for given WebDriver (from its class)
+        :return: Result of the check with fetched driver, if update is needed
         """
-        logger.debug(f"Updating {driver_type}driver")
-        driver_state = self.drivers_state.get(driver_type)
+        logger.debug(f"Updating {self.driver_type}driver")
+        driver_state = self.drivers_state.get(self.driver_type)
         if not driver_state:
-            logger.info(f"Driver {driver_type}driver is not installed")
-            return
+            return FetchResult(self.driver_type, f"Driver {self.driver_type}driver is not installed")
         local_version = driver_state.get("VERSION")
         if not local_version:
-            logger.info("Corrupted .ini file")
-            return
-        fn_get_remote_drivers_list()
-        remote_version = self.get_newest_version()
-        if LooseVersion(local_version) >= LooseVersion(remote_version):
-            logger.info(
-                f"{driver_type}driver is already in newest version. "
-                f"Local: {local_version}, remote: {remote_version}"
+            return FetchResult(self.driver_type, "Corrupted .ini file")
+        os_, arch = driver_state.get("OS"), driver_state.get("ARCHITECTURE")
+        self.load_latest_remote_drivers_list(os_, arch)
+        remote_version = self.get_newest_version(os_=os_, arch=arch) or self.get_newest_version()
+        if remote_version is None:  # failed check is not recorded, so it is retried regardless of --min-interval
+            return FetchResult(
+                self.driver_type,
+                f"No remote version of {self.driver_type}driver for OS: {os_}, arch: {arch}",
+                failed=True,
+            )
+        checked_at = datetime.now(timezone.utc)
+        if version_key(local_version) >= version_key(remote_version):
+            return FetchResult(
+                self.driver_type,
+                f"{self.driver_type}driver is already in newest version. "
+                f"Local: {local_version}, remote: {remote_version}",
+                checked_at=checked_at,
+            )
+        plan = self.resolve_install(remote_version, os_, arch)
+        return FetchResult(
+            self.driver_type,
+            f"Updated {self.driver_type}driver: {local_version} -> {remote_version}",
+            plan,
+            self.fetch_driver(plan),
+            checked_at=checked_at,
+        )
+
+    def check(self, max_age: Optional[float] = None) -> CheckResult:
+        """
+        Compare installed WebDriver with the newest version available for its OS and architecture.
+
+        Only the newest version is asked for, see `load_latest_remote_drivers_list`: list of available versions is
+        taken from the catalog store when it is younger than `max_age`, otherwise fast-path endpoint of the driver type
+        is used when there is one. Installation dir and .ini file are not touched.
+
+        :param max_age: Maximum age in seconds of the saved list of available versions (default: always download)
+        :return: Result of the check
+        """
+        driver_state = self.drivers_state.get(self.driver_type)
+        if not driver_state:
+            return CheckResult(
+                self.driver_type, CheckStatus.NOT_INSTALLED, message=f"Driver {self.driver_type}driver is not installed"
             )
+        local_version = driver_state.get("VERSION")
+        if not local_version:
+            return CheckResult(self.driver_type, CheckStatus.ERROR, message="Corrupted .ini file")
+        os_, arch = driver_state.get("OS", ""), driver_state.get("ARCHITECTURE", "")
+        self.load_latest_remote_drivers_list(os_, arch, max_age=max_age)
+        remote_version = self.get_newest_version(os_=os_, arch=arch) or self.get_newest_version()
+        if remote_version is None:
+            message = f"No remote version of {self.driver_type}driver for OS: {os_}, arch: {arch}"
+            return CheckResult(self.driver_type, CheckStatus.NO_REMOTE_VERSION, local_version, "", os_, arch, message)
+        result = CheckResult(self.driver_type, CheckStatus.UP_TO_DATE, local_version, remote_version, os_, arch)
+        if version_key(local_version) < version_key(remote_version):
+            result.status = CheckStatus.OUTDATED
+            result.message = f"{self.driver_type}driver is outdated. Local: {local_version}, remote: {remote_version}"
         else:
-            os_ = self.drivers_state.get(driver_type, {}).get("OS")
-            arch = self.drivers_state.get(driver_type, {}).get("ARCHITECTURE")
-            fn_install(remote_version, os_, arch)
-            logger.info(f"Updated {driver_type}driver: {local_version} -> {remote_version}")
+            result.message = f"{self.driver_type}driver is up to date. Local: {local_version}, remote: {remote_version}"
+        return result
+
+    def prepare_install(self, version: str, os_: str, arch: str) -> FetchResult:
+        """
+        Resolve requested WebDriver and fetch it to the cache. Installation dir and .ini file are not touched.
+
+        Apply result with `apply_fetched`.
+
+        :param version: Version of the installed WebDriver (default: newest)
+        :param os_: OS for which WebDriver is installed (default: current OS)
+        :param arch: OS'es architecture for which WebDriver is installed (default: current architecture)
+        :return: Result with fetched driver
+        """
+        plan = self.resolve_install(version, os_, arch)
+        return FetchResult(self.driver_type, plan=plan, extracted=self.fetch_driver(plan))
+
+    def apply_fetched(self, result: FetchResult, write: bool = True) -> None:
+        """
+        Install WebDriver fetched by `prepare_update` or `prepare_install` and report the result
+
+        :param result: Result of `prepare_update` or `prepare_install`
+        :param write: Should .ini file be written to disk. When False caller is responsible for it (default: True)
+        :return: None
+        """
+        if result.plan:
+            plan = result.plan
+            self._place_driver_and_update_ini(
+                result.extracted, plan.driver_type, plan.os_, plan.arch, plan.version, write=False
+            )
+            logger.info(
+                f"Installed {plan.driver_type}driver:\n"
+                f"VERSION: {plan.version}\nOS: {plan.os_}\nARCHITECTURE: {plan.arch}"
+            )
+        if result.checked_at and not result.failed and result.driver_type in self.drivers_state:
+            self.drivers_state[result.driver_type][self._LAST_CHECKED] = result.checked_at.isoformat(timespec="seconds")
+        if write and (result.plan or (result.checked_at and not result.failed)):
+            self.drivers_state.write()
+        if result.failed:
+            logger.error(result.message)
+        elif result.message:
+            logger.info(result.message)
+
+    def is_check_due(self, driver_type: str, min_interval: float) -> bool:
+        """
+        Check whether WebDriver was last checked for updates at least `min_interval` ago
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko
+        :param min_interval: Minimum time in seconds between checks
+        :return: True if WebDriver should be checked, also when it was never checked or is not installed
+        """
+        last_checked = self.drivers_state.get(driver_type, {}).get(self._LAST_CHECKED)
+        if not last_checked:
+            return True
+        try:
+            elapsed = datetime.now(timezone.utc) - datetime.fromisoformat(last_checked)
+        except (TypeError, ValueError):
+            logger.debug(f"Invalid {self._LAST_CHECKED} of {driver_type}driver: {last_checked}")
+            return True
+        return elapsed.total_seconds() >= min_interval
+
+    def share_state(self, other: "WebDriver") -> None:
+        """
+        Use .ini file state and the cache of other WebDriver object, so changes made by both are not lost
+
+        :param other: WebDriver object which state is shared
+        :return: None
+        """
+        self.drivers_state = other.drivers_state
+        self.cache = other.cache
 
     def should_install_matched(self, driver_type, browser_version: str) -> bool:
         """
@@ -430,6 +831,337 @@ class WebDriver:
         """
         raise NotImplementedError
 
+    def load_remote_drivers_list(self, max_age: Optional[float] = None) -> None:
+        """
+        Get available versions of WebDrivers, downloading the list only once per driver type in the process.
+
+        Lists are shared by all objects of given driver type until `invalidate_remote_drivers_lists` is called.
+        Downloaded list is saved in the catalog store. When `max_age` is given, saved list younger than that is used
+        instead of downloading it.
+
+        :param max_age: Maximum age in seconds of the saved list that can be used (default: always download)
+        :return: None
+        """
+        if self._load_known_remote_drivers_list(max_age):
+            return
+        if self.catalogs.offline():
+            self._versions_info = self.catalogs.load(self.driver_type)
+            if self._versions_info is None:
+                self.support.exit(
+                    f"No saved list of {self.driver_type}driver versions while {CatalogStore.OFFLINE_ENV} is set, "
+                    "import it with: pydriverr catalog import"
+                )
+            self._share_remote_drivers_list(save=False)
+            return
+        if self.mirror.catalog_url:
+            self._versions_info = self._get_mirrored_drivers_list()
+            self._share_remote_drivers_list()
+            return
+        saved = self.catalogs.load_for_refresh(self.driver_type)
+        self._versions_info = {}
+        if saved is not None and self.get_newer_remote_drivers_list(saved):
+            logger.debug(f"Found {len(self._versions_info)} new versions of {self.driver_type}driver")
+            self._versions_info = self.catalogs.merge(saved, self._versions_info)
+            self._share_remote_drivers_list(merged=True)
+            return
+        self._versions_info = {}
+        self.get_remote_drivers_list()
+        self._share_remote_drivers_list()
+
+    def _get_mirrored_drivers_list(self) -> VersionsInfo:
+        """
+        Get available versions from catalog snapshot in the mirror
+
+        :return: Available versions as {version: {os: {arch: file name}}}
+        """
+        url = self.mirror.catalog_url
+        _, catalogs = CatalogSnapshot(url).decode(self._downloader.get_url(url).text)
+        if self.driver_type not in catalogs:
+            self.support.exit(f"No list of {self.driver_type}driver versions in {url}")
+        logger.debug(f"Using list of {self.driver_type}driver versions from mirror {url}")
+        return catalogs[self.driver_type]
+
+    def fixed_catalog_source(self) -> bool:
+        """
+        Check whether versions are listed only from the catalog store (offline) or the mirror, so fast-path and other
+        upstream endpoints must not be used
+
+        :return: True if upstream endpoints are not used
+        """
+        return self.catalogs.offline() or bool(self.mirror.catalog_url)
+
+    def get_newer_remote_drivers_list(self, known: VersionsInfo) -> bool:
+        """
+        Get only versions of WebDrivers newer than the known ones, if the source can list them
+
+        :param known: Saved list of available versions
+        :return: True if newer versions were listed, False if all versions have to be listed
+        """
+        return False
+
+    def _load_known_remote_drivers_list(self, max_age: Optional[float] = None) -> bool:
+        """
+        Use list of available versions already downloaded in the process or saved in the catalog store
+
+        :param max_age: Maximum age in seconds of the saved list that can be used (default: saved list is not used)
+        :return: True if the list was found
+        """
+        with WebDriver._remote_drivers_lists_lock:
+            versions_info = WebDriver._remote_drivers_lists.get(self.driver_type)
+        if versions_info is not None:
+            logger.debug(f"Using already downloaded list of {self.driver_type}driver versions")
+            self._versions_info = versions_info
+            return True
+        if max_age is not None:
+            versions_info = self.catalogs.load(self.driver_type, max_age)
+            if versions_info is not None:
+                logger.debug(f"Using saved list of {self.driver_type}driver versions")
+                self._versions_info = versions_info
+                self._share_remote_drivers_list(save=False)
+                return True
+        return False
+
+    def get_latest_remote_driver(self, os_: str, major: OptionalString = None) -> Optional[VersionsInfo]:
+        """
+        Get the newest version of WebDriver from fast-path endpoint of the driver type, without listing all versions
+
+        :param os_: OS of the WebDriver, for endpoints that differ per OS
+        :param major: Get the newest version of this major version (default: the newest of all)
+        :return: Available versions limited to the newest one as {version: {os: {arch: file name}}} or None when
+                 there is no fast-path endpoint or it is not available
+        """
+        return None
+
+    def load_latest_remote_drivers_list(
+        self, os_: str, arch: str, major: OptionalString = None, max_age: Optional[float] = None
+    ) -> None:
+        """
+        Get available versions of WebDriver needed to find the newest one for given OS and architecture.
+
+        List of all versions is used when it was already downloaded in the process or it is saved and younger than
+        `max_age`. Otherwise only the newest version is taken from the fast-path endpoint of the driver type. All
+        versions are downloaded when there is no such endpoint, it is not available or the newest version is not
+        available for the OS and architecture.
+
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :param major: Find the newest version of this major version (default: the newest of all)
+        :param max_age: Maximum age in seconds of the saved list that can be used (default: saved list is not used)
+        :return: None
+        """
+        import requests
+
+        if self.fixed_catalog_source():
+            self.load_remote_drivers_list(max_age)
+            return
+        if max_age is not None and not major and self._load_saved_newest(os_, arch, max_age):
+            return
+        if self._load_known_remote_drivers_list(max_age):
+            return
+        try:
+            latest = self.get_latest_remote_driver(os_, major)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.debug(f"Fast-path endpoint of {self.driver_type}driver not available: {e}")
+            latest = None
+        if latest and VersionIndex(latest).resolve(VersionConstraint(), os_, arch) is not None:
+            logger.debug(f"Using newest version of {self.driver_type}driver from fast-path endpoint")
+            self._versions_info = latest
+            return
+        self.load_remote_drivers_list(max_age)
+
+    def export_catalog(self, max_age: Optional[float] = None) -> ExportedCatalog:
+        """
+        Return list of all available versions with download URL of every archive, and its size and digest when the
+        archive is in the cache
+
+        :param max_age: Maximum age in seconds of the saved list that can be used (default: always download)
+        :return: Exported catalog as {version: {os: {arch: {"file_name", "url", "size", "sha256"}}}}
+        """
+        self.load_remote_drivers_list(max_age)
+        self.load_older_remote_drivers_list()
+        exported: ExportedCatalog = {}
+        for version, os_data in self._versions_info.items():
+            for os_, arch_data in os_data.items():
+                for arch, file_name in arch_data.items():
+                    entry = {"file_name": file_name, "url": self.get_download_url(version, Path(file_name))}
+                    key = self.cache.key(self.driver_type, version, os_, arch)
+                    entry.update(self.cache.describe(key, Cache.ARCHIVE) or {})
+                    exported.setdefault(version, {}).setdefault(os_, {})[arch] = entry
+        return exported
+
+    def mirror_archive(
+        self,
+        version: str,
+        os_: str,
+        arch: str,
+        entry: Dict[str, Any],
+        dst: Path,
+        digest: str = "",
+        check: Optional[Callable[[Path], bool]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetch archive to the cache and link it to the mirror directory as a regular file
+
+        :param version: Version of the WebDriver
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :param entry: Exported entry of the archive with its file name and download URL
+        :param dst: Path of the archive in the mirror
+        :param digest: Expected SHA-256 digest of the archive (default: any digest)
+        :param check: Check of downloaded archive (default: None)
+        :return: Exported entry with size and digest of the archive
+        """
+        plan = InstallPlan(self.driver_type, version, os_, arch, entry["url"], Path(entry["file_name"]), digest=digest)
+        archive = self.fetch_archive(plan, check)
+        self._linker.link(archive.path, dst)
+        self._linker.materialize(dst)  # mirror must not point into the cache
+        return dict(entry, size=dst.stat().st_size, sha256=archive.digest)
+
+    def _load_saved_newest(self, os_: str, arch: str, max_age: float) -> bool:
+        """
+        Use the newest version for given OS and architecture looked up in the saved list, without reading all of it
+
+        :param os_: OS of the WebDriver
+        :param arch: OS'es architecture of the WebDriver
+        :param max_age: Maximum age in seconds of the saved list
+        :return: True if the version was found
+        """
+        with WebDriver._remote_drivers_lists_lock:
+            if self.driver_type in WebDriver._remote_drivers_lists:
+                return False  # whole list is already known
+        view = self.catalogs.open_fresh(self.driver_type, max_age)
+        if view is None:
+            return False
+        with view:
+            newest = view.newest(os_, arch)
+        if newest is None:
+            return False
+        logger.debug(f"Using newest version of {self.driver_type}driver from saved list")
+        self._versions_info = newest
+        return True
+
+    def _load_saved_version(self, version: str) -> bool:
+        """
+        Use exact version looked up in the saved list of any age, without reading all of it. Published versions do not
+        change, so the list does not have to be downloaded for them.
+
+        :param version: Exact version of the WebDriver
+        :return: True if the version was found
+        """
+        view = self.catalogs.open(self.driver_type)
+        if view is None:
+            return False
+        with view:
+            found = view.find(version)
+        if found is None:
+            return False
+        logger.debug(f"Using {self.driver_type}driver {version} from saved list")
+        self._versions_info = found
+        return True
+
+    def load_older_remote_drivers_list(self) -> bool:
+        """
+        Add to the list of available versions the ones missing in the main source, e.g. versions too old to be listed
+        there. Called when requested version is not found in the list.
+
+        :return: True if the list was extended
+        """
+        return False
+
+    def _share_remote_drivers_list(self, save: bool = True, merged: bool = False) -> None:
+        """
+        Share list of available versions with other objects of the same driver type and save it in the catalog store
+
+        :param save: Should list be saved in the catalog store (default: True)
+        :param merged: List is saved list extended with newer versions (default: False)
+        :return: None
+        """
+        if save:
+            self.catalogs.save(self.driver_type, self._versions_info, merged)
+        with WebDriver._remote_drivers_lists_lock:
+            WebDriver._remote_drivers_lists[self.driver_type] = self._versions_info
+
+    @staticmethod
+    def invalidate_remote_drivers_lists(driver_type: OptionalString = None) -> None:
+        """
+        Forget downloaded lists of available WebDrivers, so next `load_remote_drivers_list` downloads them again
+
+        :param driver_type: Type of the WebDriver e.g. chrome, gecko (default: all types)
+        :return: None
+        """
+        with WebDriver._remote_drivers_lists_lock:
+            if driver_type:
+                WebDriver._remote_drivers_lists.pop(driver_type, None)
+            else:
+                WebDriver._remote_drivers_lists.clear()
+
+    def get_download_url(self, version: str, file_name: Path) -> str:
+        """
+        Return URL of the WebDriver archive
+
+        :param version: Version of the WebDriver
+        :param file_name: Name of the WebDriver archive
+        :return: URL as string
+        """
+        raise NotImplementedError
+
+    def resolve_install(self, version: str, os_: str, arch: str, exit_if_installed: bool = True) -> InstallPlan:
+        """
+        Find WebDriver to install in the list of available WebDrivers
+
+        :param version: Version of the installed WebDriver (default: newest)
+        :param os_: OS for which WebDriver is installed (default: current OS)
+        :param arch: OS'es architecture for which WebDriver is installed (default: current architecture)
+        :param exit_if_installed: Exit with code 0 when requested WebDriver is already installed (default: True)
+        :return: Resolved WebDriver
+        """
+        logger.debug(f"Requested version: {version}, OS: {os_}, arch: {arch}")
+        constraint = VersionConstraint(version)
+        if not constraint.spec or constraint.latest_of_major:
+            self.load_latest_remote_drivers_list(
+                *self._platform(self.driver_type, os_, arch), major=constraint.latest_of_major
+            )
+        elif not (constraint.is_exact and (version in self._versions_info or self._load_saved_version(version))):
+            self.load_remote_drivers_list()
+        version, os_, arch, file_name = self.validate_version_os_arch(
+            self.driver_type, version, os_, arch, exit_if_installed
+        )
+        return InstallPlan(self.driver_type, version, os_, arch, self.get_download_url(version, file_name), file_name)
+
+    def resolve_locked(self, version: str, os_: str, arch: str) -> InstallPlan:
+        """
+        Resolve WebDriver for the lockfile: find it in the list of available WebDrivers and fetch its archive to the
+        cache to learn its size and digest
+
+        :param version: Version of the WebDriver (default: newest)
+        :param os_: OS of the WebDriver (default: current OS)
+        :param arch: OS'es architecture of the WebDriver (default: current architecture)
+        :return: Resolved WebDriver with size and digest of the archive
+        """
+        plan = self.resolve_install(version, os_, arch, exit_if_installed=False)
+        archive = self.fetch_archive(plan)
+        plan.digest = archive.digest
+        plan.size = archive.path.stat().st_size
+        return plan
+
+    def prepare_locked(self, plan: InstallPlan) -> FetchResult:
+        """
+        Fetch WebDriver pinned in the lockfile to the cache without downloading the list of available WebDrivers.
+
+        Apply result with `apply_fetched`.
+
+        :param plan: WebDriver read from the lockfile
+        :return: Result with fetched driver or without it if the WebDriver is already installed
+        """
+        driver = self.drivers_state.get(self.driver_type)
+        if driver and [driver.get("VERSION"), driver.get("OS"), driver.get("ARCHITECTURE")] == [
+            plan.version,
+            plan.os_,
+            plan.arch,
+        ]:
+            return FetchResult(self.driver_type, f"{self.driver_type}driver {plan.version} already installed")
+        return FetchResult(self.driver_type, plan=plan, extracted=self.fetch_driver(plan))
+
     def install(self, version: str, os_: str, arch: str) -> None:
         """
         Install WebDriver
@@ -439,15 +1171,16 @@ class WebDriver:
         :param arch: OS'es architecture for which WebDriver is installed
         :return: None
         """
-        raise NotImplementedError
+        plan = self.resolve_install(version, os_, arch)
+        self.install_driver(plan.driver_type, plan.url, plan.version, plan.os_, plan.arch, plan.file_name)
 
     def update(self) -> None:
         """
-        Replace currently installed version of chromedriver with the newest available
+        Replace currently installed version of WebDriver with the newest available
 
         :return: None
         """
-        raise NotImplementedError
+        self.apply_fetched(self.prepare_update())
 
     def get_browser_version(self, browser_type: str, browser_cmd: str) -> str:
         """
@@ -472,6 +1205,11 @@ class WebDriver:
         :param browser_version: Version of the web browser
         :return: The closest version as string
         """
+        from difflib import SequenceMatcher
+
+        major = browser_version.split(".")[0]
+        if not any(version.split(".")[0] == major for version in self._versions_info):
+            self.load_older_remote_drivers_list()
         matches = defaultdict(list)
         for version, metadata in self._versions_info.items():
             match = SequenceMatcher(None, version, browser_version).find_longest_match(
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of parsing storage bucket listing into catalog.
+
+Compares shared precompiled naming rule with matching every key by pattern given as string and updating the catalog
+one level at a time, as drivers did before. Run with `python -m tests.benchmark_naming`.
+"""
+
+import re
+import timeit
+from typing import Dict, List
+
+from pydriverr.config import WebDriverType
+
+KEYS = 100_000
+RUNS = 5
+OSES = ["linux64", "mac64", "win32", "win64"]
+
+
+def synthetic_listing(keys: int) -> List[str]:
+    """
+    Create listing of storage bucket with given number of keys, including keys of other files
+
+    :param keys: Number of keys
+    :return: Keys of the listing
+    """
+    listing = []
+    for i in range(keys):
+        version = f"{70 + i // 4000}.0.{i // 40 % 100}.{i // 8 % 5}"
+        listing.append(f"{version}/notes.txt" if i % 8 == 7 else f"{version}/chromedriver_{OSES[i % 4]}.zip")
+    return listing
+
+
+def parse_per_key(listing: List[str]) -> Dict:
+    """
+    Parse listing like drivers did before shared naming rules
+
+    :param listing: Keys of the listing
+    :return: Catalog
+    """
+    versions_info: Dict = {}
+    for key in listing:
+        match = re.match(r"(([0-9]+\.){1,3}[0-9]+).*/chromedriver_(linux|win|mac)(32|64)\.zip", key)
+        if match:
+            version, os_, arch = str(match.group(1)), str(match.group(3)), str(match.group(4))
+            file_name = f"chromedriver_{os_}{arch}.zip"
+            if version not in versions_info:
+                versions_info[version] = {os_: {arch: file_name}}
+            elif os_ not in versions_info[version]:
+                versions_info[version][os_] = {arch: file_name}
+            else:
+                versions_info[version][os_][arch] = file_name
+    return versions_info
+
+
+def main() -> None:
+    listing = synthetic_listing(KEYS)
+    rule = WebDriverType.CHROME.naming
+    assert rule.parse_listing(listing) == parse_per_key(listing)
+    before = min(timeit.repeat(lambda: parse_per_key(listing), number=1, repeat=RUNS))
+    after = min(timeit.repeat(lambda: rule.parse_listing(listing), number=1, repeat=RUNS))
+    print(f"{KEYS} keys, best of {RUNS} runs")
+    print(f"per-key pattern: {before * 1000:.1f} ms")
+    print(f"naming rule:     {after * 1000:.1f} ms ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
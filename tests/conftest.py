@@ -1,10 +1,14 @@
 import logging
 import platform
+import re
 
 import pytest
 from loguru import logger
 
 from pydriverr import webdriver
+from pydriverr.config import WebDriverType
+from pydriverr.drivers.chromedriver import ChromeDriver
+from pydriverr.githubapi import GithubApi
 from tests.helpers import CACHE_DIR, PYDRIVERR_HOME, IniFile
 
 DRIVERS_CFG = (
@@ -87,3 +91,17 @@ def caplog(caplog):
     handler_id = logger.add(PropagateHandler(), format="{message}")
     yield caplog
     logger.remove(handler_id)
+
+
+@pytest.fixture
+def requests_mock(requests_mock):
+    """
+    Override requests_mock fixture to serve Chrome for Testing, fast-path and GitHub GraphQL endpoints as not
+    available, so tests use legacy chromedriver storage bucket, lists of all versions and GitHub REST API unless they
+    mock these endpoints
+    """
+    requests_mock.get(re.compile(re.escape(ChromeDriver.CFT_CATALOG_URL.rsplit("/", 1)[0]) + "/.*"), status_code=404)
+    requests_mock.get(re.compile(re.escape(WebDriverType.EDGE.url) + "/LATEST_.*"), status_code=404)
+    requests_mock.get(re.compile(r"https://api\.github\.com/repos/.*/releases/latest"), status_code=404)
+    requests_mock.post(GithubApi.GRAPHQL_URL, status_code=404)
+    return requests_mock
@@ -27,6 +27,8 @@ URLS = {
     "OPERA": "https://github.com/operasoftware/operachromiumdriver/releases/download/v.{version}/{name}",
     "OPERA_API": "https://api.github.com/repos/operasoftware/operachromiumdriver/releases",
     "CHROME": "https://chromedriver.storage.googleapis.com",
+    "CHROME_CFT": "https://googlechromelabs.github.io/chrome-for-testing/known-good-versions-with-downloads.json",
+    "CHROME_CFT_DL": "https://storage.googleapis.com/chrome-for-testing-public/{version}/{platform}/{name}",
     "EDGE": "https://msedgewebdriverstorage.blob.core.windows.net/edgewebdriver/{version}/{name}",
     "EDGE_API": "https://msedgewebdriverstorage.blob.core.windows.net/edgewebdriver/?comp=list",
 }
@@ -112,7 +114,9 @@ class IniFile:
     def __init__(self):
         self.conf_obj = ConfigObj()
 
-    def add_driver(self, driver_type: str, filename: str, version: str, os_: str, arch: str, checksum: str) -> IniFile:
+    def add_driver(
+        self, driver_type: str, filename: str, version: str, os_: str, arch: str, checksum: str, last_checked: str = ""
+    ) -> IniFile:
         """
         Add new driver info to `.drivers.ini` file. Call `write` to save to file.
 
@@ -122,11 +126,14 @@ class IniFile:
         :param os_: OS for which WebDriver is installed
         :param arch: OS'es architecture for which WebDriver is installed
         :param checksum: Checksum od the filename
+        :param last_checked: Time of the last check for updates in ISO 8601 format (default: never checked)
         :return: IniFile Class
         """
         self.conf_obj[driver_type] = {"OS": os_, "ARCHITECTURE": arch, "FILENAME": filename, "CHECKSUM": checksum}
         if version:
             self.conf_obj[driver_type].update({"VERSION": version})
+        if last_checked:
+            self.conf_obj[driver_type].update({"LAST_CHECKED": last_checked})
         return self
 
     def write(self, directory: str) -> None:
@@ -261,6 +268,17 @@ def get_ini_content(tmp_dir: PytestTmpDir) -> Dict:
     return ConfigObj(tmp_dir.join(PYDRIVERR_HOME, ".drivers.ini")).dict()
 
 
+def get_cache_index(tmp_dir: PytestTmpDir) -> Dict:
+    """
+    Return content of the cache index file
+
+    :param tmp_dir: Path to pytest `tmpdir`
+    :return: Content of `index.json` as dictionary
+    """
+    with open(tmp_dir.join(CACHE_DIR, "index.json")) as f:
+        return json.load(f)
+
+
 def load_response(driver_type: str) -> Dict[str, str]:
     """
     Get from resources directory recorder response of webserver with list of available webdrivers
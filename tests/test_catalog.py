@@ -0,0 +1,57 @@
+import time
+from pathlib import Path
+
+from pydriverr.catalog import CatalogStore
+
+VERSIONS_INFO = {
+    "2.9": {"linux": {"64": "chromedriver_linux64.zip"}, "win": {"32": "chromedriver_win32.zip"}},
+    "2.10": {"win": {"32": "chromedriver_win32.zip"}},
+    "114.0.5735.90": {"linux": {"64": "chromedriver_linux64.zip"}, "mac": {"arm64": "chromedriver_mac_arm64.zip"}},
+}
+
+
+class TestCatalogStore:
+    """Catalogs saved in binary files and looked up without decoding them whole"""
+
+    def test_round_trip(self, tmpdir):
+        """Saved catalog is read back unchanged"""
+        store = CatalogStore(Path(str(tmpdir)))
+        store.save("chrome", VERSIONS_INFO)
+        assert store.load("chrome") == VERSIONS_INFO
+
+    def test_find(self, tmpdir):
+        """Exact version is found with binary search"""
+        store = CatalogStore(Path(str(tmpdir)))
+        store.save("chrome", VERSIONS_INFO)
+        with store.open("chrome") as view:
+            assert view.find("2.10") == {"2.10": VERSIONS_INFO["2.10"]}
+            assert view.find("2.1") is None
+            assert view.find("115.0.5790.102") is None
+
+    def test_newest(self, tmpdir):
+        """The newest version for OS and architecture is found"""
+        store = CatalogStore(Path(str(tmpdir)))
+        store.save("chrome", VERSIONS_INFO)
+        with store.open("chrome") as view:
+            assert view.newest("win", "32") == {"2.10": VERSIONS_INFO["2.10"]}
+            assert view.newest("linux", "64") == {"114.0.5735.90": VERSIONS_INFO["114.0.5735.90"]}
+            assert view.newest("linux", "32") is None
+
+    def test_max_age(self, tmpdir, monkeypatch):
+        """Catalog older than max age is not used"""
+        store = CatalogStore(Path(str(tmpdir)))
+        store.save("chrome", VERSIONS_INFO)
+        monkeypatch.setattr(time, "time", lambda: 1e12)
+        assert store.open_fresh("chrome", 60) is None
+        assert store.load("chrome", 60) is None
+
+    def test_broken_file(self, tmpdir):
+        """Missing, empty and truncated files are ignored"""
+        store = CatalogStore(Path(str(tmpdir)))
+        assert store.open("chrome") is None
+        store.save("chrome", VERSIONS_INFO)
+        content = store.path("chrome").read_bytes()
+        store.path("chrome").write_bytes(content[:40])
+        assert store.open("chrome") is None
+        store.path("chrome").write_bytes(b"")
+        assert store.load("chrome") is None
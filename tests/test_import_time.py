@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+# Modules that must not be imported until a command needs them
+HEAVY_MODULES = [
+    "loguru",
+    "yaspin",
+    "requests",
+    "configobj",
+    "tabulate",
+    "humanfriendly",
+    "difflib",
+    "distutils",
+    "pydriverr.webdriver",
+    "pydriverr.cache",
+]
+# Cumulative import time of the CLI module, best of few runs, in microseconds
+STARTUP_BUDGET_US = 200_000
+# Modules that must not be imported by `pydriverr.locator` used by test harnesses
+LOCATOR_FORBIDDEN_MODULES = ["click", "pydriverr.custom_logger", "pydriverr.config", "configparser"] + HEAVY_MODULES
+RUNS = 3
+
+
+def get_import_times(module: str) -> Dict[str, int]:
+    """
+    Import module in a fresh interpreter with `-X importtime`
+
+    :param module: Name of the module to import
+    :return: Cumulative import time in microseconds of every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=str(Path(__file__).parents[1]),
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime:
+    """Importing the CLI module is cheap, so `--help` and trivial commands start fast"""
+
+    @pytest.mark.parametrize("heavy_module", HEAVY_MODULES)
+    def test_heavy_modules_not_imported(self, heavy_module):
+        """Heavy dependencies are imported only by commands that need them"""
+        assert heavy_module not in get_import_times("pydriverr.pydriverr")
+
+    def test_startup_budget(self):
+        """Import of the CLI module fits in the startup budget"""
+        best = min(get_import_times("pydriverr.pydriverr")["pydriverr.pydriverr"] for _ in range(RUNS))
+        assert best < STARTUP_BUDGET_US
+
+    @pytest.mark.parametrize("forbidden_module", LOCATOR_FORBIDDEN_MODULES)
+    def test_locator_minimal_imports(self, forbidden_module):
+        """Locating installed driver imports nothing besides the standard library basics"""
+        assert forbidden_module not in get_import_times("pydriverr.locator")
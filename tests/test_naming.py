@@ -0,0 +1,46 @@
+import pytest
+
+from pydriverr.config import WebDriverType
+
+
+class TestNamingRule:
+    """Parse names of files published for WebDrivers into catalog"""
+
+    @pytest.mark.parametrize(
+        "driver_type, name, expected",
+        [
+            (WebDriverType.CHROME, "2.9/chromedriver_win32.zip", {"2.9": {"win": {"32": "chromedriver_win32.zip"}}}),
+            (WebDriverType.CHROME, "2.9/notes.txt", {}),
+            (
+                WebDriverType.EDGE,
+                "90.0.818.0/edgedriver_arm64.zip",
+                {"90.0.818.0": {"arm": {"64": "edgedriver_arm64.zip"}}},
+            ),
+        ],
+    )
+    def test_parse_listing(self, driver_type, name, expected):
+        """Version, OS and architecture are taken from keys of storage bucket"""
+        assert driver_type.naming.parse_listing([name]) == expected
+
+    def test_parse_releases(self):
+        """Version is taken from release tag, OS aliases are translated and missing architecture is empty"""
+        releases = {
+            "v0.4.2": ["wires-0.4.2-osx.gz", "wires-0.4.2-win.zip"],
+            "v0.16.1": ["geckodriver-v0.16.1-arm7hf.tar.gz", "geckodriver-v0.16.1-macos.tar.gz", "README.md"],
+            "nightly": ["geckodriver-nightly-linux64.tar.gz"],
+        }
+        assert WebDriverType.GECKO.naming.parse_releases(releases) == {
+            "0.4.2": {"mac": {"": "wires-0.4.2-osx.gz"}, "win": {"": "wires-0.4.2-win.zip"}},
+            "0.16.1": {
+                "arm": {"7hf": "geckodriver-v0.16.1-arm7hf.tar.gz"},
+                "mac": {"": "geckodriver-v0.16.1-macos.tar.gz"},
+            },
+        }
+
+    def test_parse_updates_catalog(self):
+        """Parsed names are added to given catalog"""
+        versions_info = {"88.0.4324.104": {"linux": {"64": "operadriver_linux64.zip"}}}
+        WebDriverType.OPERA.naming.parse_releases({"v.88.0.4324.104": ["operadriver_mac64.zip"]}, versions_info)
+        assert versions_info == {
+            "88.0.4324.104": {"linux": {"64": "operadriver_linux64.zip"}, "mac": {"64": "operadriver_mac64.zip"}}
+        }
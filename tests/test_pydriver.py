@@ -1,10 +1,25 @@
+import hashlib
+import json
+import re
 import subprocess
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Tuple
 
 import pytest
 import requests
 from click.testing import CliRunner
+from configobj import ConfigObj
 
-from pydriverr import pydriverr
+from pydriverr import locator, pydriverr, support, webdriver
+from pydriverr.cache import Cache
+from pydriverr.catalog import CatalogStore
+from pydriverr.config import WebDriverType
+from pydriverr.drivers.chromedriver import ChromeDriver
+from pydriverr.githubapi import GithubApi
+from pydriverr.linker import Linker
 from pydriverr.pydriverr import cli_pydriverr
 from tests.helpers import (
     CACHE_DIR,
@@ -17,6 +32,7 @@ from tests.helpers import (
     PlatformUname,
     create_driver_archive,
     create_extracted_driver,
+    get_cache_index,
     get_ini_content,
     load_driver_archive_content,
     load_response,
@@ -50,6 +66,17 @@ class TestShowEnv:
             f"WebDrivers are installed in: {tmpdir.join(PYDRIVERR_HOME)}, total size is: 365 bytes" in caplog.messages
         )
 
+    def test_show_env_counts_files_outside_index(self, env_vars, caplog, tmpdir, test_dirs, mocker):
+        """Saved catalogs, API responses and stray files are counted in the size of the cache"""
+        pydriverr.platform = mocker.Mock()
+        pydriverr.platform.uname.return_value = PlatformUname("Windows", "AMD64")
+        tmpdir.join(CACHE_DIR, "catalogs", "chrome.bin").write_binary(b"x" * 1000, ensure=True)
+        tmpdir.join(CACHE_DIR, "github", "releases.json").write_binary(b"x" * 500, ensure=True)
+        tmpdir.join(CACHE_DIR, "stray").write_binary(b"x" * 24)
+        result = CliRunner().invoke(cli_pydriverr, ["show-env"])
+        assert result.exit_code == 0
+        assert f"PyDriverr cache is in: {tmpdir.join(CACHE_DIR)}, total size is: 1.52 KB" in caplog.messages
+
 
 class TestShowInstalled:
     def test_show_installed_empty_ini(self, env_vars, tmpdir, test_dirs, empty_ini, mocker, caplog):
@@ -89,6 +116,28 @@ class TestShowInstalled:
         assert expected in caplog.messages
 
 
+class TestPath:
+    def test_path_installed(self, tmpdir, test_dirs, env_vars, caplog, create_ini):
+        """Absolute path of installed driver is printed and nothing is logged"""
+        create_extracted_driver(tmpdir.join(PYDRIVERR_HOME), "geckodriver.exe")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["path", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert result.output == f"{tmpdir.join(PYDRIVERR_HOME, 'geckodriver.exe')}\n"
+        assert caplog.messages == []
+        assert locator.driver_path("gecko") == Path(tmpdir.join(PYDRIVERR_HOME, "geckodriver.exe"))
+
+    @pytest.mark.parametrize("driver_type", ["chrome", "edge"])
+    def test_path_not_installed(self, driver_type, tmpdir, test_dirs, env_vars, caplog, create_ini):
+        """Driver missing in .drivers.ini (edge) or in installation dir (chrome) makes the command exit with 1"""
+        IniFile().add_driver("chrome", "chromedriver.exe", "81.0.4044.20", "win", "32", "abc").write(tmpdir)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["path", "-d", driver_type])
+        assert result.exit_code == 1
+        assert f"Driver {driver_type}driver is not installed" in result.output
+        assert locator.driver_path(driver_type) is None
+
+
 class TestShowAvailable:
     @pytest.mark.parametrize(
         "driver_data,request_data",
@@ -142,6 +191,535 @@ class TestShowAvailable:
         assert f"Cannot download file {URLS['CHROME']}" in caplog.messages
 
 
+class TestGithubApi:
+    def test_token(self, tmpdir, env_vars, caplog, requests_mock, monkeypatch):
+        """Requests are authorized with token from GITHUB_TOKEN env variable"""
+        monkeypatch.setenv("GITHUB_TOKEN", "secret")
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert requests_mock.last_request.headers["Authorization"] == "Bearer secret"
+
+    def test_not_modified(self, tmpdir, env_vars, caplog, requests_mock):
+        """List of releases is asked for with ETag of saved response and reused when it was not modified"""
+        requests_mock.get(
+            URLS["GECKO_API"],
+            [{**load_response("gecko"), "headers": {"ETag": '"abc"'}}, {"status_code": 304}],
+        )
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"]).exit_code == 0
+        result = runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert requests_mock.last_request.headers["If-None-Match"] == '"abc"'
+        assert caplog.messages.count(EXPECTED["GECKO"]) == 2
+
+    def test_exhausted_rate_limit_uses_saved_response(self, tmpdir, env_vars, caplog, requests_mock):
+        """No request is sent when the rate limit is exhausted and there is saved response"""
+        headers = {"ETag": '"abc"', "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"), headers=headers)
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"]).exit_code == 0
+        result = runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert requests_mock.call_count == 1
+        assert f"GitHub API rate limit exceeded, using saved response of {URLS['GECKO_API']}" in caplog.messages
+        assert caplog.messages.count(EXPECTED["GECKO"]) == 2
+
+    def test_rate_limited_waits_for_retry(self, tmpdir, env_vars, caplog, requests_mock, mocker):
+        """Rate-limited request is retried after time given in Retry-After header"""
+        sleep_mock = mocker.patch("time.sleep")
+        requests_mock.get(
+            URLS["GECKO_API"], [{"status_code": 429, "headers": {"Retry-After": "5"}}, load_response("gecko")]
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        sleep_mock.assert_called_once_with(5.0)
+        assert "GitHub API rate limit exceeded, waiting 5 seconds" in caplog.messages
+
+    def test_rate_limited_reset_too_late(self, tmpdir, env_vars, caplog, requests_mock):
+        """Command fails when the rate limit resets later than the maximum wait and there is no saved response"""
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+        requests_mock.get(URLS["GECKO_API"], status_code=403, headers=headers)
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 1
+        assert any(message.startswith("GitHub API rate limit exceeded, it resets in ") for message in caplog.messages)
+
+    def test_releases_parsed_incrementally(self, tmpdir, env_vars, caplog, requests_mock, monkeypatch):
+        """Releases are decoded while they arrive in small chunks and only used fields are saved"""
+        monkeypatch.setattr(GithubApi, "_CHUNK_SIZE", 7)
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"), headers={"ETag": '"abc"'})
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert EXPECTED["GECKO"] in caplog.messages
+        saved = list(Path(str(tmpdir)).rglob("github/*.json"))
+        with open(str(next(path for path in saved if path.name != "rate_limit.json"))) as f:
+            release = json.load(f)["body"][0]
+        assert set(release) == {"tag_name", "assets"}
+        assert set(release["assets"][0]) == {"name", "size", "browser_download_url"}
+
+    def test_invalid_releases(self, tmpdir, env_vars, caplog, requests_mock):
+        """Command fails when the list of releases is not a valid JSON array"""
+        requests_mock.get(URLS["GECKO_API"], text='[{"tag_name": "v0.30.0", "assets": [')
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 1
+        assert f"Invalid response of {URLS['GECKO_API']}" in caplog.messages
+
+    @staticmethod
+    def _graphql_pages(releases, page_size: int):
+        """Convert releases of REST API to GraphQL responses with pages of given size"""
+        pages = []
+        for start in range(0, len(releases), page_size):
+            end = start + page_size
+            nodes = [
+                {
+                    "tagName": release["tag_name"],
+                    "releaseAssets": {
+                        "nodes": [
+                            {"name": a["name"], "size": a["size"], "downloadUrl": a["browser_download_url"]}
+                            for a in release["assets"]
+                        ]
+                    },
+                }
+                for release in releases[start:end]
+            ]
+            has_next = end < len(releases)
+            page_info = {"hasNextPage": has_next, "endCursor": f"cursor{start}" if has_next else None}
+            pages.append({"json": {"data": {"repository": {"releases": {"nodes": nodes, "pageInfo": page_info}}}}})
+        return pages
+
+    def test_graphql_releases(self, tmpdir, env_vars, caplog, requests_mock, monkeypatch):
+        """With token, releases are listed page after page by GraphQL query sent to configured endpoint"""
+        monkeypatch.setenv("GITHUB_TOKEN", "secret")
+        monkeypatch.setenv("PYDRIVERR_GITHUB_GRAPHQL_URL", "http://localhost:8080/graphql")
+        releases = load_response("gecko")["json"]
+        graphql = requests_mock.post("http://localhost:8080/graphql", self._graphql_pages(releases, 2))
+        rest = requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert EXPECTED["GECKO"] in caplog.messages
+        assert not rest.called
+        assert graphql.call_count == 2
+        assert graphql.last_request.json()["variables"]["after"] == "cursor0"
+        assert graphql.last_request.headers["Authorization"] == "Bearer secret"
+
+    def test_graphql_errors_fall_back_to_rest(self, tmpdir, env_vars, caplog, requests_mock, monkeypatch):
+        """Releases are listed by REST API when GraphQL query returns errors"""
+        monkeypatch.setenv("GITHUB_TOKEN", "secret")
+        requests_mock.post(GithubApi.GRAPHQL_URL, json={"errors": [{"message": "Something went wrong"}]})
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert EXPECTED["GECKO"] in caplog.messages
+
+
+class TestChromeForTesting:
+    @staticmethod
+    def _cft_archive(tmpdir, platform: str) -> bytes:
+        """Create archive in Chrome for Testing layout: driver and license files in a nested folder"""
+        archive = tmpdir.join(f"chromedriver-{platform}.zip")
+        with zipfile.ZipFile(str(archive), "w") as zf:
+            zf.writestr(f"chromedriver-{platform}/LICENSE.chromedriver", "license")
+            zf.writestr(f"chromedriver-{platform}/chromedriver", "chromedriver binary")
+        return archive.read_binary()
+
+    def test_show_available(self, tmpdir, env_vars, caplog, requests_mock):
+        """Versions with chromedriver downloads are listed from Chrome for Testing index"""
+        requests_mock.get(URLS["CHROME_CFT"], **load_response("chrome_cft"))
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "chrome"])
+        assert result.exit_code == 0
+        assert """    VERSION         OS     ARCHITECTURE
+--  --------------  -----  --------------
+ 0  115.0.5790.102  linux  64
+ 1  115.0.5790.102  mac    arm64 64
+ 2  115.0.5790.102  win    32 64
+ 3  116.0.5845.96   linux  64
+ 4  116.0.5845.96   mac    arm64 64
+ 5  116.0.5845.96   win    64""" in caplog.messages
+        assert requests_mock.call_count == 1
+
+    @pytest.mark.parametrize(
+        "os_, arch, platform", [("linux", "64", "linux64"), ("mac", "arm64", "mac-arm64"), ("win", "64", "win64")]
+    )
+    def test_install_newest(self, os_, arch, platform, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """The newest driver is downloaded from Chrome for Testing and the driver file is taken from nested folder"""
+        requests_mock.get(URLS["CHROME_CFT"], **load_response("chrome_cft"))
+        requests_mock.get(
+            URLS["CHROME_CFT_DL"].format(
+                version="116.0.5845.96", platform=platform, name=f"chromedriver-{platform}.zip"
+            ),
+            content=self._cft_archive(tmpdir, platform),
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "chrome", "-o", os_, "-a", arch])
+        assert result.exit_code == 0
+        ini = get_ini_content(tmpdir)["chrome"]
+        assert [ini["VERSION"], ini["OS"], ini["ARCHITECTURE"], ini["FILENAME"]] == [
+            "116.0.5845.96",
+            os_,
+            arch,
+            "chromedriver",
+        ]
+        assert tmpdir.join(PYDRIVERR_HOME, "chromedriver").read() == "chromedriver binary"
+
+    def test_install_legacy_version(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Version older than 115 is looked up in the legacy storage bucket"""
+        requests_mock.get(URLS["CHROME_CFT"], **load_response("chrome_cft"))
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        content, _ = load_driver_archive_content(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver")
+        requests_mock.get(URLS["CHROME"] + "/71.0.3578.33/chromedriver_linux64.zip", content=content)
+        result = CliRunner().invoke(
+            cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"]
+        )
+        assert result.exit_code == 0
+        assert "Listing chromedriver versions older than 115 from legacy storage bucket" in caplog.messages
+        assert get_ini_content(tmpdir)["chrome"]["VERSION"] == "71.0.3578.33"
+
+    def test_legacy_bucket_when_index_not_available(self, tmpdir, env_vars, caplog, requests_mock):
+        """Legacy storage bucket lists all versions when Chrome for Testing index cannot be downloaded"""
+        requests_mock.get(URLS["CHROME_CFT"], status_code=500)
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "chrome"])
+        assert result.exit_code == 0
+        assert EXPECTED["CHROME"] in caplog.messages
+
+
+class TestFastPath:
+    def test_install_newest_chrome(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """The newest chrome driver is resolved from LATEST_RELEASE_STABLE without listing all versions"""
+        requests_mock.get(ChromeDriver.CFT_LATEST_URL.format(release="STABLE"), text="116.0.5845.96\n")
+        requests_mock.get(
+            URLS["CHROME_CFT_DL"].format(version="116.0.5845.96", platform="linux64", name="chromedriver-linux64.zip"),
+            content=TestChromeForTesting._cft_archive(tmpdir, "linux64"),
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "chrome", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 0
+        assert "Using newest version of chromedriver from fast-path endpoint" in caplog.messages
+        assert get_ini_content(tmpdir)["chrome"]["VERSION"] == "116.0.5845.96"
+        assert not [request for request in requests_mock.request_history if request.url == URLS["CHROME_CFT"]]
+
+    def test_install_latest_of_major_chrome(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """The newest chrome driver of given major version is resolved from LATEST_RELEASE_<major>"""
+        requests_mock.get(ChromeDriver.CFT_LATEST_URL.format(release="115"), text="115.0.5790.102")
+        requests_mock.get(
+            URLS["CHROME_CFT_DL"].format(version="115.0.5790.102", platform="win32", name="chromedriver-win32.zip"),
+            content=TestChromeForTesting._cft_archive(tmpdir, "win32"),
+        )
+        result = CliRunner().invoke(
+            cli_pydriverr, ["install", "-d", "chrome", "-v", "latest-of-major:115", "-o", "win", "-a", "32"]
+        )
+        assert result.exit_code == 0
+        assert get_ini_content(tmpdir)["chrome"]["VERSION"] == "115.0.5790.102"
+
+    def test_install_newest_gecko(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """The newest gecko driver is resolved from the latest GitHub release without listing all releases"""
+        latest = [release for release in load_response("gecko")["json"] if release["tag_name"] == "v0.28.0"][0]
+        requests_mock.get(URLS["GECKO_API"] + "/latest", json=latest)
+        content, _ = load_driver_archive_content(tmpdir, "gecko", "geckodriver-v0.28.0-linux64.tar.gz", "geckodriver")
+        requests_mock.get(
+            URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-linux64.tar.gz"), content=content
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "gecko", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 0
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.28.0"
+        assert not [request for request in requests_mock.request_history if request.url == URLS["GECKO_API"]]
+
+    def test_newest_not_available_for_platform(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """All releases are listed when the latest one has no driver for requested OS and architecture"""
+        latest = [release for release in load_response("gecko")["json"] if release["tag_name"] == "v0.28.0"][0]
+        requests_mock.get(URLS["GECKO_API"] + "/latest", json=latest)
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        content, _ = load_driver_archive_content(tmpdir, "gecko", "geckodriver-v0.16.1-arm7hf.tar.gz", "geckodriver")
+        requests_mock.get(
+            URLS["GECKO"].format(version="0.16.1", name="geckodriver-v0.16.1-arm7hf.tar.gz"), content=content
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "gecko", "-o", "arm", "-a", "7hf"])
+        assert result.exit_code == 0
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.16.1"
+
+    def test_check_edge(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Edge is checked against LATEST_STABLE written in UTF-16 and files of that version, without listing all
+        versions"""
+        IniFile().add_driver(
+            "edge", filename="msedgedriver.exe", version="90.0.818.0", os_="win", arch="64", checksum="abc"
+        ).write(tmpdir)
+        requests_mock.get(WebDriverType.EDGE.url + "/LATEST_STABLE", content="118.0.2088.76\r\n".encode("utf-16"))
+        requests_mock.get(
+            URLS["EDGE_API"] + "&prefix=118.0.2088.76/",
+            text=TestIncrementalRefresh.edge_listing("118.0.2088.76/edgedriver_win64.zip"),
+        )
+        result = CliRunner().invoke(cli_pydriverr, ["check"])
+        assert result.exit_code == 3
+        assert "edgedriver is outdated. Local: 90.0.818.0, remote: 118.0.2088.76" in caplog.messages
+        assert requests_mock.call_count == 2
+
+    def test_install_edge_platform_not_published(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Platform without file of the LATEST_STABLE version falls back to the listing of all versions and the newest
+        version published for the platform is installed"""
+        requests_mock.get(WebDriverType.EDGE.url + "/LATEST_STABLE", content=b"118.0.2088.76")
+        requests_mock.get(
+            URLS["EDGE_API"] + "&prefix=118.0.2088.76/",
+            text=TestIncrementalRefresh.edge_listing("118.0.2088.76/edgedriver_win64.zip"),
+        )
+        full = requests_mock.get(URLS["EDGE_API"], **load_response("edge"))
+        content, _ = load_driver_archive_content(tmpdir, "edge", "edgedriver_arm64.zip", "msedgedriver")
+        requests_mock.get(URLS["EDGE"].format(version="90.0.818.0", name="edgedriver_arm64.zip"), content=content)
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "edge", "-o", "arm", "-a", "64"])
+        assert result.exit_code == 0
+        assert full.call_count == 1
+        assert get_ini_content(tmpdir)["edge"]["VERSION"] == "90.0.818.0"
+
+
+class TestIncrementalRefresh:
+    @staticmethod
+    def edge_listing(*names: str) -> str:
+        """Listing of Edge storage with given names of files"""
+        blobs = "".join(f"<Blob><Name>{name}</Name></Blob>" for name in names)
+        return f"<?xml version='1.0' encoding='UTF-8'?><EnumerationResults><Blobs>{blobs}</Blobs></EnumerationResults>"
+
+    def test_edge_lists_newer_majors(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Saved catalog is extended with versions listed by prefix of the newest known and following majors"""
+        full = requests_mock.get(URLS["EDGE_API"], **load_response("edge"))
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "edge"]).exit_code == 0
+        requests_mock.get(URLS["EDGE_API"] + "&prefix=90.", text=self.edge_listing("90.0.819.0/edgedriver_win64.zip"))
+        requests_mock.get(URLS["EDGE_API"] + "&prefix=91.", text=self.edge_listing("91.0.864.1/edgedriver_mac64.zip"))
+        requests_mock.get(URLS["EDGE_API"] + "&prefix=92.", text=self.edge_listing())
+        result = runner.invoke(cli_pydriverr, ["show-available", "-d", "edge"])
+        assert result.exit_code == 0
+        assert full.call_count == 1
+        listing = [" ".join(line.split()[1:]) for line in caplog.messages[-1].splitlines()]
+        assert "90.0.819.0 win 64" in listing
+        assert "91.0.864.1 mac 64" in listing
+        assert "75.0.139.20 mac 64" in listing
+
+    def test_github_stops_at_known_release(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Releases newer than the known ones are added to saved catalog"""
+        releases = load_response("gecko")["json"]
+        new_release = {
+            "tag_name": "v0.29.0",
+            "assets": [{"name": "geckodriver-v0.29.0-linux64.tar.gz", "size": 1, "browser_download_url": "url"}],
+        }
+        requests_mock.get(URLS["GECKO_API"], [{"json": releases[1:]}, {"json": [new_release] + releases[:2]}])
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"]).exit_code == 0
+        result = runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        listing = [" ".join(line.split()[1:]) for line in caplog.messages[-1].splitlines()]
+        assert "0.29.0 linux 64" in listing
+        assert "0.28.0 linux 32 64" in listing
+        assert "0.4.2 win" in listing
+
+    def test_full_listing_after_refresh_interval(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Catalog is listed whole again when it was fully listed long ago"""
+        full = requests_mock.get(URLS["EDGE_API"], **load_response("edge"))
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "edge"]).exit_code == 0
+        monkeypatch.setattr(CatalogStore, "FULL_REFRESH_INTERVAL", -1)
+        assert runner.invoke(cli_pydriverr, ["show-available", "-d", "edge"]).exit_code == 0
+        assert full.call_count == 2
+
+
+class TestCatalogSnapshot:
+    @staticmethod
+    def _mock_catalogs(requests_mock) -> None:
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        requests_mock.get(URLS["OPERA_API"], **load_response("opera"))
+        requests_mock.get(URLS["EDGE_API"], **load_response("edge"))
+
+    def test_export_import_offline(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Exported catalogs are imported and used without network access when PYDRIVERR_OFFLINE is set"""
+        self._mock_catalogs(requests_mock)
+        snapshot = str(tmpdir.join("catalogs.json"))
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["catalog", "export", snapshot])
+        assert result.exit_code == 0
+        assert "Exported 4 versions of geckodriver" in caplog.messages
+        with open(snapshot) as f:
+            exported = json.load(f)
+        assert sorted(exported["catalogs"]) == ["chrome", "edge", "gecko", "opera"]
+        assert exported["catalogs"]["gecko"]["0.28.0"]["linux"]["64"] == {
+            "file_name": "geckodriver-v0.28.0-linux64.tar.gz",
+            "url": URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-linux64.tar.gz"),
+        }
+        tmpdir.join(CACHE_DIR, "catalogs").remove()
+        requests_mock.reset_mock()
+        result = runner.invoke(cli_pydriverr, ["catalog", "import", snapshot])
+        assert result.exit_code == 0
+        assert "Imported 4 versions of geckodriver" in caplog.messages
+        monkeypatch.setenv("PYDRIVERR_OFFLINE", "1")
+        result = runner.invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert EXPECTED["GECKO"] in caplog.messages
+        assert requests_mock.call_count == 0
+
+    def test_export_reuses_saved_catalogs(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Fresh saved catalog is exported without listing versions, legacy chrome bucket is listed only once"""
+        cft = requests_mock.get(URLS["CHROME_CFT"], **load_response("chrome_cft"))
+        legacy = requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        snapshot = str(tmpdir.join("catalogs.json"))
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["catalog", "export", snapshot, "-d", "chrome"]).exit_code == 0
+        assert [cft.call_count, legacy.call_count] == [1, 1]
+        assert runner.invoke(cli_pydriverr, ["catalog", "export", snapshot, "-d", "chrome"]).exit_code == 0
+        assert [cft.call_count, legacy.call_count] == [1, 1]
+        args = ["catalog", "export", snapshot, "-d", "chrome", "--max-age", "0s"]
+        assert runner.invoke(cli_pydriverr, args).exit_code == 0
+        assert [cft.call_count, legacy.call_count] == [2, 1]
+        with open(snapshot) as f:
+            exported = json.load(f)["catalogs"]["chrome"]
+        assert {"116.0.5845.96", "71.0.3578.33"} <= set(exported)
+
+    def test_offline_without_catalog(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Command fails when there is no saved catalog to use offline"""
+        monkeypatch.setenv("PYDRIVERR_OFFLINE", "1")
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "edge"])
+        assert result.exit_code == 1
+        assert any(message.startswith("No saved list of edgedriver versions") for message in caplog.messages)
+        assert requests_mock.call_count == 0
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            ("not json", "Invalid catalog snapshot {path}: Expecting value: line 1 column 1 (char 0)"),
+            ('{"format": 99}', "Unsupported catalog snapshot format in {path}"),
+            ('{"format": 1, "catalogs": {"ie": {}}}', "Unknown driver types in catalog snapshot {path}: ie"),
+            ('{"format": 1, "catalogs": {}}', "No catalogs in catalog snapshot {path}"),
+        ],
+    )
+    def test_import_invalid(self, tmpdir, test_dirs, env_vars, caplog, content, message):
+        """Invalid snapshot is rejected"""
+        snapshot = tmpdir.join("catalogs.json")
+        snapshot.write(content)
+        result = CliRunner().invoke(cli_pydriverr, ["catalog", "import", str(snapshot)])
+        assert result.exit_code == 1
+        assert message.format(path=snapshot) in caplog.messages
+
+
+class TestMirror:
+    GECKO_FILE = "geckodriver-v0.28.0-linux64.tar.gz"
+
+    def _write_mirror(self, tmpdir) -> str:
+        """
+        Write local mirror with catalog snapshot of geckodriver and one archive
+
+        :param tmpdir: Path to pytest `tmpdir`
+        :return: Checksum of the driver file in the archive
+        """
+        mirror = tmpdir.mkdir("mirror")
+        mirror.join("catalogs.json").write(
+            json.dumps(
+                {
+                    "format": 1,
+                    "created_at": "2021-01-01T00:00:00+00:00",
+                    "catalogs": {"gecko": {"0.28.0": {"linux": {"64": {"file_name": self.GECKO_FILE}}}}},
+                }
+            )
+        )
+        return create_driver_archive(
+            tmpdir, "gecko", self.GECKO_FILE, "geckodriver", cache_dir=str(mirror.join("0.28.0"))
+        )
+
+    def test_install_from_local_mirror(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Catalog and archive are read from local directory without HTTP requests"""
+        checksum = self._write_mirror(tmpdir)
+        monkeypatch.setenv("PYDRIVERR_GECKO_CATALOG_URL", tmpdir.join("mirror", "catalogs.json").strpath)
+        monkeypatch.setenv("PYDRIVERR_GECKO_ARTIFACT_URL", Path(tmpdir.join("mirror")).as_uri())
+        requests_mock.real_http = True  # file:// URLs are passed to the session transport
+        http = requests_mock.get(re.compile(r"https?://.*"), status_code=500)
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "gecko", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 0
+        assert http.call_count == 0
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.28.0"
+        assert get_ini_content(tmpdir)["gecko"]["CHECKSUM"] == checksum
+
+    def test_catalog_from_http_mirror(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Catalog is downloaded from mirror instead of listing upstream versions"""
+        self._write_mirror(tmpdir)
+        monkeypatch.setenv("PYDRIVERR_GECKO_CATALOG_URL", "http://mirror.local/catalogs.json/")
+        requests_mock.get("http://mirror.local/catalogs.json", text=tmpdir.join("mirror", "catalogs.json").read())
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "gecko"])
+        assert result.exit_code == 0
+        assert any("0.28.0" in message for message in caplog.messages)
+        assert requests_mock.call_count == 1
+
+    def test_catalog_without_driver_type(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Mirror catalog without list of requested driver type is rejected"""
+        self._write_mirror(tmpdir)
+        catalog_url = tmpdir.join("mirror", "catalogs.json").strpath
+        monkeypatch.setenv("PYDRIVERR_OPERA_CATALOG_URL", catalog_url)
+        requests_mock.real_http = True
+        result = CliRunner().invoke(cli_pydriverr, ["show-available", "-d", "opera"])
+        assert result.exit_code == 1
+        assert f"No list of operadriver versions in {Path(catalog_url).as_uri()}" in caplog.messages
+
+    def _sync(self, tmpdir, requests_mock, content: bytes) -> Tuple:
+        """
+        Sync geckodriver 0.28.0 for linux64 to the mirror directory
+
+        :param tmpdir: Path to pytest `tmpdir`
+        :param requests_mock: Mock of requests
+        :param content: Content of downloaded archive
+        :return: Result of the command and mock of archive download
+        """
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        download = requests_mock.get(URLS["GECKO"].format(version="0.28.0", name=self.GECKO_FILE), content=content)
+        args = ["mirror", "sync", str(tmpdir.join("synced")), "-d", "gecko", "-v", "0.28.0", "-o", "linux", "-a", "64"]
+        return CliRunner().invoke(cli_pydriverr, args), download
+
+    def test_sync_and_install(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Synced mirror is used to install driver, repeated sync downloads nothing"""
+        content, checksum = load_driver_archive_content(tmpdir, "gecko", self.GECKO_FILE, "geckodriver")
+        result, download = self._sync(tmpdir, requests_mock, content)
+        assert result.exit_code == 0
+        assert "Mirrored 1 new archives of geckodriver" in caplog.messages
+        assert tmpdir.join("synced", "gecko", "0.28.0", self.GECKO_FILE).read_binary() == content
+        with open(tmpdir.join("synced", "catalogs.json")) as f:
+            mirrored = json.load(f)["catalogs"]
+        assert list(mirrored["gecko"]) == ["0.28.0"]
+        assert mirrored["gecko"]["0.28.0"]["linux"]["64"]["sha256"] == hashlib.sha256(content).hexdigest()
+        tmpdir.join(CACHE_DIR).remove()
+        result, _ = self._sync(tmpdir, requests_mock, content)
+        assert result.exit_code == 0
+        assert "Mirrored 0 new archives of geckodriver" in caplog.messages
+        assert download.call_count == 1
+        monkeypatch.setenv("PYDRIVERR_GECKO_CATALOG_URL", tmpdir.join("synced", "catalogs.json").strpath)
+        monkeypatch.setenv("PYDRIVERR_GECKO_ARTIFACT_URL", tmpdir.join("synced", "gecko").strpath)
+        requests_mock.real_http = True
+        http = requests_mock.get(re.compile(r"https?://.*"), status_code=500)
+        result = CliRunner().invoke(cli_pydriverr, ["install", "-d", "gecko", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 0
+        assert http.call_count == 0
+        assert get_ini_content(tmpdir)["gecko"]["CHECKSUM"] == checksum
+
+    def test_sync_repeated_without_listing(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Repeated sync of chromedriver uses saved lists of versions, including versions older than 115"""
+        requests_mock.get(URLS["CHROME_CFT"], **load_response("chrome_cft"))
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        content, _ = load_driver_archive_content(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver")
+        requests_mock.get(URLS["CHROME"] + "/71.0.3578.33/chromedriver_linux64.zip", content=content)
+        synced = str(tmpdir.join("synced"))
+        args = ["mirror", "sync", synced, "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"]
+        assert CliRunner().invoke(cli_pydriverr, args).exit_code == 0
+        assert "Mirrored 1 new archives of chromedriver" in caplog.messages
+        requests_mock.reset_mock()
+        assert CliRunner().invoke(cli_pydriverr, args).exit_code == 0
+        assert "Mirrored 0 new archives of chromedriver" in caplog.messages
+        assert requests_mock.call_count == 0
+
+    def test_sync_invalid_archive(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Archive that cannot be read is neither mirrored nor cached, so next sync downloads it again"""
+        result, _ = self._sync(tmpdir, requests_mock, b"<html>Not Found</html>")
+        assert result.exit_code == 1
+        url = URLS["GECKO"].format(version="0.28.0", name=self.GECKO_FILE)
+        assert f"Invalid archive {url}" in caplog.messages
+        assert not tmpdir.join("synced", "gecko", "0.28.0", self.GECKO_FILE).exists()
+        assert not tmpdir.join("synced", "catalogs.json").exists()
+        content, _ = load_driver_archive_content(tmpdir, "gecko", self.GECKO_FILE, "geckodriver")
+        result, _ = self._sync(tmpdir, requests_mock, content)
+        assert result.exit_code == 0
+        assert tmpdir.join("synced", "gecko", "0.28.0", self.GECKO_FILE).read_binary() == content
+
+
 class TestDelete:
     def test_delete_no_drivers_installed(self, tmpdir, env_vars, caplog):
         """Display message when there are no drivers installed"""
@@ -1202,6 +1780,209 @@ class TestInstall:
         )
 
 
+class TestInstallVersionConstraint:
+    def test_install_version_constraint(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, empty_ini):
+        """The highest version satisfying the constraint and available for given OS and arch is installed"""
+        content, checksum = load_driver_archive_content(tmpdir, "chrome", "chromedriver_linux32.zip", "chromedriver")
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["CHROME"] + "/2.1/chromedriver_linux32.zip", content=content)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", ">=2,<71", "-o", "linux", "-a", "32"])
+        assert result.exit_code == 0
+        assert "I will download following version: 2.1, OS: linux, arch: 32" in caplog.messages
+        assert (
+            get_ini_content(tmpdir)
+            == IniFile().add_driver("chrome", "chromedriver", "2.1", "linux", "32", checksum).to_dict()
+        )
+
+    def test_install_version_constraint_not_satisfied(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Nothing is installed when no version satisfies the constraint"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        runner = CliRunner()
+        result = runner.invoke(
+            cli_pydriverr, ["install", "-d", "chrome", "-v", "latest-of-major:99", "-o", "linux", "-a", "64"]
+        )
+        assert result.exit_code == 1
+        assert "No version of chromedriver matching latest-of-major:99 for OS: linux, arch: 64" in caplog.messages
+
+
+class TestInstallFromManifest:
+    MANIFEST = """
+[drivers.chrome]
+version = "71.0.3578.33"
+os = "win"
+arch = "32"
+
+[drivers.gecko]
+version = "0.28.0"
+os = "mac"
+"""
+
+    @staticmethod
+    def _mock_downloads(tmpdir, requests_mock) -> Tuple[str, str]:
+        chrome_content, chrome_checksum = load_driver_archive_content(
+            tmpdir, "chrome", "chromedriver_win32.zip", "chromedriver.exe"
+        )
+        gecko_content, gecko_checksum = load_driver_archive_content(
+            tmpdir, "gecko", "geckodriver-v0.28.0-macos.tar.gz", "geckodriver"
+        )
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        requests_mock.get(URLS["CHROME"] + "/71.0.3578.33/chromedriver_win32.zip", content=chrome_content)
+        requests_mock.get(
+            URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-macos.tar.gz"), content=gecko_content
+        )
+        return chrome_checksum, gecko_checksum
+
+    def test_install_from_manifest(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, empty_ini, mocker):
+        """All drivers from the manifest are installed and .ini file is written once"""
+        chrome_checksum, gecko_checksum = self._mock_downloads(tmpdir, requests_mock)
+        manifest = tmpdir.join("pydriverr.toml")
+        manifest.write(self.MANIFEST)
+        write_spy = mocker.spy(ConfigObj, "write")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--from", str(manifest)])
+        assert result.exit_code == 0
+        assert len([call for call in write_spy.call_args_list if "section" not in call.kwargs]) == 1
+        assert (
+            get_ini_content(tmpdir)
+            == IniFile()
+            .add_driver("chrome", "chromedriver.exe", "71.0.3578.33", "win", "32", chrome_checksum)
+            .add_driver("gecko", "geckodriver", "0.28.0", "mac", "", gecko_checksum)
+            .to_dict()
+        )
+
+    def test_install_from_manifest_already_installed(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Drivers already installed in requested version are skipped, the rest is installed"""
+        chrome_checksum, gecko_checksum = self._mock_downloads(tmpdir, requests_mock)
+        create_extracted_driver(tmpdir.join(PYDRIVERR_HOME), "chromedriver.exe")
+        IniFile().add_driver("chrome", "chromedriver.exe", "71.0.3578.33", "win", "32", chrome_checksum).write(tmpdir)
+        manifest = tmpdir.join("pydriverr.toml")
+        manifest.write(self.MANIFEST)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--from", str(manifest)])
+        assert result.exit_code == 0
+        assert "Requested driver already installed" in caplog.messages
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.28.0"
+        assert not [request for request in requests_mock.request_history if request.url.endswith(".zip")]
+
+    @pytest.mark.parametrize(
+        "content, error",
+        [
+            ("", "No drivers listed in manifest {path}"),
+            ("[drivers.safari]\n", "Unknown driver type safari in manifest {path}"),
+            ('[drivers.chrome]\nchannel = "beta"\n', "Unknown keys for chrome in manifest {path}: channel"),
+            ("[drivers.chrome\n", "Invalid manifest {path}: "),
+        ],
+    )
+    def test_install_from_invalid_manifest(self, content, error, tmpdir, test_dirs, env_vars, caplog):
+        """Invalid manifest is reported and nothing is installed"""
+        manifest = tmpdir.join("pydriverr.toml")
+        manifest.write(content)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--from", str(manifest)])
+        assert result.exit_code == 1
+        assert any(message.startswith(error.format(path=manifest)) for message in caplog.messages)
+
+    def test_install_from_manifest_with_other_options(self, tmpdir, test_dirs, env_vars, caplog):
+        """Manifest cannot be combined with options describing single driver"""
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--from", "pydriverr.toml", "-d", "chrome"])
+        assert result.exit_code == 1
+        assert "Options '--from' and '--locked' cannot be used together with other options" in caplog.messages
+
+
+class TestLock:
+    @staticmethod
+    def _mock_downloads(tmpdir, requests_mock) -> Dict:
+        """Mock catalogs and archives of chrome and gecko, return expected lockfile content"""
+        chrome_content, _ = load_driver_archive_content(tmpdir, "chrome", "chromedriver_win32.zip", "chromedriver.exe")
+        gecko_content, _ = load_driver_archive_content(
+            tmpdir, "gecko", "geckodriver-v0.28.0-macos.tar.gz", "geckodriver"
+        )
+        chrome_url = URLS["CHROME"] + "/71.0.3578.33/chromedriver_win32.zip"
+        gecko_url = URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-macos.tar.gz")
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        requests_mock.get(chrome_url, content=chrome_content)
+        requests_mock.get(gecko_url, content=gecko_content)
+        return {
+            "format": 1,
+            "drivers": {
+                "chrome": {
+                    "version": "71.0.3578.33",
+                    "os": "win",
+                    "arch": "32",
+                    "url": chrome_url,
+                    "file_name": "chromedriver_win32.zip",
+                    "size": len(chrome_content),
+                    "sha256": hashlib.sha256(chrome_content).hexdigest(),
+                },
+                "gecko": {
+                    "version": "0.28.0",
+                    "os": "mac",
+                    "arch": "",
+                    "url": gecko_url,
+                    "file_name": "geckodriver-v0.28.0-macos.tar.gz",
+                    "size": len(gecko_content),
+                    "sha256": hashlib.sha256(gecko_content).hexdigest(),
+                },
+            },
+        }
+
+    def test_lock_installed_drivers(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Lockfile pins installed drivers to URL, size and digest of their archives"""
+        expected = self._mock_downloads(tmpdir, requests_mock)
+        IniFile().add_driver("chrome", "chromedriver.exe", "71.0.3578.33", "win", "32", "abc").add_driver(
+            "gecko", "geckodriver", "0.28.0", "mac", "", "def"
+        ).write(tmpdir)
+        lockfile = tmpdir.join("pydriverr.lock")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["lock", "-l", str(lockfile)])
+        assert result.exit_code == 0
+        assert json.loads(lockfile.read()) == expected
+        assert (
+            f"Locked chromedriver 71.0.3578.33: {expected['drivers']['chrome']['url']} "
+            f"sha256:{expected['drivers']['chrome']['sha256']}" in caplog.messages
+        )
+
+    def test_install_locked(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, empty_ini):
+        """Drivers from the lockfile are installed without catalogs, reinstall from the cache needs no requests"""
+        lockfile = tmpdir.join("pydriverr.lock")
+        lockfile.write(json.dumps(self._mock_downloads(tmpdir, requests_mock)))
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--locked", "-l", str(lockfile)])
+        assert result.exit_code == 0
+        assert sorted(request.url for request in requests_mock.request_history) == [
+            URLS["CHROME"] + "/71.0.3578.33/chromedriver_win32.zip",
+            URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-macos.tar.gz"),
+        ]
+        ini = get_ini_content(tmpdir)
+        assert [ini["chrome"]["VERSION"], ini["gecko"]["VERSION"]] == ["71.0.3578.33", "0.28.0"]
+        runner.invoke(cli_pydriverr, ["delete"])
+        requests_mock.reset_mock()
+        result = runner.invoke(cli_pydriverr, ["install", "--locked", "-l", str(lockfile)])
+        assert result.exit_code == 0
+        assert requests_mock.call_count == 0
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.28.0"
+
+    def test_install_locked_digest_mismatch(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, empty_ini):
+        """Archive with other digest than pinned in the lockfile is rejected and not stored in the cache"""
+        content = self._mock_downloads(tmpdir, requests_mock)
+        content["drivers"]["chrome"]["sha256"] = 64 * "0"
+        lockfile = tmpdir.join("pydriverr.lock")
+        lockfile.write(json.dumps(content))
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "--locked", "-l", str(lockfile)])
+        assert result.exit_code == 1
+        assert any(message.startswith("Digest mismatch for ") for message in caplog.messages)
+        assert "Failed to install chromedriver" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert "chrome" not in ini
+        assert ini["gecko"]["VERSION"] == "0.28.0"
+        assert "chrome/71.0.3578.33/win/32" not in get_cache_index(tmpdir)["artifacts"]
+
+
 class TestClearCache:
     def test_clear_cache(self, env_vars, caplog, test_dirs, tmpdir):
         """Display message after removing whole cache directory"""
@@ -1312,8 +2093,10 @@ class TestUpdate:
         assert f"Updating {driver_data.type}driver" in caplog.messages
         assert f"Updated {driver_data.type}driver: {driver_data.version} -> {new_version}" in caplog.messages
         assert "No drivers installed" not in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert ini[driver_data.type].pop("LAST_CHECKED")
         assert (
-            get_ini_content(tmpdir)
+            ini
             == IniFile()
             .add_driver(
                 driver_type=driver_data.type,
@@ -1470,3 +2253,611 @@ class TestUpdate:
         result = runner.invoke(cli_pydriverr, ["update"])
         assert result.exit_code == 0
         assert "No drivers installed" in caplog.messages
+
+    @staticmethod
+    def _install_old_chrome_and_gecko(tmpdir, requests_mock) -> Tuple[str, str]:
+        chrome_content, chrome_checksum = load_driver_archive_content(
+            tmpdir, "chrome", "chromedriver_win32.zip", "chromedriver.exe"
+        )
+        gecko_content, gecko_checksum = load_driver_archive_content(
+            tmpdir, "gecko", "geckodriver-v0.28.0-macos.tar.gz", "geckodriver"
+        )
+        IniFile().add_driver(
+            "chrome", filename="chromedriver.exe", version="2.0", os_="win", arch="32", checksum=chrome_checksum
+        ).add_driver(
+            "gecko", filename="geckodriver", version="0.4.2", os_="mac", arch="", checksum=gecko_checksum
+        ).write(
+            tmpdir
+        )
+        create_extracted_driver(tmpdir.join(PYDRIVERR_HOME), "chromedriver.exe")
+        create_extracted_driver(tmpdir.join(PYDRIVERR_HOME), "geckodriver")
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+        requests_mock.get(URLS["CHROME"] + "/71.0.3578.33/chromedriver_win32.zip", content=chrome_content)
+        return URLS["GECKO"].format(version="0.28.0", name="geckodriver-v0.28.0-macos.tar.gz"), gecko_content
+
+    def test_update_all_drivers_concurrently(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker):
+        """All installed drivers are fetched in parallel and .ini file is written once when all of them are ready"""
+        gecko_url, gecko_content = self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(gecko_url, content=gecko_content)
+        write_spy = mocker.spy(ConfigObj, "write")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update"])
+        assert result.exit_code == 0
+        # ConfigObj.write calls itself for every section, count only writes of the whole file
+        assert len([call for call in write_spy.call_args_list if "section" not in call.kwargs]) == 1
+        assert "Updated chromedriver: 2.0 -> 71.0.3578.33" in caplog.messages
+        assert "Updated geckodriver: 0.4.2 -> 0.28.0" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert ini["chrome"]["VERSION"] == "71.0.3578.33"
+        assert ini["gecko"]["VERSION"] == "0.28.0"
+
+    def test_update_fetches_catalogs_once(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """List of available versions is downloaded once per driver type"""
+        gecko_url, gecko_content = self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(gecko_url, content=gecko_content)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update"])
+        assert result.exit_code == 0
+        catalog_requests = [
+            request.url.rstrip("/") for request in requests_mock.request_history if not request.url.endswith(".gz")
+        ]
+        assert catalog_requests.count(URLS["CHROME"]) == 1
+        assert catalog_requests.count(URLS["GECKO_API"]) == 1
+
+    def test_update_failure_does_not_stop_other_drivers(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver that cannot be downloaded is reported as failed, other drivers are still updated"""
+        gecko_url, _ = self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(gecko_url, status_code=404)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update"])
+        assert result.exit_code == 1
+        assert "Updated chromedriver: 2.0 -> 71.0.3578.33" in caplog.messages
+        assert "Failed to update geckodriver" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert ini["chrome"]["VERSION"] == "71.0.3578.33"
+        assert ini["gecko"]["VERSION"] == "0.4.2"
+
+    def test_update_connection_error_does_not_stop_other_drivers(
+        self, tmpdir, test_dirs, env_vars, caplog, requests_mock
+    ):
+        """Unexpected error of one driver is reported as failure, other drivers are still updated and .ini written"""
+        gecko_url, _ = self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(gecko_url, exc=requests.exceptions.ConnectionError("Connection reset by peer"))
+        result = CliRunner().invoke(cli_pydriverr, ["update"])
+        assert result.exit_code == 1
+        assert "Updated chromedriver: 2.0 -> 71.0.3578.33" in caplog.messages
+        assert "Failed to update geckodriver: Connection reset by peer" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert ini["chrome"]["VERSION"] == "71.0.3578.33"
+        assert ini["gecko"]["VERSION"] == "0.4.2"
+
+    def test_update_no_remote_version(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver without any remote version is reported as failed and left as it is"""
+        self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(URLS["GECKO_API"], json=[])
+        result = CliRunner().invoke(cli_pydriverr, ["update", "-d", "gecko"])
+        assert result.exit_code == 1
+        assert "No remote version of geckodriver for OS: mac, arch: " in caplog.messages
+        assert get_ini_content(tmpdir)["gecko"]["VERSION"] == "0.4.2"
+
+    @staticmethod
+    def _install_chrome_checked_at(tmpdir, requests_mock, last_checked: datetime) -> None:
+        content, checksum = load_driver_archive_content(tmpdir, "chrome", "chromedriver_win32.zip", "chromedriver.exe")
+        IniFile().add_driver(
+            "chrome",
+            filename="chromedriver.exe",
+            version="2.0",
+            os_="win",
+            arch="32",
+            checksum=checksum,
+            last_checked=last_checked.isoformat(timespec="seconds"),
+        ).write(tmpdir)
+        create_extracted_driver(tmpdir.join(PYDRIVERR_HOME), "chromedriver.exe")
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["CHROME"] + "/71.0.3578.33/chromedriver_win32.zip", content=content)
+
+    def test_update_records_last_checked(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Time of the successful check is recorded also for drivers that are already in the newest version"""
+        gecko_url, gecko_content = self._install_old_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(gecko_url, content=gecko_content)
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["update"]).exit_code == 0
+        assert runner.invoke(cli_pydriverr, ["update"]).exit_code == 0
+        assert "geckodriver is already in newest version. Local: 0.28.0, remote: 0.28.0" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        for driver_type in ["chrome", "gecko"]:
+            elapsed = datetime.now(timezone.utc) - datetime.fromisoformat(ini[driver_type]["LAST_CHECKED"])
+            assert elapsed < timedelta(minutes=1)
+
+    def test_update_min_interval_not_elapsed(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver checked recently is skipped without any network access"""
+        self._install_chrome_checked_at(tmpdir, requests_mock, datetime.now(timezone.utc) - timedelta(hours=1))
+        ini_before = get_ini_content(tmpdir)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update", "--min-interval", "6h"])
+        assert result.exit_code == 0
+        assert "chromedriver was checked for updates less than 6h ago" in caplog.messages
+        assert requests_mock.call_count == 0
+        assert get_ini_content(tmpdir) == ini_before
+
+    def test_update_min_interval_elapsed(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker):
+        """Driver not checked for longer than the interval is updated after random delay within the jitter"""
+        self._install_chrome_checked_at(tmpdir, requests_mock, datetime.now(timezone.utc) - timedelta(hours=7))
+        mocker.patch("random.uniform", return_value=42.0)
+        sleep_mock = mocker.patch("time.sleep")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update", "--min-interval", "6h", "--jitter", "15m"])
+        assert result.exit_code == 0
+        sleep_mock.assert_called_once_with(42.0)
+        assert "Updated chromedriver: 2.0 -> 71.0.3578.33" in caplog.messages
+
+    def test_update_failed_check_not_recorded(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver whose check failed is not recorded as checked, so it is checked again despite the interval"""
+        last_checked = datetime.now(timezone.utc) - timedelta(hours=7)
+        self._install_chrome_checked_at(tmpdir, requests_mock, last_checked)
+        requests_mock.get(URLS["CHROME"], text="<ListBucketResult></ListBucketResult>")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update", "--min-interval", "6h", "--jitter", "0s"])
+        assert result.exit_code == 1
+        assert "No remote version of chromedriver for OS: win, arch: 32" in caplog.messages
+        ini = get_ini_content(tmpdir)
+        assert ini["chrome"]["LAST_CHECKED"] == last_checked.isoformat(timespec="seconds")
+
+    def test_update_invalid_min_interval(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Invalid time span is reported"""
+        self._install_chrome_checked_at(tmpdir, requests_mock, datetime.now(timezone.utc))
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["update", "--min-interval", "often"])
+        assert result.exit_code == 1
+        assert "Invalid time span: often" in caplog.messages
+
+
+class TestCheck:
+    @staticmethod
+    def _install_chrome_and_gecko(tmpdir, requests_mock, chrome_version: str = "2.0") -> None:
+        IniFile().add_driver(
+            "chrome", filename="chromedriver.exe", version=chrome_version, os_="win", arch="32", checksum="abc"
+        ).add_driver("gecko", filename="geckodriver", version="0.28.0", os_="mac", arch="", checksum="def").write(
+            tmpdir
+        )
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        requests_mock.get(URLS["GECKO_API"], **load_response("gecko"))
+
+    def test_check_outdated(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Outdated driver is reported with exit code 3, nothing besides lists of versions is downloaded"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock)
+        ini_before = get_ini_content(tmpdir)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check"])
+        assert result.exit_code == 3
+        assert "chromedriver is outdated. Local: 2.0, remote: 71.0.3578.33" in caplog.messages
+        assert "geckodriver is up to date. Local: 0.28.0, remote: 0.28.0" in caplog.messages
+        assert not [request for request in requests_mock.request_history if request.url.endswith((".zip", ".gz"))]
+        assert get_ini_content(tmpdir) == ini_before
+
+    def test_check_up_to_date(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Exit code is 0 when all drivers are in the newest version"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock, chrome_version="71.0.3578.33")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check"])
+        assert result.exit_code == 0
+        assert "chromedriver is up to date. Local: 71.0.3578.33, remote: 71.0.3578.33" in caplog.messages
+
+    def test_check_json(self, tmpdir, test_dirs, env_vars, requests_mock):
+        """Result is written to stdout as JSON"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check", "--json", "-d", "chrome"])
+        assert result.exit_code == 3
+        assert json.loads(result.stdout) == {
+            "drivers": [
+                {
+                    "driver_type": "chrome",
+                    "status": "outdated",
+                    "local_version": "2.0",
+                    "remote_version": "71.0.3578.33",
+                    "os": "win",
+                    "arch": "32",
+                    "message": "chromedriver is outdated. Local: 2.0, remote: 71.0.3578.33",
+                }
+            ]
+        }
+
+    def test_check_uses_saved_catalog(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Saved list of versions is reused until it is older than max age, listing of legacy bucket is reused always"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock)
+        runner = CliRunner()
+        chrome_catalog = requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        assert runner.invoke(cli_pydriverr, ["check", "-d", "chrome"]).exit_code == 3
+        assert runner.invoke(cli_pydriverr, ["check", "-d", "chrome"]).exit_code == 3
+        assert chrome_catalog.call_count == 1
+        assert "Using newest version of chromedriver from saved list" in caplog.messages
+        requests_mock.reset_mock()
+        assert runner.invoke(cli_pydriverr, ["check", "-d", "chrome", "--max-age", "0s"]).exit_code == 3
+        assert URLS["CHROME_CFT"] in [request.url for request in requests_mock.request_history]
+        assert chrome_catalog.call_count == 0
+        assert "Using saved list of chromedriver versions older than 115" in caplog.messages
+
+    def test_install_exact_version_from_saved_catalog(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Exact version found in saved list of any age is installed without downloading the list"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock)
+        chrome_catalog = requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        content, _ = load_driver_archive_content(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver_2.0")
+        requests_mock.get(f"{URLS['CHROME']}/2.0/chromedriver_linux64.zip", content=content)
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["check", "-d", "chrome"]).exit_code == 3
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "2.0", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 0
+        assert chrome_catalog.call_count == 1
+        assert "Using chromedriver 2.0 from saved list" in caplog.messages
+
+    def test_check_not_installed(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Requested driver that is not installed is reported with exit code 4"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock, chrome_version="71.0.3578.33")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check", "-d", "chrome", "-d", "edge"])
+        assert result.exit_code == 4
+        assert "Driver edgedriver is not installed" in caplog.messages
+
+    def test_check_no_remote_version(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver without any remote version is reported with its own exit code, not installed one takes precedence"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock, chrome_version="71.0.3578.33")
+        requests_mock.get(URLS["GECKO_API"], json=[])
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check"])
+        assert result.exit_code == 5
+        assert "No remote version of geckodriver for OS: mac, arch: " in caplog.messages
+        assert runner.invoke(cli_pydriverr, ["check", "-d", "gecko", "-d", "edge"]).exit_code == 4
+
+    def test_check_failure(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Driver whose list of versions cannot be downloaded is reported with exit code 1, others are still checked"""
+        self._install_chrome_and_gecko(tmpdir, requests_mock)
+        requests_mock.get(URLS["GECKO_API"], status_code=500)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["check"])
+        assert result.exit_code == 1
+        assert "Failed to check geckodriver" in caplog.messages
+        assert "chromedriver is outdated. Local: 2.0, remote: 71.0.3578.33" in caplog.messages
+
+
+class TestLinkStrategy:
+    @pytest.mark.parametrize(
+        "strategy, is_symlink, same_inode",
+        [("copy", False, False), ("hardlink", False, True), ("symlink", True, True), ("auto", False, None)],
+    )
+    def test_install_link_strategy(
+        self, strategy, is_symlink, same_inode, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch
+    ):
+        """Driver file is placed in installation dir using strategy from env variable and has the same content"""
+        monkeypatch.setenv("PYDRIVERR_LINK_STRATEGY", strategy)
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        checksum = create_driver_archive(
+            tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33"
+        )
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux"])
+        assert result.exit_code == 0
+        installed = tmpdir.join(PYDRIVERR_HOME, "chromedriver")
+        assert installed.islink() == is_symlink
+        assert installed.read() == 10 * "chromedriver"
+        assert get_ini_content(tmpdir)["chrome"]["CHECKSUM"] == checksum
+        driver_digest = get_cache_index(tmpdir)["artifacts"]["chrome/71.0.3578.33/linux/64"]["driver"]["digest"]
+        cached_driver = tmpdir.join(CACHE_DIR, "objects", driver_digest[:2], driver_digest)
+        assert cached_driver.isfile()
+        if same_inode is not None:
+            assert (installed.stat().ino == cached_driver.stat().ino) == same_inode
+
+    def test_install_unknown_link_strategy(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Unknown strategy in env variable is reported before anything is downloaded"""
+        monkeypatch.setenv("PYDRIVERR_LINK_STRATEGY", "hardlnk")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux"])
+        assert result.exit_code == 1
+        assert "Unknown link strategy: hardlnk, use one of: auto, reflink, hardlink, symlink, copy" in caplog.messages
+        assert requests_mock.call_count == 0
+
+    def test_install_link_failure(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker, create_ini):
+        """Driver that cannot be placed with any strategy is reported and .drivers.ini is not changed"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        ini_before = get_ini_content(tmpdir)
+        methods = Linker._methods
+
+        def fail_in_drivers_home(linker):
+            def method(place):
+                def placed(src, dst):
+                    if Path(dst).parent == Path(tmpdir.join(PYDRIVERR_HOME)):
+                        raise OSError(28, "No space left on device")
+                    place(src, dst)
+
+                return placed
+
+            return {strategy: method(place) for strategy, place in methods(linker).items()}
+
+        mocker.patch.object(Linker, "_methods", fail_in_drivers_home)
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux"])
+        assert result.exit_code == 1
+        installed = tmpdir.join(PYDRIVERR_HOME, "chromedriver")
+        assert f"Cannot place {installed}: [Errno 28] No space left on device" in caplog.messages
+        assert not installed.exists()
+        assert get_ini_content(tmpdir) == ini_before
+
+    def test_clear_cache_materializes_symlinks(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Installed drivers symlinked to the cache keep working after cache is removed"""
+        monkeypatch.setenv("PYDRIVERR_LINK_STRATEGY", "symlink")
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux"])
+        result = runner.invoke(cli_pydriverr, ["clear-cache"])
+        assert result.exit_code == 0
+        installed = tmpdir.join(PYDRIVERR_HOME, "chromedriver")
+        assert not installed.islink()
+        assert installed.read() == 10 * "chromedriver"
+
+
+class TestCache:
+    def test_reinstall_skips_decompression(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker):
+        """Second installation of the same driver uses extracted file and checksum from the cache"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        checksum = create_driver_archive(
+            tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33"
+        )
+        runner = CliRunner()
+        install_cmd = ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"]
+        runner.invoke(cli_pydriverr, install_cmd)
+        runner.invoke(cli_pydriverr, ["delete", "-d", "chrome"])
+        archive_digest = get_cache_index(tmpdir)["artifacts"]["chrome/71.0.3578.33/linux/64"]["archive"]["digest"]
+        tmpdir.join(CACHE_DIR, "objects", archive_digest[:2], archive_digest).remove()
+        unpack = mocker.spy(webdriver.WebDriver, "_unpack")
+        calculate_checksum = mocker.spy(support.Support, "calculate_checksum")
+        result = runner.invoke(cli_pydriverr, install_cmd)
+        assert result.exit_code == 0
+        assert "Extracted driver found in cache, skipping decompression" in caplog.messages
+        unpack.assert_not_called()
+        calculate_checksum.assert_not_called()
+        assert get_ini_content(tmpdir)["chrome"]["CHECKSUM"] == checksum
+        assert tmpdir.join(PYDRIVERR_HOME, "chromedriver").read() == 10 * "chromedriver"
+
+    def test_identical_archives_stored_once(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Archive with the same content installed as two different versions is kept in the store only once"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        content, checksum = load_driver_archive_content(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver")
+        for version in ["2.0", "2.1"]:
+            requests_mock.get(f"{URLS['CHROME']}/{version}/chromedriver_linux64.zip", content=content)
+        runner = CliRunner()
+        for version in ["2.0", "2.1"]:
+            result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", version, "-o", "linux", "-a", "64"])
+            assert result.exit_code == 0
+        index = get_cache_index(tmpdir)
+        assert (
+            index["artifacts"]["chrome/2.0/linux/64"]["archive"]["digest"]
+            == index["artifacts"]["chrome/2.1/linux/64"]["archive"]["digest"]
+        )
+        assert len(index["objects"]) == 2  # one archive and one extracted driver
+        assert get_ini_content(tmpdir)["chrome"]["CHECKSUM"] == checksum
+
+    def test_legacy_cache_layout_moved_to_store(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Archive cached in old `<type>/<version>/<file name>` layout is moved to the store on first use"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"]
+        )
+        assert result.exit_code == 0
+        assert "chromedriver in cache" in caplog.messages
+        assert not tmpdir.join(CACHE_DIR, "chrome", "71.0.3578.33", "chromedriver_linux64.zip").exists()
+        assert "archive" in get_cache_index(tmpdir)["artifacts"]["chrome/71.0.3578.33/linux/64"]
+
+    def test_cache_verify(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Verification passes for intact store and reports objects which content does not match digest"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"])
+        result = runner.invoke(cli_pydriverr, ["cache", "verify"])
+        assert result.exit_code == 0
+        assert "Cache is consistent, verified objects: 2" in caplog.messages
+
+        digest = get_cache_index(tmpdir)["artifacts"]["chrome/71.0.3578.33/linux/64"]["archive"]["digest"]
+        tmpdir.join(CACHE_DIR, "objects", digest[:2], digest).write("corrupted")
+        result = runner.invoke(cli_pydriverr, ["cache", "verify"])
+        assert result.exit_code == 1
+        assert f"Corrupted object: {digest}" in caplog.messages
+
+
+class TestCacheGc:
+    @staticmethod
+    def _install_chrome_versions(tmpdir, requests_mock, versions):
+        """Install given chrome versions one after another, every version has archive with different content"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        runner = CliRunner()
+        for version in versions:
+            content, _ = load_driver_archive_content(
+                tmpdir, "chrome", "chromedriver_linux64.zip", f"chromedriver_{version}"
+            )
+            requests_mock.get(f"{URLS['CHROME']}/{version}/chromedriver_linux64.zip", content=content)
+            result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", version, "-o", "linux", "-a", "64"])
+            assert result.exit_code == 0
+
+    def test_keep_versions_after_install(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Versions over the limit are evicted automatically after installation, installed one is kept"""
+        monkeypatch.setenv("PYDRIVERR_CACHE_KEEP_VERSIONS", "1")
+        self._install_chrome_versions(tmpdir, requests_mock, ["2.0", "2.1"])
+        index = get_cache_index(tmpdir)
+        assert list(index["artifacts"]) == ["chrome/2.1/linux/64"]
+        assert len(index["objects"]) == 2
+        assert len(tmpdir.join(CACHE_DIR, "objects").listdir()) == 2
+
+    def test_gc_after_index_lost(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch):
+        """Objects are not deleted only because index was lost, installed driver is kept even when over the limit"""
+        monkeypatch.setenv("PYDRIVERR_LINK_STRATEGY", "symlink")
+        self._install_chrome_versions(tmpdir, requests_mock, ["2.0"])
+        objects = get_cache_index(tmpdir)["objects"]
+        tmpdir.join(CACHE_DIR, "index.json").remove()
+        runner = CliRunner()
+        assert runner.invoke(cli_pydriverr, ["cache", "gc", "--max-size", "1GB"]).exit_code == 0
+        assert get_cache_index(tmpdir)["objects"] == objects
+        installed = tmpdir.join(PYDRIVERR_HOME, "chromedriver_2.0")
+        assert installed.islink() and installed.read() == 10 * "chromedriver_2.0"
+        assert runner.invoke(cli_pydriverr, ["cache", "gc", "--max-size", "1"]).exit_code == 0
+        driver_digest = get_cache_index(tmpdir)["installed"][str(tmpdir.join(PYDRIVERR_HOME))]["chrome"]["digest"]
+        assert list(get_cache_index(tmpdir)["objects"]) == [driver_digest]
+        assert installed.read() == 10 * "chromedriver_2.0"
+
+    @pytest.mark.parametrize(
+        "option, value, message",
+        [
+            ("--max-size", "foo", "'foo' is not a size"),
+            ("--max-age", "foo", "'foo' is not a time span"),
+            ("--keep-versions", "-1", "-1 is not in the range x>=0"),
+        ],
+    )
+    def test_gc_invalid_option(self, tmpdir, test_dirs, env_vars, option, value, message):
+        """Invalid limit given as option is rejected by the command line parser"""
+        result = CliRunner().invoke(cli_pydriverr, ["cache", "gc", option, value])
+        assert result.exit_code == 2
+        assert message in result.output
+
+    @pytest.mark.parametrize(
+        "env_name, value, message",
+        [
+            ("PYDRIVERR_CACHE_MAX_SIZE", "foo", "Invalid size: foo"),
+            ("PYDRIVERR_CACHE_MAX_AGE", "foo", "Invalid time span: foo"),
+            ("PYDRIVERR_CACHE_KEEP_VERSIONS", "x", "Invalid number of versions to keep: x"),
+        ],
+    )
+    def test_invalid_env_before_install(
+        self, tmpdir, test_dirs, env_vars, caplog, requests_mock, monkeypatch, env_name, value, message
+    ):
+        """Invalid limit in env variable is reported before driver is downloaded and installed"""
+        monkeypatch.setenv(env_name, value)
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        download = requests_mock.get(f"{URLS['CHROME']}/2.0/chromedriver_linux64.zip", content=b"")
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "2.0", "-o", "linux", "-a", "64"])
+        assert result.exit_code == 1
+        assert message in caplog.messages
+        assert download.call_count == 0
+        assert not tmpdir.join(PYDRIVERR_HOME, ".drivers.ini").exists()
+        result = runner.invoke(cli_pydriverr, ["cache", "gc"])
+        assert result.exit_code == 1
+        assert caplog.messages.count(message) == 2
+
+    def test_gc_max_size(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Least recently used entries are evicted until cache fits in given size, installed driver stays"""
+        self._install_chrome_versions(tmpdir, requests_mock, ["2.0", "2.1", "71.0.3578.33"])
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["cache", "gc", "--max-size", "0"])
+        assert result.exit_code == 0
+        assert "Evicted from cache: chrome/2.0/linux/64" in caplog.messages
+        assert "Evicted from cache: chrome/2.1/linux/64" in caplog.messages
+        assert list(get_cache_index(tmpdir)["artifacts"]) == ["chrome/71.0.3578.33/linux/64"]
+        assert tmpdir.join(PYDRIVERR_HOME, "chromedriver_71.0.3578.33").isfile()
+
+    def test_gc_max_age(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Entries not used for longer than given time are evicted"""
+        self._install_chrome_versions(tmpdir, requests_mock, ["2.0", "2.1"])
+        index = get_cache_index(tmpdir)
+        index["artifacts"]["chrome/2.0/linux/64"]["last_access"] = 0
+        tmpdir.join(CACHE_DIR, "index.json").write(json.dumps(index))
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["cache", "gc", "--max-age", "1d"])
+        assert result.exit_code == 0
+        assert "Evicted from cache: chrome/2.0/linux/64" in caplog.messages
+        assert list(get_cache_index(tmpdir)["artifacts"]) == ["chrome/2.1/linux/64"]
+
+    def test_gc_no_limits(self, tmpdir, test_dirs, env_vars, caplog):
+        """Display message when no limits are given as options nor env variables"""
+        runner = CliRunner()
+        result = runner.invoke(cli_pydriverr, ["cache", "gc"])
+        assert result.exit_code == 1
+        assert "No cache limits given" in caplog.messages
+
+
+class TestCacheIndex:
+    def test_show_env_sizes_from_index(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker):
+        """Sizes of installation dir and cached objects are taken from the index without walking their directories"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"])
+        cache_size = sum(object_["size"] for object_ in get_cache_index(tmpdir)["objects"].values())
+        cache_size += sum(path.size() for path in tmpdir.join(CACHE_DIR, "catalogs").visit(lambda p: p.isfile()))
+        glob = mocker.patch("pathlib.Path.glob")
+        result = runner.invoke(cli_pydriverr, ["show-env"])
+        assert result.exit_code == 0
+        glob.assert_not_called()
+        assert (
+            f"WebDrivers are installed in: {tmpdir.join(PYDRIVERR_HOME)}, total size is: 120 bytes" in caplog.messages
+        )
+        assert (
+            f"PyDriverr cache is in: {tmpdir.join(CACHE_DIR)}, total size is: {support.Support.format_size(cache_size)}"
+            in caplog.messages
+        )
+
+    def test_index_rebuilt_when_missing(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Missing index is rebuilt from objects dir and installed drivers are linked back to their objects"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"])
+        index = get_cache_index(tmpdir)
+        tmpdir.join(CACHE_DIR, "index.json").remove()
+        result = runner.invoke(cli_pydriverr, ["show-env"])
+        assert result.exit_code == 0
+        assert (
+            f"WebDrivers are installed in: {tmpdir.join(PYDRIVERR_HOME)}, total size is: 120 bytes" in caplog.messages
+        )
+        rebuilt_index = get_cache_index(tmpdir)
+        assert rebuilt_index["objects"] == index["objects"]
+        assert rebuilt_index["installed"] == index["installed"]
+        driver = rebuilt_index["artifacts"]["chrome/71.0.3578.33/linux/64"]["driver"]
+        assert driver["digest"] == index["artifacts"]["chrome/71.0.3578.33/linux/64"]["driver"]["digest"]
+        assert driver["checksum"] == get_ini_content(tmpdir)["chrome"]["CHECKSUM"]
+
+    def test_cache_hit_saved_once(self, tmpdir, test_dirs, env_vars, caplog, requests_mock, mocker):
+        """Use of cached driver is written to the index together with the installation, not on every cache hit"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        args = ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"]
+        runner.invoke(cli_pydriverr, args)
+        runner.invoke(cli_pydriverr, ["delete", "-d", "chrome"])
+        key = "chrome/71.0.3578.33/linux/64"
+        last_access = get_cache_index(tmpdir)["artifacts"][key]["last_access"]
+        save_spy = mocker.spy(Cache, "_save_index")
+        assert runner.invoke(cli_pydriverr, args).exit_code == 0
+        assert "chromedriver in cache" in caplog.messages
+        assert save_spy.call_count == 1
+        assert get_cache_index(tmpdir)["artifacts"][key]["last_access"] > last_access
+
+    def test_changes_of_other_process_kept(self, tmpdir, test_dirs, env_vars):
+        """Caches opened before each other changed the index keep records of both of them"""
+        cache_dir = Path(tmpdir.join(CACHE_DIR))
+        first, second = Cache(cache_dir), Cache(cache_dir)
+        for cache, version in [(first, "0.28.0"), (second, "0.29.0")]:
+            src = cache.new_tmp_path("geckodriver")
+            src.write_text(f"geckodriver {version}")
+            entry = cache.put(Cache.key("gecko", version, "linux", "64"), Cache.DRIVER, src, "geckodriver")
+            cache.set_installed(Path(tmpdir.join(version)), "gecko", entry)
+        index = get_cache_index(tmpdir)
+        assert sorted(index["artifacts"]) == ["gecko/0.28.0/linux/64", "gecko/0.29.0/linux/64"]
+        assert len(index["objects"]) == 2
+        assert sorted(index["installed"]) == [str(tmpdir.join("0.28.0")), str(tmpdir.join("0.29.0"))]
+
+    def test_cache_verify_deep(self, tmpdir, test_dirs, env_vars, caplog, requests_mock):
+        """Corruption that keeps size of the file is found only when content is checked"""
+        requests_mock.get(URLS["CHROME"], **load_response("chrome"))
+        create_driver_archive(tmpdir, "chrome", "chromedriver_linux64.zip", "chromedriver", version="71.0.3578.33")
+        runner = CliRunner()
+        runner.invoke(cli_pydriverr, ["install", "-d", "chrome", "-v", "71.0.3578.33", "-o", "linux", "-a", "64"])
+        digest = get_cache_index(tmpdir)["artifacts"]["chrome/71.0.3578.33/linux/64"]["driver"]["digest"]
+        tmpdir.join(CACHE_DIR, "objects", digest[:2], digest).write(10 * "CHROMEDRIVER")
+        assert runner.invoke(cli_pydriverr, ["cache", "verify"]).exit_code == 0
+        result = runner.invoke(cli_pydriverr, ["cache", "verify", "--deep"])
+        assert result.exit_code == 1
+        assert f"Corrupted object: {digest}" in caplog.messages
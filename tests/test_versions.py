@@ -0,0 +1,54 @@
+import pytest
+
+from pydriverr.versions import VersionConstraint, VersionIndex
+
+VERSIONS_INFO = {
+    "114.0.5735.90": {"linux": {"64": "a"}, "win": {"32": "b"}},
+    "115.0.5790.102": {"linux": {"64": "a"}},
+    "115.0.5790.170": {"linux": {"64": "a"}, "win": {"32": "b"}},
+    "116.0.5845.96": {"linux": {"64": "a"}},
+    "118.0.5993.70": {"linux": {"64": "a"}, "win": {"32": "b"}},
+    "118.0.5993.117": {"win": {"32": "b"}},
+    "0.32.2": {"linux": {"64": "c"}},
+    "0.33.0": {"linux": {"64": "c"}},
+    "0.34.0": {"linux": {"64": "c"}},
+}
+
+
+class TestVersionIndex:
+    """Resolve version constraints against available versions"""
+
+    @pytest.mark.parametrize(
+        "spec, os_, arch, expected",
+        [
+            ("", "linux", "64", "118.0.5993.70"),
+            ("", "win", "32", "118.0.5993.117"),
+            ("", None, None, "118.0.5993.117"),
+            (">=114,<116", "linux", "64", "115.0.5790.170"),
+            (">=114,<116,!=115.0.5790.170", "linux", "64", "115.0.5790.102"),
+            (">=114,<116", "win", "32", "115.0.5790.170"),
+            ("<=116.0.5845.96", "linux", "64", "116.0.5845.96"),
+            (">116.0.5845.96", "linux", "64", "118.0.5993.70"),
+            ("==115.*", "linux", "64", "115.0.5790.170"),
+            ("latest-of-major:118", "win", "32", "118.0.5993.117"),
+            ("latest-of-major:117", "linux", "64", None),
+            ("~=0.33", "linux", "64", "0.34.0"),
+            ("~=0.33.0", "linux", "64", "0.33.0"),
+            ("==0.32.2", "linux", "64", "0.32.2"),
+            ("115.0.5790.102", "linux", "64", "115.0.5790.102"),
+            ("115.0.5790.102", "win", "32", None),
+            (">=200", "linux", "64", None),
+            ("", "mac", "64", None),
+        ],
+    )
+    def test_resolve(self, spec, os_, arch, expected):
+        """The highest version satisfying the constraint and available for the platform is returned"""
+        assert VersionIndex(VERSIONS_INFO).resolve(VersionConstraint(spec), os_, arch) == expected
+
+    @pytest.mark.parametrize("spec", [">=abc", "latest-of-major:x", "~=1"])
+    def test_invalid_constraint(self, spec, caplog):
+        """Invalid constraint is reported and pydriverr exits"""
+        with pytest.raises(SystemExit) as excinfo:
+            VersionConstraint(spec)
+        assert str(excinfo.value) == "1"
+        assert any(message.startswith("Invalid version constraint: ") for message in caplog.messages)